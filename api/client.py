@@ -4,7 +4,7 @@ This module provides a client interface to interact with the Open Notebook API.
 """
 
 import os
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
 import httpx
 from loguru import logger
@@ -188,13 +188,18 @@ class APIClient:
         return self._make_request("DELETE", f"/api/transformations/{transformation_id}")
 
     def execute_transformation(
-        self, transformation_id: str, input_text: str, model_id: str
+        self,
+        transformation_id: str,
+        input_text: str,
+        model_id: str,
+        bypass_cache: bool = False,
     ) -> Dict:
         """Execute a transformation on input text."""
         data = {
             "transformation_id": transformation_id,
             "input_text": input_text,
             "model_id": model_id,
+            "bypass_cache": bypass_cache,
         }
         # Use extended timeout for transformation operations
         return self._make_request(
@@ -202,11 +207,20 @@ class APIClient:
         )
 
     # Notes API methods
-    def get_notes(self, notebook_id: Optional[str] = None) -> List[Dict]:
-        """Get all notes with optional notebook filtering."""
-        params = {}
+    def get_notes(
+        self,
+        notebook_id: Optional[str] = None,
+        limit: Optional[int] = None,
+        after: Optional[str] = None,
+    ) -> List[Dict]:
+        """Get notes with optional notebook filtering and cursor pagination."""
+        params: Dict = {}
         if notebook_id:
             params["notebook_id"] = notebook_id
+        if limit:
+            params["limit"] = limit
+        if after:
+            params["after"] = after
         return self._make_request("GET", "/api/notes", params=params)
 
     def create_note(
@@ -260,22 +274,39 @@ class APIClient:
 
     # Context API methods
     def get_notebook_context(
-        self, notebook_id: str, context_config: Optional[Dict] = None
+        self,
+        notebook_id: str,
+        context_config: Optional[Dict] = None,
+        token_budget: Optional[int] = None,
+        question: Optional[str] = None,
     ) -> Dict:
-        """Get context for a notebook."""
-        data = {"notebook_id": notebook_id}
+        """Get context for a notebook, optionally packed to a token budget."""
+        data: Dict[str, Any] = {"notebook_id": notebook_id}
         if context_config:
             data["context_config"] = context_config
+        if token_budget:
+            data["token_budget"] = token_budget
+        if question:
+            data["question"] = question
         return self._make_request(
             "POST", f"/api/notebooks/{notebook_id}/context", json=data
         )
 
     # Sources API methods
-    def get_sources(self, notebook_id: Optional[str] = None) -> List[Dict]:
-        """Get all sources with optional notebook filtering."""
-        params = {}
+    def get_sources(
+        self,
+        notebook_id: Optional[str] = None,
+        limit: Optional[int] = None,
+        after: Optional[str] = None,
+    ) -> List[Dict]:
+        """Get sources with optional notebook filtering and cursor pagination."""
+        params: Dict = {}
         if notebook_id:
             params["notebook_id"] = notebook_id
+        if limit:
+            params["limit"] = limit
+        if after:
+            params["after"] = after
         return self._make_request("GET", "/api/sources", params=params)
 
     def create_source(
@@ -290,7 +321,7 @@ class APIClient:
         embed: bool = False,
         delete_source: bool = False,
     ) -> Dict:
-        """Create a new source."""
+        """Submit a new source for processing; returns the job to poll."""
         data = {
             "notebook_id": notebook_id,
             "type": source_type,
@@ -310,6 +341,21 @@ class APIClient:
 
         return self._make_request("POST", "/api/sources", json=data)
 
+    def get_source_job(self, job_id: str) -> Dict:
+        """Get the processing status of a submitted source."""
+        return self._make_request("GET", f"/api/sources/jobs/{job_id}")
+
+    def create_sources_bulk(
+        self, notebook_id: str, items: List[Dict], **options
+    ) -> Dict:
+        """Submit many sources as one background job; options are BulkSourceCreate fields."""
+        data = {"notebook_id": notebook_id, "items": items, **options}
+        return self._make_request("POST", "/api/sources/bulk", json=data)
+
+    def get_bulk_source_job(self, job_id: str) -> Dict:
+        """Get per-item status and the summary of a bulk source job."""
+        return self._make_request("GET", f"/api/sources/bulk/{job_id}")
+
     def get_source(self, source_id: str) -> Dict:
         """Get a specific source."""
         return self._make_request("GET", f"/api/sources/{source_id}")
@@ -347,10 +393,14 @@ class APIClient:
         )
 
     def create_source_insight(
-        self, source_id: str, transformation_id: str, model_id: Optional[str] = None
+        self,
+        source_id: str,
+        transformation_id: str,
+        model_id: Optional[str] = None,
+        bypass_cache: bool = False,
     ) -> Dict:
         """Create a new insight for a source by running a transformation."""
-        data = {"transformation_id": transformation_id}
+        data = {"transformation_id": transformation_id, "bypass_cache": bypass_cache}
         if model_id:
             data["model_id"] = model_id
         return self._make_request(
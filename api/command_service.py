@@ -4,6 +4,7 @@ from loguru import logger
 from surreal_commands import get_command_status, submit_command
 
 from api.models import ErrorResponse
+from open_notebook.database.repository import ensure_record_id, repo_query
 
 
 class CommandService:
@@ -22,6 +23,7 @@ class CommandService:
             # This is needed because submit_command validates against local registry
             try:
                 import commands.podcast_commands  # noqa: F401
+                import commands.source_commands  # noqa: F401
             except ImportError as import_err:
                 logger.error(f"Failed to import command modules: {import_err}")
                 raise ValueError("Command modules not available")
@@ -48,6 +50,10 @@ class CommandService:
         """Get status of any command job"""
         try:
             status = await get_command_status(job_id)
+            # Commands store their stage on the command record itself
+            progress = await repo_query(
+                "SELECT VALUE progress FROM $id", {"id": ensure_record_id(job_id)}
+            )
             return {
                 "job_id": job_id,
                 "status": status.status if status else "unknown",
@@ -61,7 +67,7 @@ class CommandService:
                 "updated": str(status.updated)
                 if status and hasattr(status, "updated") and status.updated
                 else None,
-                "progress": getattr(status, "progress", None) if status else None,
+                "progress": progress[0] if progress else None,
             }
         except Exception as e:
             logger.error(f"Failed to get command status: {e}")
@@ -1,13 +1,16 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from api.auth import PasswordAuthMiddleware
-from api.routers import commands as commands_router
 from api.routers import (
+    chat,
     context,
     embedding,
     episode_profiles,
     insights,
+    metrics,
     models,
     notebooks,
     notes,
@@ -18,12 +21,21 @@ from api.routers import (
     speaker_profiles,
     transformations,
 )
+from api.routers import commands as commands_router
+from open_notebook.database.repository import (
+    close_connection_pool,
+    configure_connection_pool,
+    init_connection_pool,
+)
+from open_notebook.domain.models import model_manager
+from open_notebook.graphs.chat import close_chat_graph
 
 # Import commands to register them in the API process
 try:
     from loguru import logger
 
     import commands.podcast_commands
+    import commands.source_commands  # noqa: F401
 
     logger.info("Commands imported in API process")
 except Exception as e:
@@ -31,10 +43,31 @@ except Exception as e:
 
     logger.error(f"Failed to import commands in API process: {e}")
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # The API gets its own pool settings (SURREAL_API_POOL_*)
+    configure_connection_pool("api")
+    try:
+        await init_connection_pool()
+    except Exception as e:
+        logger.warning(f"Could not warm database connection pool: {e}")
+    model_manager.enable_change_watch()
+    try:
+        await model_manager.warm_up()
+    except Exception as e:
+        logger.warning(f"Could not warm up models: {e}")
+    yield
+    await model_manager.close()
+    await close_chat_graph()
+    await close_connection_pool()
+
+
 app = FastAPI(
     title="Open Notebook API",
     description="API for Open Notebook - Research Assistant",
     version="0.2.2",
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -58,12 +91,14 @@ app.include_router(notes.router, prefix="/api", tags=["notes"])
 app.include_router(embedding.router, prefix="/api", tags=["embedding"])
 app.include_router(settings.router, prefix="/api", tags=["settings"])
 app.include_router(context.router, prefix="/api", tags=["context"])
+app.include_router(chat.router, prefix="/api", tags=["chat"])
 app.include_router(sources.router, prefix="/api", tags=["sources"])
 app.include_router(insights.router, prefix="/api", tags=["insights"])
 app.include_router(commands_router.router, prefix="/api", tags=["commands"])
 app.include_router(podcasts.router, prefix="/api", tags=["podcasts"])
 app.include_router(episode_profiles.router, prefix="/api", tags=["episode-profiles"])
 app.include_router(speaker_profiles.router, prefix="/api", tags=["speaker-profiles"])
+app.include_router(metrics.router, prefix="/api", tags=["metrics"])
 
 
 @app.get("/")
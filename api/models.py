@@ -26,7 +26,7 @@ class NotebookResponse(BaseModel):
 # Search models
 class SearchRequest(BaseModel):
     query: str = Field(..., description="Search query")
-    type: Literal["text", "vector"] = Field("text", description="Search type")
+    type: Literal["text", "vector", "hybrid"] = Field("text", description="Search type")
     limit: int = Field(100, description="Maximum number of results", le=1000)
     search_sources: bool = Field(True, description="Include sources in search")
     search_notes: bool = Field(True, description="Include notes in search")
@@ -37,6 +37,7 @@ class SearchResponse(BaseModel):
     results: List[Dict[str, Any]] = Field(..., description="Search results")
     total_count: int = Field(..., description="Total number of results")
     search_type: str = Field(..., description="Type of search performed")
+    timings: Optional[Dict[str, float]] = Field(None, description="Time spent per search stage, in milliseconds")
 
 
 class AskRequest(BaseModel):
@@ -44,11 +45,17 @@ class AskRequest(BaseModel):
     strategy_model: str = Field(..., description="Model ID for query strategy")
     answer_model: str = Field(..., description="Model ID for individual answers")
     final_answer_model: str = Field(..., description="Model ID for final answer")
+    max_concurrency: Optional[int] = Field(None, ge=1, description="Search branches answered in parallel")
+    branch_timeout: Optional[float] = Field(None, gt=0, description="Seconds each search branch may take")
+    best_effort: Optional[bool] = Field(None, description="Answer from the branches that finished when others time out or fail")
+    use_cache: bool = Field(False, description="Reuse the answer to a near-identical earlier question if its cited documents are unchanged")
 
 
 class AskResponse(BaseModel):
     answer: str = Field(..., description="Final answer from the knowledge base")
     question: str = Field(..., description="Original question")
+    dropped: List[Dict[str, Any]] = Field(default_factory=list, description="Search branches left out of the answer")
+    cached: bool = Field(False, description="Whether the answer came from the answer cache")
 
 
 # Models API models
@@ -111,6 +118,7 @@ class TransformationExecuteRequest(BaseModel):
     transformation_id: str = Field(..., description="ID of the transformation to execute")
     input_text: str = Field(..., description="Text to transform")
     model_id: str = Field(..., description="Model ID to use for the transformation")
+    bypass_cache: bool = Field(False, description="Call the model even if an identical call has a cached response")
 
 
 class TransformationExecuteResponse(BaseModel):
@@ -142,6 +150,9 @@ class NoteResponse(BaseModel):
     note_type: Optional[str]
     created: str
     updated: str
+    cursor: Optional[str] = Field(
+        None, description="Pass as `after` to list the notes that follow this one"
+    )
 
 
 # Embedding API models
@@ -155,6 +166,7 @@ class EmbedResponse(BaseModel):
     message: str = Field(..., description="Result message")
     item_id: str = Field(..., description="ID of the item that was embedded")
     item_type: str = Field(..., description="Type of item that was embedded")
+    stats: Optional[Dict[str, int]] = Field(None, description="For sources: chunks, embedded, reused, deleted and provider calls saved")
 
 
 # Settings API models
@@ -192,6 +204,75 @@ class SourceCreate(BaseModel):
     delete_source: bool = Field(False, description="Whether to delete uploaded file after processing")
 
 
+class SourceJobResponse(BaseModel):
+    job_id: str = Field(..., description="Command ID to poll for processing status")
+    status: str = Field(..., description="Submission status")
+    message: str = Field(..., description="Result message")
+
+
+class SourceJobStatusResponse(BaseModel):
+    job_id: str
+    status: str = Field(..., description="new, running, completed or failed")
+    progress: Optional[Dict[str, Any]] = Field(None, description="Current processing stage, e.g. {stage: embedding, done: 50, total: 120}")
+    source_id: Optional[str] = Field(None, description="ID of the created source once processing completes")
+    duplicate: bool = Field(False, description="Whether the content was already stored and the existing source was reused")
+    error_message: Optional[str] = None
+    created: Optional[str] = None
+    updated: Optional[str] = None
+
+
+class BulkSourceItem(BaseModel):
+    type: str = Field(..., description="Source type: link, upload, or text")
+    url: Optional[str] = Field(None, description="URL for link type")
+    file_path: Optional[str] = Field(None, description="File path for upload type")
+    content: Optional[str] = Field(None, description="Text content for text type")
+    transformations: Optional[List[str]] = Field(None, description="Transformation IDs to apply (defaults to the request's)")
+    embed: Optional[bool] = Field(None, description="Whether to embed content (defaults to the request's)")
+    delete_source: Optional[bool] = Field(None, description="Whether to delete the uploaded file after processing (defaults to the auto delete setting)")
+
+
+class BulkSourceCreate(BaseModel):
+    notebook_id: str = Field(..., description="Notebook ID to add the sources to")
+    items: List[BulkSourceItem] = Field(..., min_length=1, description="Sources to add")
+    transformations: List[str] = Field(default_factory=list, description="Transformation IDs to apply to every item")
+    embed: Optional[bool] = Field(None, description="Whether to embed the items (defaults to the embedding setting)")
+    extraction_concurrency: Optional[int] = Field(None, ge=1, description="Sources extracted at the same time")
+    embedding_concurrency: Optional[int] = Field(None, ge=1, description="Sources embedded at the same time")
+    transformation_concurrency: Optional[int] = Field(None, ge=1, description="Transformations run at the same time")
+
+
+class BulkSourceRejected(BaseModel):
+    index: int = Field(..., description="Position of the item in the request")
+    error: str
+
+
+class BulkSourceJobResponse(BaseModel):
+    job_id: Optional[str] = Field(None, description="Command ID to poll, absent when no item was accepted")
+    status: str = Field(..., description="Submission status")
+    accepted: int = Field(..., description="Items queued for processing")
+    rejected: List[BulkSourceRejected] = Field(default_factory=list, description="Items that failed validation")
+
+
+class BulkSourceItemStatus(BaseModel):
+    index: int = Field(..., description="Position of the item in the request")
+    status: str = Field(..., description="pending, running, completed or failed")
+    stage: Optional[str] = Field(None, description="Current processing stage")
+    source_id: Optional[str] = None
+    duplicate: bool = Field(False, description="Whether an existing source with the same content was reused")
+    error: Optional[str] = None
+    seconds: Optional[float] = Field(None, description="Processing time of the item")
+
+
+class BulkSourceJobStatusResponse(BaseModel):
+    job_id: str
+    status: str = Field(..., description="new, running, completed or failed")
+    items: List[BulkSourceItemStatus] = Field(default_factory=list)
+    summary: Optional[Dict[str, Any]] = Field(None, description="Counts, throughput and time spent per stage")
+    error_message: Optional[str] = None
+    created: Optional[str] = None
+    updated: Optional[str] = None
+
+
 class SourceUpdate(BaseModel):
     title: Optional[str] = Field(None, description="Source title")
     topics: Optional[List[str]] = Field(None, description="Source topics")
@@ -217,6 +298,16 @@ class SourceListResponse(BaseModel):
     insights_count: int
     created: str
     updated: str
+    cursor: str = Field(
+        ..., description="Pass as `after` to list the sources that follow this one"
+    )
+
+
+# Chat API models
+class ChatMessageRequest(BaseModel):
+    message: str = Field(..., description="User message to send to the chat session")
+    context: Optional[Dict[str, Any]] = Field(None, description="Notebook context for this turn, as returned by the context endpoint")
+    model_id: Optional[str] = Field(None, description="Model ID to answer with (defaults to the chat model)")
 
 
 # Context API models
@@ -228,6 +319,8 @@ class ContextConfig(BaseModel):
 class ContextRequest(BaseModel):
     notebook_id: str = Field(..., description="Notebook ID to get context for")
     context_config: Optional[ContextConfig] = Field(None, description="Context configuration")
+    token_budget: Optional[int] = Field(None, ge=1, description="Maximum tokens of context to return")
+    question: Optional[str] = Field(None, description="Question used to rank context items when packing to the budget")
 
 
 class ContextResponse(BaseModel):
@@ -235,6 +328,7 @@ class ContextResponse(BaseModel):
     sources: List[Dict[str, Any]] = Field(..., description="Source context data")
     notes: List[Dict[str, Any]] = Field(..., description="Note context data")
     total_tokens: Optional[int] = Field(None, description="Estimated token count")
+    dropped: List[Dict[str, Any]] = Field(default_factory=list, description="Items left out to stay within the token budget")
 
 
 # Insights API models
@@ -256,6 +350,7 @@ class CreateSourceInsightRequest(BaseModel):
     
     transformation_id: str = Field(..., description="ID of transformation to apply")
     model_id: Optional[str] = Field(None, description="Model ID (uses default if not provided)")
+    bypass_cache: bool = Field(False, description="Call the model even if an identical call has a cached response")
 
 
 # Error response
@@ -16,9 +16,16 @@ class NotesService:
     def __init__(self):
         logger.info("Using API for notes operations")
     
-    def get_all_notes(self, notebook_id: Optional[str] = None) -> List[Note]:
-        """Get all notes with optional notebook filtering."""
-        notes_data = api_client.get_notes(notebook_id=notebook_id)
+    def get_all_notes(
+        self,
+        notebook_id: Optional[str] = None,
+        limit: Optional[int] = None,
+        after: Optional[str] = None,
+    ) -> List[Note]:
+        """Get notes with optional notebook filtering and cursor pagination."""
+        notes_data = api_client.get_notes(
+            notebook_id=notebook_id, limit=limit, after=after
+        )
         # Convert API response to Note objects
         notes = []
         for note_data in notes_data:
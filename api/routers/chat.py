@@ -0,0 +1,69 @@
+import json
+from typing import Any, AsyncGenerator, Dict
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from langchain_core.messages import HumanMessage
+from langchain_core.runnables import RunnableConfig
+from loguru import logger
+
+from api.models import ChatMessageRequest
+from open_notebook.domain.notebook import ChatSession
+from open_notebook.exceptions import NotFoundError
+from open_notebook.graphs.chat import get_chat_graph
+
+router = APIRouter()
+
+
+def _sse(data: Dict[str, Any]) -> str:
+    return f"data: {json.dumps(data)}\n\n"
+
+
+async def stream_chat_response(
+    session: ChatSession, chat_request: ChatMessageRequest
+) -> AsyncGenerator[str, None]:
+    """Stream the chat answer token by token as Server-Sent Events."""
+    config = RunnableConfig(
+        configurable={"thread_id": session.id, "model_id": chat_request.model_id}
+    )
+    state: Dict[str, Any] = {"messages": [HumanMessage(content=chat_request.message)]}
+    if chat_request.context is not None:
+        state["context"] = chat_request.context
+    try:
+        graph = await get_chat_graph()
+        async for chunk, metadata in graph.astream(
+            input=state, config=config, stream_mode="messages"
+        ):
+            if metadata.get("langgraph_node") != "agent":
+                continue
+            if isinstance(chunk.content, str) and chunk.content:
+                yield _sse({"type": "token", "content": chunk.content})
+
+        final_state = await graph.aget_state(config)
+        answer = final_state.values["messages"][-1]
+        await session.save()
+        yield _sse({"type": "complete", "id": answer.id, "content": answer.content})
+    except Exception as e:
+        logger.error(f"Error in chat streaming for session {session.id}: {str(e)}")
+        yield _sse({"type": "error", "message": str(e)})
+
+
+@router.post("/chat/{session_id}/stream")
+async def stream_chat(session_id: str, chat_request: ChatMessageRequest):
+    """Send a message to a chat session and stream the answer as it is generated."""
+    try:
+        session = await ChatSession.get(session_id)
+        if not session:
+            raise HTTPException(status_code=404, detail="Chat session not found")
+
+        return StreamingResponse(
+            stream_chat_response(session, chat_request),
+            media_type="text/event-stream",
+        )
+    except HTTPException:
+        raise
+    except NotFoundError:
+        raise HTTPException(status_code=404, detail="Chat session not found")
+    except Exception as e:
+        logger.error(f"Error in chat endpoint for session {session_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Chat failed: {str(e)}")
@@ -1,13 +1,12 @@
-from typing import Dict, List, Union
+from typing import Dict
 
 from fastapi import APIRouter, HTTPException
 from loguru import logger
 
 from api.models import ContextRequest, ContextResponse
-from open_notebook.domain.base import ObjectModel
-from open_notebook.domain.notebook import Note, Notebook, Source
-from open_notebook.exceptions import DatabaseOperationError, InvalidInputError
-from open_notebook.utils import token_count
+from open_notebook.domain.context import ContextSize, build_context
+from open_notebook.domain.notebook import Notebook
+from open_notebook.exceptions import InvalidInputError
 
 router = APIRouter()
 
@@ -21,92 +20,41 @@ async def get_notebook_context(notebook_id: str, context_request: ContextRequest
         if not notebook:
             raise HTTPException(status_code=404, detail="Notebook not found")
 
-        context_data = {"note": [], "source": []}
-        total_content = ""
+        sources: Dict[str, ContextSize] = {}
+        notes: Dict[str, ContextSize] = {}
 
-        # Process context configuration if provided
         if context_request.context_config:
-            # Process sources
             for source_id, status in context_request.context_config.sources.items():
                 if "not in" in status:
                     continue
+                if "insights" in status:
+                    sources[source_id] = "short"
+                elif "full content" in status:
+                    sources[source_id] = "long"
 
-                try:
-                    # Add table prefix if not present
-                    full_source_id = (
-                        source_id
-                        if source_id.startswith("source:")
-                        else f"source:{source_id}"
-                    )
-
-                    try:
-                        source = await Source.get(full_source_id)
-                    except Exception as e:
-                        continue
-
-                    if "insights" in status:
-                        source_context = await source.get_context(context_size="short")
-                        context_data["source"].append(source_context)
-                        total_content += str(source_context)
-                    elif "full content" in status:
-                        source_context = await source.get_context(context_size="long")
-                        context_data["source"].append(source_context)
-                        total_content += str(source_context)
-                except Exception as e:
-                    logger.warning(f"Error processing source {source_id}: {str(e)}")
-                    continue
-
-            # Process notes
             for note_id, status in context_request.context_config.notes.items():
-                if "not in" in status:
-                    continue
-
-                try:
-                    # Add table prefix if not present
-                    full_note_id = (
-                        note_id if note_id.startswith("note:") else f"note:{note_id}"
-                    )
-                    note = await Note.get(full_note_id)
-                    if not note:
-                        continue
-
-                    if "full content" in status:
-                        note_context = note.get_context(context_size="long")
-                        context_data["note"].append(note_context)
-                        total_content += str(note_context)
-                except Exception as e:
-                    logger.warning(f"Error processing note {note_id}: {str(e)}")
-                    continue
+                if "full content" in status:
+                    notes[note_id] = "long"
         else:
             # Default behavior - include all sources and notes with short context
-            sources = await notebook.get_sources()
-            for source in sources:
-                try:
-                    source_context = await source.get_context(context_size="short")
-                    context_data["source"].append(source_context)
-                    total_content += str(source_context)
-                except Exception as e:
-                    logger.warning(f"Error processing source {source.id}: {str(e)}")
-                    continue
-
-            notes = await notebook.get_notes()
-            for note in notes:
-                try:
-                    note_context = note.get_context(context_size="short")
-                    context_data["note"].append(note_context)
-                    total_content += str(note_context)
-                except Exception as e:
-                    logger.warning(f"Error processing note {note.id}: {str(e)}")
-                    continue
-
-        # Calculate estimated token count
-        estimated_tokens = token_count(total_content) if total_content else 0
+            sources = {
+                source.id: "short" for source in await notebook.get_sources()
+            }
+            notes = {note.id: "short" for note in await notebook.get_notes()}
+
+        context = await build_context(
+            sources=sources,
+            notes=notes,
+            token_budget=context_request.token_budget,
+            question=context_request.question,
+        )
 
         return ContextResponse(
             notebook_id=notebook_id,
-            sources=context_data["source"],
-            notes=context_data["note"],
-            total_tokens=estimated_tokens,
+            sources=context["source"],
+            notes=context["note"],
+            total_tokens=context["total_tokens"],
+            dropped=context["dropped"],
         )
 
     except HTTPException:
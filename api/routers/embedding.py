@@ -29,33 +29,35 @@ async def embed_content(embed_request: EmbedRequest):
             )
 
         # Get the item and embed it
+        stats = None
         if item_type == "source":
             source_item = await Source.get(item_id)
             if not source_item:
                 raise HTTPException(status_code=404, detail="Source not found")
 
-            # Check if already embedded
-            if await source_item.get_embedded_chunks() > 0:
-                return EmbedResponse(
-                    success=True,
-                    message="Source is already embedded",
-                    item_id=item_id,
-                    item_type=item_type,
-                )
-
-            # Perform embedding
-            await source_item.vectorize()
-            message = "Source embedded successfully"
+            # Only chunks without an embedding from the current model are sent
+            stats = await source_item.vectorize()
+            message = (
+                f"Source embedded: {stats['embedded']} chunks embedded, "
+                f"{stats['reused']} reused, {stats['deleted']} removed "
+                f"({stats['calls_saved']} provider calls saved)"
+            )
 
         elif item_type == "note":
             note_item = await Note.get(item_id)
             if not note_item:
                 raise HTTPException(status_code=404, detail="Note not found")
 
-            await note_item.vectorize()
+            # Notes are embedded when saved
+            await note_item.save()
+            message = "Note embedded successfully"
 
         return EmbedResponse(
-            success=True, message=message, item_id=item_id, item_type=item_type
+            success=True,
+            message=message,
+            item_id=item_id,
+            item_type=item_type,
+            stats=stats,
         )
 
     except HTTPException:
@@ -0,0 +1,19 @@
+from fastapi import APIRouter
+
+from open_notebook.domain import rate_limit
+from open_notebook.domain.answer_cache import ask_answer_cache
+from open_notebook.domain.embedding_cache import query_embedding_cache
+from open_notebook.domain.llm_cache import llm_response_cache
+
+router = APIRouter()
+
+
+@router.get("/metrics")
+async def get_metrics():
+    """Cache and provider rate limit counters of this API process."""
+    return {
+        "query_embedding_cache": query_embedding_cache.stats(),
+        "ask_answer_cache": ask_answer_cache.stats(),
+        "llm_response_cache": llm_response_cache.stats(),
+        "rate_limits": rate_limit.stats(),
+    }
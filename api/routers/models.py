@@ -4,7 +4,7 @@ from fastapi import APIRouter, HTTPException, Query
 from loguru import logger
 
 from api.models import DefaultModelsResponse, ModelCreate, ModelResponse
-from open_notebook.domain.models import DefaultModels, Model
+from open_notebook.domain.models import DefaultModels, Model, model_manager
 from open_notebook.exceptions import DatabaseOperationError, InvalidInputError
 
 router = APIRouter()
@@ -80,6 +80,7 @@ async def delete_model(model_id: str):
             raise HTTPException(status_code=404, detail="Model not found")
         
         await model.delete()
+        model_manager.invalidate(model_id)
         
         return {"message": "Model deleted successfully"}
     except HTTPException:
@@ -134,7 +135,6 @@ async def update_default_models(defaults_data: DefaultModelsResponse):
         await defaults.update()
         
         # Refresh the model manager cache
-        from open_notebook.domain.models import model_manager
         await model_manager.refresh_defaults()
         
         return DefaultModelsResponse(
@@ -4,6 +4,7 @@ from fastapi import APIRouter, HTTPException, Query
 from loguru import logger
 
 from api.models import NoteCreate, NoteResponse, NoteUpdate
+from open_notebook.domain.base import encode_cursor
 from open_notebook.domain.notebook import Note
 from open_notebook.exceptions import InvalidInputError
 
@@ -12,10 +13,20 @@ router = APIRouter()
 
 @router.get("/notes", response_model=List[NoteResponse])
 async def get_notes(
-    notebook_id: Optional[str] = Query(None, description="Filter by notebook ID")
+    notebook_id: Optional[str] = Query(None, description="Filter by notebook ID"),
+    limit: Optional[int] = Query(
+        None, ge=1, le=1000, description="Maximum number of notes to return (all notes listing)"
+    ),
+    after: Optional[str] = Query(
+        None, description="Cursor of the last note received (all notes listing)"
+    ),
 ):
-    """Get all notes with optional notebook filtering."""
+    """Get all notes with optional notebook filtering and cursor pagination."""
     try:
+        if notebook_id and (limit or after):
+            raise InvalidInputError(
+                "limit and after page the all notes listing, not a notebook's notes"
+            )
         if notebook_id:
             # Get notes for a specific notebook
             from open_notebook.domain.notebook import Notebook
@@ -24,8 +35,13 @@ async def get_notes(
                 raise HTTPException(status_code=404, detail="Notebook not found")
             notes = await notebook.get_notes()
         else:
-            # Get all notes
-            notes = await Note.get_all(order_by="updated desc")
+            # Get all notes, without their embeddings
+            notes = await Note.get_all(
+                order_by=None if limit or after else "updated desc",
+                omit=["embedding"],
+                limit=limit,
+                after=after,
+            )
         
         return [
             NoteResponse(
@@ -35,11 +51,14 @@ async def get_notes(
                 note_type=note.note_type,
                 created=str(note.created),
                 updated=str(note.updated),
+                cursor=None if notebook_id else encode_cursor(note.updated, note.id),
             )
             for note in notes
         ]
     except HTTPException:
         raise
+    except InvalidInputError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error fetching notes: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error fetching notes: {str(e)}")
@@ -1,31 +1,48 @@
-import asyncio
-from typing import AsyncGenerator, Dict
+import json
+from typing import Any, AsyncGenerator, Dict
 
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import StreamingResponse
 from loguru import logger
 
 from api.models import AskRequest, AskResponse, SearchRequest, SearchResponse
+from open_notebook.config import (
+    ASK_BEST_EFFORT,
+    ASK_BRANCH_TIMEOUT,
+    ASK_MAX_CONCURRENCY,
+)
+from open_notebook.domain.answer_cache import ask_answer_cache
 from open_notebook.domain.models import Model, model_manager
-from open_notebook.domain.notebook import text_search, vector_search
+from open_notebook.domain.notebook import hybrid_search, text_search, vector_search
 from open_notebook.exceptions import DatabaseOperationError, InvalidInputError
 from open_notebook.graphs.ask import graph as ask_graph
+from open_notebook.utils import ThinkingStreamFilter
 
 router = APIRouter()
 
 
 @router.post("/search", response_model=SearchResponse)
 async def search_knowledge_base(search_request: SearchRequest):
-    """Search the knowledge base using text or vector search."""
+    """Search the knowledge base using text, vector or hybrid search."""
     try:
-        if search_request.type == "vector":
+        timings = None
+        if search_request.type in ("vector", "hybrid"):
             # Check if embedding model is available for vector search
             if not await model_manager.get_embedding_model():
                 raise HTTPException(
                     status_code=400,
-                    detail="Vector search requires an embedding model. Please configure one in the Models section.",
+                    detail=f"{search_request.type.capitalize()} search requires an embedding model. Please configure one in the Models section.",
                 )
 
+        if search_request.type == "hybrid":
+            results, timings = await hybrid_search(
+                keyword=search_request.query,
+                results=search_request.limit,
+                source=search_request.search_sources,
+                note=search_request.search_notes,
+                minimum_score=search_request.minimum_score,
+            )
+        elif search_request.type == "vector":
             results = await vector_search(
                 keyword=search_request.query,
                 results=search_request.limit,
@@ -46,6 +63,7 @@ async def search_knowledge_base(search_request: SearchRequest):
             results=results or [],
             total_count=len(results) if results else 0,
             search_type=search_request.type,
+            timings=timings,
         )
 
     except InvalidInputError as e:
@@ -58,52 +76,148 @@ async def search_knowledge_base(search_request: SearchRequest):
         raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
 
 
+def _ask_config(
+    ask_request: AskRequest,
+    strategy_model: Model,
+    answer_model: Model,
+    final_answer_model: Model,
+) -> Dict[str, Any]:
+    configurable: Dict[str, Any] = dict(
+        strategy_model=strategy_model.id,
+        answer_model=answer_model.id,
+        final_answer_model=final_answer_model.id,
+        branch_timeout=ask_request.branch_timeout or ASK_BRANCH_TIMEOUT,
+        best_effort=ASK_BEST_EFFORT
+        if ask_request.best_effort is None
+        else ask_request.best_effort,
+    )
+    return dict(
+        configurable=configurable,
+        max_concurrency=ask_request.max_concurrency or ASK_MAX_CONCURRENCY,
+    )
+
+
+def _models_key(config: Dict[str, Any]) -> str:
+    """Cached answers are only reused for the same strategy, answer and final models."""
+    configurable = config["configurable"]
+    return "|".join(
+        configurable[key]
+        for key in ("strategy_model", "answer_model", "final_answer_model")
+    )
+
+
+def _sse(data: Dict[str, Any]) -> str:
+    return f"data: {json.dumps(data)}\n\n"
+
+
 async def stream_ask_response(
-    question: str, strategy_model: Model, answer_model: Model, final_answer_model: Model
+    question: str, config: Dict[str, Any], use_cache: bool = False
 ) -> AsyncGenerator[str, None]:
-    """Stream the ask response as Server-Sent Events."""
+    """
+    Stream the ask response as JSON Server-Sent Events.
+
+    Events: "strategy" once the searches are planned, "answer" or "branch_dropped"
+    as each search branch finishes (with progress counters), "token" for every
+    piece of the final answer as it is generated, then "final_answer" and
+    "complete". With use_cache, a cached answer is sent straight away as
+    "final_answer" and "complete" marked with cached: true.
+    """
     try:
+        if use_cache:
+            cached = await ask_answer_cache.lookup(question, _models_key(config))
+            if cached:
+                answer = cached["answer"]
+                yield _sse({"type": "final_answer", "content": answer, "cached": True})
+                yield _sse(
+                    {
+                        "type": "complete",
+                        "final_answer": answer,
+                        "dropped": [],
+                        "cached": True,
+                    }
+                )
+                return
+
         final_answer = None
+        total_searches = 0
+        completed_searches = 0
+        dropped = []
+        thinking_filter = ThinkingStreamFilter()
 
-        async for chunk in ask_graph.astream(
+        async for mode, chunk in ask_graph.astream(
             input=dict(question=question),
-            config=dict(
-                configurable=dict(
-                    strategy_model=strategy_model.id,
-                    answer_model=answer_model.id,
-                    final_answer_model=final_answer_model.id,
-                )
-            ),
-            stream_mode="updates",
+            config=config,
+            stream_mode=["updates", "messages"],
         ):
+            if mode == "messages":
+                message, metadata = chunk
+                if metadata.get("langgraph_node") != "write_final_answer":
+                    continue
+                if isinstance(message.content, str):
+                    token = thinking_filter.feed(message.content)
+                    if token:
+                        yield _sse({"type": "token", "content": token})
+                continue
+
             if "agent" in chunk:
-                strategy_data = {
-                    "type": "strategy",
-                    "reasoning": chunk["agent"]["strategy"].reasoning,
-                    "searches": [
-                        {"term": search.term, "instructions": search.instructions}
-                        for search in chunk["agent"]["strategy"].searches
-                    ],
-                }
-                yield f"data: {strategy_data}\n\n"
+                searches = chunk["agent"]["strategy"].searches
+                total_searches = len(searches)
+                yield _sse(
+                    {
+                        "type": "strategy",
+                        "reasoning": chunk["agent"]["strategy"].reasoning,
+                        "searches": [
+                            {"term": search.term, "instructions": search.instructions}
+                            for search in searches
+                        ],
+                    }
+                )
 
             elif "provide_answer" in chunk:
-                for answer in chunk["provide_answer"]["answers"]:
-                    answer_data = {"type": "answer", "content": answer}
-                    yield f"data: {answer_data}\n\n"
+                completed_searches += 1
+                for branch in chunk["provide_answer"].get("dropped", []):
+                    dropped.append(branch)
+                    yield _sse(
+                        {
+                            "type": "branch_dropped",
+                            **branch,
+                            "completed": completed_searches,
+                            "total": total_searches,
+                        }
+                    )
+                for answer in chunk["provide_answer"].get("answers", []):
+                    yield _sse(
+                        {
+                            "type": "answer",
+                            "content": answer,
+                            "completed": completed_searches,
+                            "total": total_searches,
+                        }
+                    )
 
             elif "write_final_answer" in chunk:
+                token = thinking_filter.flush()
+                if token:
+                    yield _sse({"type": "token", "content": token})
                 final_answer = chunk["write_final_answer"]["final_answer"]
-                final_data = {"type": "final_answer", "content": final_answer}
-                yield f"data: {final_data}\n\n"
+                yield _sse({"type": "final_answer", "content": final_answer})
 
-        # Send completion signal
-        yield f"data: {{'type': 'complete', 'final_answer': '{final_answer}'}}\n\n"
+        # Best-effort answers that dropped branches are not worth reusing
+        if use_cache and final_answer and not dropped:
+            await ask_answer_cache.store(question, _models_key(config), final_answer)
+
+        yield _sse(
+            {
+                "type": "complete",
+                "final_answer": final_answer,
+                "dropped": dropped,
+                "cached": False,
+            }
+        )
 
     except Exception as e:
         logger.error(f"Error in ask streaming: {str(e)}")
-        error_data = {"type": "error", "message": str(e)}
-        yield f"data: {error_data}\n\n"
+        yield _sse({"type": "error", "message": str(e)})
 
 
 @router.post("/search/ask")
@@ -140,10 +254,14 @@ async def ask_knowledge_base(ask_request: AskRequest):
 
         # For streaming response
         return StreamingResponse(
-            await stream_ask_response(
-                ask_request.question, strategy_model, answer_model, final_answer_model
+            stream_ask_response(
+                ask_request.question,
+                _ask_config(
+                    ask_request, strategy_model, answer_model, final_answer_model
+                ),
+                use_cache=ask_request.use_cache,
             ),
-            media_type="text/plain",
+            media_type="text/event-stream",
         )
 
     except HTTPException:
@@ -185,26 +303,44 @@ async def ask_knowledge_base_simple(ask_request: AskRequest):
                 detail="Ask feature requires an embedding model. Please configure one in the Models section.",
             )
 
+        config = _ask_config(
+            ask_request, strategy_model, answer_model, final_answer_model
+        )
+        if ask_request.use_cache:
+            cached = await ask_answer_cache.lookup(
+                ask_request.question, _models_key(config)
+            )
+            if cached:
+                return AskResponse(
+                    answer=cached["answer"],
+                    question=ask_request.question,
+                    cached=True,
+                )
+
         # Run the ask graph and get final result
         final_answer = None
+        dropped = []
         async for chunk in ask_graph.astream(
             input=dict(question=ask_request.question),
-            config=dict(
-                configurable=dict(
-                    strategy_model=strategy_model.id,
-                    answer_model=answer_model.id,
-                    final_answer_model=final_answer_model.id,
-                )
-            ),
+            config=config,
             stream_mode="updates",
         ):
-            if "write_final_answer" in chunk:
+            if "provide_answer" in chunk:
+                dropped.extend(chunk["provide_answer"].get("dropped", []))
+            elif "write_final_answer" in chunk:
                 final_answer = chunk["write_final_answer"]["final_answer"]
 
         if not final_answer:
             raise HTTPException(status_code=500, detail="No answer generated")
 
-        return AskResponse(answer=final_answer, question=ask_request.question)
+        if ask_request.use_cache and not dropped:
+            await ask_answer_cache.store(
+                ask_request.question, _models_key(config), final_answer
+            )
+
+        return AskResponse(
+            answer=final_answer, question=ask_request.question, dropped=dropped
+        )
 
     except HTTPException:
         raise
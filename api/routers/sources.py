@@ -1,110 +1,124 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Union
 
 from fastapi import APIRouter, HTTPException, Query
 from loguru import logger
 
+from api.command_service import CommandService
 from api.models import (
     AssetModel,
+    BulkSourceCreate,
+    BulkSourceItem,
+    BulkSourceItemStatus,
+    BulkSourceJobResponse,
+    BulkSourceJobStatusResponse,
+    BulkSourceRejected,
     CreateSourceInsightRequest,
     SourceCreate,
     SourceInsightResponse,
+    SourceJobResponse,
+    SourceJobStatusResponse,
     SourceListResponse,
     SourceResponse,
     SourceUpdate,
 )
+from open_notebook.config import BULK_MAX_ITEMS
+from open_notebook.domain.base import encode_cursor
+from open_notebook.domain.content_settings import ContentSettings
 from open_notebook.domain.notebook import Notebook, Source
 from open_notebook.domain.transformation import Transformation
-from open_notebook.exceptions import InvalidInputError
-from open_notebook.graphs.source import source_graph
+from open_notebook.exceptions import InvalidInputError, NotFoundError
 
 router = APIRouter()
 
 
+def build_content_state(
+    source_data: Union[SourceCreate, BulkSourceItem],
+    delete_source: bool = False,
+) -> Dict[str, Any]:
+    """Build the source graph's content_state for a link, upload or text source."""
+    if source_data.type == "link":
+        if not source_data.url:
+            raise InvalidInputError("URL is required for link type")
+        return {"url": source_data.url}
+    if source_data.type == "upload":
+        if not source_data.file_path:
+            raise InvalidInputError("File path is required for upload type")
+        if source_data.delete_source is not None:
+            delete_source = source_data.delete_source
+        return {"file_path": source_data.file_path, "delete_source": delete_source}
+    if source_data.type == "text":
+        if not source_data.content:
+            raise InvalidInputError("Content is required for text type")
+        return {"content": source_data.content}
+    raise InvalidInputError("Invalid source type. Must be link, upload, or text")
+
+
 @router.get("/sources", response_model=List[SourceListResponse])
 async def get_sources(
     notebook_id: Optional[str] = Query(None, description="Filter by notebook ID"),
+    limit: Optional[int] = Query(
+        None, ge=1, le=1000, description="Maximum number of sources to return"
+    ),
+    after: Optional[str] = Query(
+        None, description="Cursor of the last source received"
+    ),
 ):
-    """Get all sources with optional notebook filtering."""
+    """Get sources, newest first, with optional notebook filtering and cursor pagination."""
     try:
         if notebook_id:
-            # Get sources for a specific notebook
             notebook = await Notebook.get(notebook_id)
             if not notebook:
                 raise HTTPException(status_code=404, detail="Notebook not found")
-            sources = await notebook.get_sources()
-        else:
-            # Get all sources
-            sources = await Source.get_all(order_by="updated desc")
-
-        # Create response list with async insights count
-        response_list = []
-        for source in sources:
-            insights = await source.get_insights()
-            response_list.append(
-                SourceListResponse(
-                    id=source.id,
-                    title=source.title,
-                    topics=source.topics or [],
-                    asset=AssetModel(
-                        file_path=source.asset.file_path if source.asset else None,
-                        url=source.asset.url if source.asset else None,
-                    )
-                    if source.asset
-                    else None,
-                    embedded_chunks=await source.get_embedded_chunks(),
-                    insights_count=len(insights),
-                    created=str(source.created),
-                    updated=str(source.updated),
+
+        sources = await Source.get_listing(
+            notebook_id=notebook_id, limit=limit, after=after
+        )
+
+        return [
+            SourceListResponse(
+                id=source["id"],
+                title=source.get("title"),
+                topics=source.get("topics") or [],
+                asset=AssetModel(
+                    file_path=source["asset"].get("file_path"),
+                    url=source["asset"].get("url"),
                 )
+                if source.get("asset")
+                else None,
+                embedded_chunks=source.get("embedded_chunks", 0),
+                insights_count=source.get("insights_count", 0),
+                created=str(source.get("created")),
+                updated=str(source.get("updated")),
+                cursor=encode_cursor(source["updated"], source["id"]),
             )
-
-        return response_list
+            for source in sources
+        ]
     except HTTPException:
         raise
+    except InvalidInputError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error fetching sources: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error fetching sources: {str(e)}")
 
 
-@router.post("/sources", response_model=SourceResponse)
+@router.post("/sources", response_model=SourceJobResponse, status_code=202)
 async def create_source(source_data: SourceCreate):
-    """Create a new source."""
+    """
+    Submit a new source for processing.
+
+    Extraction, embedding and transformations run in the background worker;
+    poll GET /sources/jobs/{job_id} for progress and the created source ID.
+    """
     try:
         # Verify notebook exists
         notebook = await Notebook.get(source_data.notebook_id)
         if not notebook:
             raise HTTPException(status_code=404, detail="Notebook not found")
 
-        # Prepare content_state for source_graph
-        content_state = {}
-
-        if source_data.type == "link":
-            if not source_data.url:
-                raise HTTPException(
-                    status_code=400, detail="URL is required for link type"
-                )
-            content_state["url"] = source_data.url
-        elif source_data.type == "upload":
-            if not source_data.file_path:
-                raise HTTPException(
-                    status_code=400, detail="File path is required for upload type"
-                )
-            content_state["file_path"] = source_data.file_path
-            content_state["delete_source"] = source_data.delete_source
-        elif source_data.type == "text":
-            if not source_data.content:
-                raise HTTPException(
-                    status_code=400, detail="Content is required for text type"
-                )
-            content_state["content"] = source_data.content
-        else:
-            raise HTTPException(
-                status_code=400,
-                detail="Invalid source type. Must be link, upload, or text",
-            )
+        content_state = build_content_state(source_data)
 
-        # Get transformations to apply
-        transformations = []
+        # Validate transformations before queueing the job
         if source_data.transformations:
             for trans_id in source_data.transformations:
                 transformation = await Transformation.get(trans_id)
@@ -112,34 +126,22 @@ async def create_source(source_data: SourceCreate):
                     raise HTTPException(
                         status_code=404, detail=f"Transformation {trans_id} not found"
                     )
-                transformations.append(transformation)
 
-        # Process source using the source_graph
-        result = await source_graph.ainvoke(
-            {
-                "content_state": content_state,
+        job_id = await CommandService.submit_command_job(
+            module_name="open_notebook",
+            command_name="process_source",
+            command_args={
                 "notebook_id": source_data.notebook_id,
-                "apply_transformations": transformations,
+                "content_state": content_state,
+                "transformations": source_data.transformations or [],
                 "embed": source_data.embed,
-            }
+            },
         )
 
-        source = result["source"]
-
-        return SourceResponse(
-            id=source.id,
-            title=source.title,
-            topics=source.topics or [],
-            asset=AssetModel(
-                file_path=source.asset.file_path if source.asset else None,
-                url=source.asset.url if source.asset else None,
-            )
-            if source.asset
-            else None,
-            full_text=source.full_text,
-            embedded_chunks=await source.get_embedded_chunks(),
-            created=str(source.created),
-            updated=str(source.updated),
+        return SourceJobResponse(
+            job_id=job_id,
+            status="submitted",
+            message="Source submitted for processing",
         )
     except HTTPException:
         raise
@@ -150,6 +152,163 @@ async def create_source(source_data: SourceCreate):
         raise HTTPException(status_code=500, detail=f"Error creating source: {str(e)}")
 
 
+@router.post("/sources/bulk", response_model=BulkSourceJobResponse, status_code=202)
+async def create_sources_bulk(bulk_data: BulkSourceCreate):
+    """
+    Submit many sources to one notebook as a single background job.
+
+    Items are validated individually; invalid ones are returned as rejected and
+    the rest are processed with bounded concurrency per stage. Poll
+    GET /sources/bulk/{job_id} for per-item status and the throughput summary.
+    """
+    try:
+        if len(bulk_data.items) > BULK_MAX_ITEMS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"At most {BULK_MAX_ITEMS} items can be submitted at once",
+            )
+
+        notebook = await Notebook.get(bulk_data.notebook_id)
+        if not notebook:
+            raise HTTPException(status_code=404, detail="Notebook not found")
+
+        for trans_id in bulk_data.transformations:
+            if not await Transformation.get(trans_id):
+                raise HTTPException(
+                    status_code=404, detail=f"Transformation {trans_id} not found"
+                )
+
+        # Items without their own options follow the content settings
+        settings = await ContentSettings.get_instance()
+        embed = (
+            bulk_data.embed
+            if bulk_data.embed is not None
+            else settings.default_embedding_option == "always"
+        )
+        delete_source = settings.auto_delete_files == "yes"
+
+        known_transformations = set(bulk_data.transformations)
+        items: List[Dict[str, Any]] = []
+        rejected: List[BulkSourceRejected] = []
+        for index, item in enumerate(bulk_data.items):
+            try:
+                content_state = build_content_state(item, delete_source)
+                transformations = (
+                    item.transformations
+                    if item.transformations is not None
+                    else bulk_data.transformations
+                )
+                for trans_id in transformations:
+                    if trans_id not in known_transformations:
+                        await Transformation.get(trans_id)
+                        known_transformations.add(trans_id)
+            except (InvalidInputError, NotFoundError) as e:
+                rejected.append(BulkSourceRejected(index=index, error=str(e)))
+                continue
+            items.append(
+                {
+                    "index": index,
+                    "content_state": content_state,
+                    "transformations": transformations,
+                    "embed": item.embed if item.embed is not None else embed,
+                }
+            )
+
+        if not items:
+            return BulkSourceJobResponse(
+                status="rejected", accepted=0, rejected=rejected
+            )
+
+        concurrency = {
+            "extraction": bulk_data.extraction_concurrency,
+            "embedding": bulk_data.embedding_concurrency,
+            "transformation": bulk_data.transformation_concurrency,
+        }
+        job_id = await CommandService.submit_command_job(
+            module_name="open_notebook",
+            command_name="process_source_batch",
+            command_args={
+                "notebook_id": bulk_data.notebook_id,
+                "items": items,
+                "concurrency": {
+                    stage: size for stage, size in concurrency.items() if size
+                },
+            },
+        )
+
+        return BulkSourceJobResponse(
+            job_id=job_id,
+            status="submitted",
+            accepted=len(items),
+            rejected=rejected,
+        )
+    except HTTPException:
+        raise
+    except NotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error submitting bulk sources: {str(e)}")
+        raise HTTPException(
+            status_code=500, detail=f"Error submitting bulk sources: {str(e)}"
+        )
+
+
+@router.get("/sources/bulk/{job_id}", response_model=BulkSourceJobStatusResponse)
+async def get_bulk_source_job(job_id: str):
+    """Get per-item status of a bulk job and, once finished, its summary."""
+    try:
+        status = await CommandService.get_command_status(job_id)
+        # Finished jobs report in their output, running ones on the command record
+        report = status.get("result") or status.get("progress") or {}
+        job_status = status["status"]
+        if job_status == "completed" and report.get("success") is False:
+            job_status = "failed"
+
+        return BulkSourceJobStatusResponse(
+            job_id=job_id,
+            status=job_status,
+            items=[BulkSourceItemStatus(**item) for item in report.get("items", [])],
+            summary=report.get("summary") or None,
+            error_message=status.get("error_message") or report.get("error_message"),
+            created=status.get("created"),
+            updated=status.get("updated"),
+        )
+    except Exception as e:
+        logger.error(f"Error fetching bulk source job {job_id}: {str(e)}")
+        raise HTTPException(
+            status_code=500, detail=f"Error fetching bulk source job: {str(e)}"
+        )
+
+
+@router.get("/sources/jobs/{job_id}", response_model=SourceJobStatusResponse)
+async def get_source_job(job_id: str):
+    """Get the processing status of a submitted source."""
+    try:
+        status = await CommandService.get_command_status(job_id)
+        result = status.get("result") or {}
+        job_status = status["status"]
+        error_message = status.get("error_message") or result.get("error_message")
+        # The command reports failures in its output rather than by raising
+        if job_status == "completed" and result.get("success") is False:
+            job_status = "failed"
+
+        return SourceJobStatusResponse(
+            job_id=job_id,
+            status=job_status,
+            progress=status.get("progress"),
+            source_id=result.get("source_id"),
+            duplicate=bool(result.get("duplicate")),
+            error_message=error_message,
+            created=status.get("created"),
+            updated=status.get("updated"),
+        )
+    except Exception as e:
+        logger.error(f"Error fetching source job {job_id}: {str(e)}")
+        raise HTTPException(
+            status_code=500, detail=f"Error fetching source job: {str(e)}"
+        )
+
+
 @router.get("/sources/{source_id}", response_model=SourceResponse)
 async def get_source(source_id: str):
     """Get a specific source by ID."""
@@ -285,7 +444,8 @@ async def create_source_insight(
         # Run transformation graph
         from open_notebook.graphs.transformation import graph as transform_graph
         await transform_graph.ainvoke(
-            input=dict(source=source, transformation=transformation)
+            input=dict(source=source, transformation=transformation),
+            config=dict(configurable={"bypass_cache": request.bypass_cache}),
         )
         
         # Get the newly created insight (last one)
@@ -192,7 +192,12 @@ async def execute_transformation(execute_request: TransformationExecuteRequest):
                 input_text=execute_request.input_text,
                 transformation=transformation,
             ),
-            config=dict(configurable={"model_id": execute_request.model_id}),
+            config=dict(
+                configurable={
+                    "model_id": execute_request.model_id,
+                    "bypass_cache": execute_request.bypass_cache,
+                }
+            ),
         )
 
         return TransformationExecuteResponse(
@@ -2,8 +2,9 @@
 Sources service layer using API.
 """
 
+import time
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional
 
 from loguru import logger
 
@@ -16,6 +17,7 @@ class SourceWithMetadata:
     """Source object with additional metadata from API."""
     source: Source
     embedded_chunks: int
+    cursor: Optional[str] = None
     
     # Expose common source properties for easy access
     @property
@@ -57,9 +59,16 @@ class SourcesService:
     def __init__(self):
         logger.info("Using API for sources operations")
 
-    def get_all_sources(self, notebook_id: Optional[str] = None) -> List[SourceWithMetadata]:
-        """Get all sources with optional notebook filtering."""
-        sources_data = api_client.get_sources(notebook_id=notebook_id)
+    def get_all_sources(
+        self,
+        notebook_id: Optional[str] = None,
+        limit: Optional[int] = None,
+        after: Optional[str] = None,
+    ) -> List[SourceWithMetadata]:
+        """Get sources with optional notebook filtering and cursor pagination."""
+        sources_data = api_client.get_sources(
+            notebook_id=notebook_id, limit=limit, after=after
+        )
         # Convert API response to SourceWithMetadata objects
         sources = []
         for source_data in sources_data:
@@ -82,7 +91,8 @@ class SourcesService:
             # Wrap in SourceWithMetadata
             source_with_metadata = SourceWithMetadata(
                 source=source,
-                embedded_chunks=source_data.get("embedded_chunks", 0)
+                embedded_chunks=source_data.get("embedded_chunks", 0),
+                cursor=source_data.get("cursor"),
             )
             sources.append(source_with_metadata)
         return sources
@@ -123,9 +133,9 @@ class SourcesService:
         transformations: Optional[List[str]] = None,
         embed: bool = False,
         delete_source: bool = False,
-    ) -> Source:
-        """Create a new source."""
-        source_data = api_client.create_source(
+    ) -> str:
+        """Submit a new source for processing and return its job ID."""
+        job = api_client.create_source(
             notebook_id=notebook_id,
             source_type=source_type,
             url=url,
@@ -136,24 +146,43 @@ class SourcesService:
             embed=embed,
             delete_source=delete_source,
         )
+        return job["job_id"]
 
-        source = Source(
-            title=source_data["title"],
-            topics=source_data["topics"],
-            full_text=source_data["full_text"],
-            asset=Asset(
-                file_path=source_data["asset"]["file_path"]
-                if source_data["asset"]
-                else None,
-                url=source_data["asset"]["url"] if source_data["asset"] else None,
-            )
-            if source_data["asset"]
-            else None,
-        )
-        source.id = source_data["id"]
-        source.created = source_data["created"]
-        source.updated = source_data["updated"]
-        return source
+    def get_source_job(self, job_id: str) -> Dict:
+        """Get the status and current stage of a source processing job."""
+        return api_client.get_source_job(job_id)
+
+    def wait_for_source(
+        self,
+        job_id: str,
+        on_progress: Optional[Callable[[Optional[Dict]], None]] = None,
+        poll_interval: float = 1.0,
+        timeout: float = 900.0,
+    ) -> SourceWithMetadata:
+        """
+        Poll a source processing job until it finishes and return the source.
+
+        Raises TimeoutError when the job has not finished after ``timeout`` seconds,
+        for example because no worker is running to pick it up.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            job = self.get_source_job(job_id)
+            if on_progress:
+                on_progress(job.get("progress"))
+            if job["status"] == "completed":
+                return self.get_source(job["source_id"])
+            if job["status"] in ("failed", "canceled"):
+                raise RuntimeError(
+                    job.get("error_message") or "Source processing failed"
+                )
+            if time.monotonic() >= deadline:
+                raise TimeoutError(
+                    f"Source processing job {job_id} did not finish within "
+                    f"{timeout:g} seconds (status: {job['status']}). "
+                    "Check that the worker is running."
+                )
+            time.sleep(poll_interval)
 
     def update_source(self, source: Source) -> Source:
         """Update a source."""
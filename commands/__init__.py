@@ -2,9 +2,12 @@
 
 from .example_commands import analyze_data_command, process_text_command
 from .podcast_commands import generate_podcast_command
+from .source_commands import process_source_batch_command, process_source_command
 
 __all__ = [
     "generate_podcast_command",
+    "process_source_command",
+    "process_source_batch_command",
     "process_text_command",
     "analyze_data_command",
 ]
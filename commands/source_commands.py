@@ -0,0 +1,301 @@
+import asyncio
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+from surreal_commands import CommandInput, CommandOutput, command
+
+from open_notebook.config import (
+    BULK_EMBEDDING_CONCURRENCY,
+    BULK_EXTRACTION_CONCURRENCY,
+    BULK_TRANSFORMATION_CONCURRENCY,
+)
+from open_notebook.database.repository import ensure_record_id, repo_query
+from open_notebook.domain.content_settings import ContentSettings
+from open_notebook.domain.transformation import Transformation
+from open_notebook.graphs.source import source_graph
+
+
+class SourceProcessingInput(CommandInput):
+    notebook_id: str
+    content_state: Dict[str, Any]
+    transformations: List[str] = []
+    embed: bool = False
+
+
+class SourceProcessingOutput(CommandOutput):
+    success: bool
+    source_id: Optional[str] = None
+    # The content was already stored; source_id is the existing source
+    duplicate: bool = False
+    processing_time: float
+    error_message: Optional[str] = None
+
+
+class SourceBatchInput(CommandInput):
+    notebook_id: str
+    # Each item: index, content_state, transformations (ids) and embed
+    items: List[Dict[str, Any]]
+    concurrency: Dict[str, int] = {}
+
+
+class SourceBatchOutput(CommandOutput):
+    success: bool
+    items: List[Dict[str, Any]] = []
+    summary: Dict[str, Any] = {}
+    error_message: Optional[str] = None
+
+
+# Default sources of one batch allowed in each stage of the source graph at once
+STAGE_CONCURRENCY = {
+    "extraction": BULK_EXTRACTION_CONCURRENCY,
+    "embedding": BULK_EMBEDDING_CONCURRENCY,
+    "transformation": BULK_TRANSFORMATION_CONCURRENCY,
+}
+
+# Batch progress is written to the command record at most this often, in seconds
+BATCH_PROGRESS_INTERVAL = 1.0
+
+
+async def set_command_progress(command_id: str, stage: str, **details) -> None:
+    """Store the current stage on the command record, where job status reads it."""
+    try:
+        await repo_query(
+            "UPDATE $command SET progress = $progress",
+            {
+                "command": ensure_record_id(command_id),
+                "progress": {"stage": stage, **details},
+            },
+        )
+    except Exception as e:
+        # Progress is informational; never fail the ingestion over it
+        logger.warning(f"Could not report progress for {command_id}: {e}")
+
+
+@command("process_source", app="open_notebook")
+async def process_source_command(
+    input_data: SourceProcessingInput,
+) -> SourceProcessingOutput:
+    """
+    Extract, save, embed and transform a source outside of the request path.
+
+    Progress is reported on the command record as {stage, ...}: extracting,
+    saving, chunking, embedding (with done/total chunks), transforming (with the
+    transformation name) and completed.
+    """
+    start_time = time.time()
+    command_id = (
+        input_data.execution_context.command_id
+        if input_data.execution_context
+        else None
+    )
+
+    async def progress(stage: str, **details) -> None:
+        if command_id:
+            await set_command_progress(command_id, stage, **details)
+
+    try:
+        transformations = [
+            await Transformation.get(transformation_id)
+            for transformation_id in input_data.transformations
+        ]
+
+        result = await source_graph.ainvoke(
+            {
+                "content_state": input_data.content_state,
+                "notebook_id": input_data.notebook_id,
+                "apply_transformations": transformations,
+                "embed": input_data.embed,
+            },
+            config={"configurable": {"progress": progress}},
+        )
+        source = result["source"]
+        duplicate = bool(result.get("duplicate"))
+        await progress("completed", source_id=str(source.id), duplicate=duplicate)
+
+        processing_time = time.time() - start_time
+        logger.info(f"Processed source {source.id} in {processing_time:.2f}s")
+        return SourceProcessingOutput(
+            success=True,
+            source_id=str(source.id),
+            duplicate=duplicate,
+            processing_time=processing_time,
+        )
+
+    except Exception as e:
+        processing_time = time.time() - start_time
+        logger.error(f"Source processing failed: {e}")
+        logger.exception(e)
+        await progress("failed")
+
+        return SourceProcessingOutput(
+            success=False, processing_time=processing_time, error_message=str(e)
+        )
+
+
+@command("process_source_batch", app="open_notebook")
+async def process_source_batch_command(
+    input_data: SourceBatchInput,
+) -> SourceBatchOutput:
+    """
+    Run many sources through the source graph concurrently.
+
+    Every item starts right away and waits for a slot in the stage it reaches, so
+    extraction of one source overlaps with embedding and transformation of others.
+    Item statuses are reported on the command record while the batch runs, and
+    the output adds a summary with throughput and time spent per stage.
+    """
+    start_time = time.time()
+    command_id = (
+        input_data.execution_context.command_id
+        if input_data.execution_context
+        else None
+    )
+    concurrency = {
+        stage: input_data.concurrency.get(stage) or default
+        for stage, default in STAGE_CONCURRENCY.items()
+    }
+    limits = {stage: asyncio.Semaphore(size) for stage, size in concurrency.items()}
+    statuses = [
+        {
+            "index": item["index"],
+            "status": "pending",
+            "stage": None,
+            "source_id": None,
+            "duplicate": False,
+            "error": None,
+            "seconds": None,
+        }
+        for item in input_data.items
+    ]
+    stage_seconds: Dict[str, float] = defaultdict(float)
+    characters = 0
+    last_write = 0.0
+
+    def count(status: str) -> int:
+        return sum(1 for item in statuses if item["status"] == status)
+
+    async def write_progress(stage: str = "running", force: bool = False, **details):
+        nonlocal last_write
+        now = time.monotonic()
+        if not command_id or (not force and now - last_write < BATCH_PROGRESS_INTERVAL):
+            return
+        last_write = now
+        await set_command_progress(
+            command_id,
+            stage,
+            total=len(statuses),
+            completed=count("completed"),
+            failed=count("failed"),
+            items=statuses,
+            **details,
+        )
+
+    async def process(item: Dict[str, Any], status: Dict[str, Any]) -> None:
+        nonlocal characters
+        item_start = stage_start = time.monotonic()
+        status["status"] = "running"
+
+        async def progress(stage: str, **details) -> None:
+            nonlocal stage_start
+            now = time.monotonic()
+            if status["stage"]:
+                stage_seconds[status["stage"]] += now - stage_start
+            stage_start = now
+            status["stage"] = stage
+            await write_progress()
+
+        try:
+            result = await source_graph.ainvoke(
+                {
+                    "content_state": item["content_state"],
+                    "notebook_id": input_data.notebook_id,
+                    "apply_transformations": [
+                        transformations[transformation_id]
+                        for transformation_id in item.get("transformations", [])
+                    ],
+                    "embed": item.get("embed", False),
+                },
+                config={"configurable": {"progress": progress, "limits": limits}},
+            )
+            source = result["source"]
+            await progress("completed")
+            characters += len(source.full_text or "")
+            status.update(
+                status="completed",
+                source_id=str(source.id),
+                duplicate=bool(result.get("duplicate")),
+            )
+        except Exception as e:
+            logger.error(f"Bulk item {item['index']} failed: {e}")
+            status.update(status="failed", error=str(e))
+        finally:
+            now = time.monotonic()
+            if status["stage"] not in (None, "completed"):
+                stage_seconds[status["stage"]] += now - stage_start
+            status["seconds"] = round(now - item_start, 3)
+            await write_progress()
+
+    try:
+        transformations = {
+            transformation_id: await Transformation.get(transformation_id)
+            for transformation_id in {
+                transformation_id
+                for item in input_data.items
+                for transformation_id in item.get("transformations", [])
+            }
+        }
+
+        # Read the engines once for the whole batch instead of once per source
+        settings = await ContentSettings.get_instance()
+        for item in input_data.items:
+            item["content_state"].setdefault(
+                "url_engine", settings.default_content_processing_engine_url or "auto"
+            )
+            item["content_state"].setdefault(
+                "document_engine",
+                settings.default_content_processing_engine_doc or "auto",
+            )
+
+        await write_progress(force=True)
+        await asyncio.gather(
+            *(process(item, status) for item, status in zip(input_data.items, statuses))
+        )
+
+        processing_time = time.time() - start_time
+        completed = count("completed")
+        summary = {
+            "total": len(statuses),
+            "completed": completed,
+            "failed": count("failed"),
+            "duplicates": sum(1 for item in statuses if item["duplicate"]),
+            "processing_time": round(processing_time, 3),
+            "sources_per_minute": round(completed / processing_time * 60, 2)
+            if processing_time
+            else 0.0,
+            "characters_per_second": round(characters / processing_time, 1)
+            if processing_time
+            else 0.0,
+            "average_item_seconds": round(
+                sum(item["seconds"] for item in statuses) / len(statuses), 3
+            )
+            if statuses
+            else 0.0,
+            "stage_seconds": {
+                stage: round(seconds, 3) for stage, seconds in stage_seconds.items()
+            },
+            "concurrency": concurrency,
+        }
+        await write_progress("completed", force=True, summary=summary)
+        logger.info(
+            f"Processed bulk batch of {len(statuses)} sources in {processing_time:.2f}s "
+            f"({completed} completed, {summary['failed']} failed)"
+        )
+        return SourceBatchOutput(success=True, items=statuses, summary=summary)
+
+    except Exception as e:
+        logger.error(f"Bulk source processing failed: {e}")
+        logger.exception(e)
+        await write_progress("failed", force=True)
+        return SourceBatchOutput(success=False, items=statuses, error_message=str(e))
@@ -0,0 +1,72 @@
+"""
+Worker entry point for Open Notebook commands.
+
+surreal-commands has no startup hook, so this wraps its worker: the process gets
+its own pool settings (SURREAL_WORKER_POOL_*), and the model cache is warmed up
+and follows model changes on the worker's event loop before it takes commands.
+
+    uv run python -m commands.worker --import-modules commands
+"""
+
+import argparse
+import asyncio
+
+from loguru import logger
+from surreal_commands.core.worker import (
+    DEFAULT_MAX_TASKS,
+    configure_logging,
+    import_command_modules,
+    listen_for_commands,
+)
+
+from open_notebook.database.repository import (
+    close_connection_pool,
+    configure_connection_pool,
+    init_connection_pool,
+)
+from open_notebook.domain.models import model_manager
+
+
+async def _run(max_tasks: int) -> None:
+    try:
+        await init_connection_pool()
+    except Exception as e:
+        logger.warning(f"Could not warm database connection pool: {e}")
+    try:
+        await model_manager.warm_up()
+    except Exception as e:
+        logger.warning(f"Could not warm up models: {e}")
+    model_manager.enable_change_watch()
+    try:
+        await listen_for_commands(max_tasks)
+    finally:
+        await model_manager.close()
+        await close_connection_pool()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Open Notebook command worker")
+    parser.add_argument("-d", "--debug", action="store_true")
+    parser.add_argument("-m", "--max-tasks", type=int, default=DEFAULT_MAX_TASKS)
+    parser.add_argument(
+        "-i",
+        "--import-modules",
+        default="commands",
+        help="Comma-separated modules that register commands",
+    )
+    args = parser.parse_args()
+
+    configure_logging(args.debug)
+    configure_connection_pool("worker")
+    import_command_modules(
+        [module.strip() for module in args.import_modules.split(",") if module.strip()]
+    )
+    logger.info("Starting Open Notebook worker")
+    try:
+        asyncio.run(_run(args.max_tasks))
+    except KeyboardInterrupt:
+        logger.info("Worker stopped by user")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,3 +11,69 @@ LANGGRAPH_CHECKPOINT_FILE = f"{sqlite_folder}/checkpoints.sqlite"
 # UPLOADS FOLDER
 UPLOADS_FOLDER = f"{DATA_FOLDER}/uploads"
 os.makedirs(UPLOADS_FOLDER, exist_ok=True)
+
+# EMBEDDING
+# Chunks sent per provider call and concurrent provider calls (retries are handled
+# by the rate limiter, see RATE LIMITS)
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "50"))
+EMBEDDING_MAX_CONCURRENCY = int(os.getenv("EMBEDDING_MAX_CONCURRENCY", "4"))
+
+# BULK SOURCE INGESTION
+# Sources of one bulk job extracted, embedded and transformed at the same time,
+# and the most items a single bulk request may contain
+BULK_EXTRACTION_CONCURRENCY = int(os.getenv("BULK_EXTRACTION_CONCURRENCY", "4"))
+BULK_EMBEDDING_CONCURRENCY = int(os.getenv("BULK_EMBEDDING_CONCURRENCY", "2"))
+BULK_TRANSFORMATION_CONCURRENCY = int(os.getenv("BULK_TRANSFORMATION_CONCURRENCY", "2"))
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", "500"))
+
+# SOURCE DEDUPLICATION
+# Links and files are matched to a stored source by their extracted text only when
+# it has at least this many characters, so short paywall, error or cookie pages
+# are never merged into one source. Pasted text is always matched.
+SOURCE_DEDUP_MIN_CHARS = int(os.getenv("SOURCE_DEDUP_MIN_CHARS", "2000"))
+
+# MODEL CACHE
+# Provider clients kept by the model manager, one per model and kwargs combination
+MODEL_CACHE_SIZE = int(os.getenv("MODEL_CACHE_SIZE", "32"))
+
+# RATE LIMITS
+# Requests and tokens per minute allowed for each provider model (0 = unlimited).
+# RATE_LIMIT_<PROVIDER>_RPM / _TPM override them per provider, e.g. RATE_LIMIT_OPENAI_TPM.
+RATE_LIMIT_RPM = int(os.getenv("RATE_LIMIT_RPM", "0"))
+RATE_LIMIT_TPM = int(os.getenv("RATE_LIMIT_TPM", "0"))
+# Retries for rate limited or failed provider calls, and the longest backoff in seconds
+RATE_LIMIT_MAX_RETRIES = int(os.getenv("RATE_LIMIT_MAX_RETRIES", "5"))
+RATE_LIMIT_RETRY_MAX_DELAY = float(os.getenv("RATE_LIMIT_RETRY_MAX_DELAY", "60"))
+
+# QUERY EMBEDDING CACHE
+# Entries kept in memory, seconds before a cached query embedding expires, and
+# whether to also share them between processes through the database
+QUERY_EMBEDDING_CACHE_SIZE = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "1024"))
+QUERY_EMBEDDING_CACHE_TTL = int(os.getenv("QUERY_EMBEDDING_CACHE_TTL", "86400"))
+QUERY_EMBEDDING_CACHE_SHARED = os.getenv(
+    "QUERY_EMBEDDING_CACHE_SHARED", "false"
+).lower() in ("1", "true", "yes")
+
+# LLM RESPONSE CACHE
+# Reuse transformation and prompt responses for identical calls, keep them this many
+# seconds, and trim the table to this many most recently used entries
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+LLM_CACHE_MAX_AGE = int(os.getenv("LLM_CACHE_MAX_AGE", "2592000"))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000"))
+
+# ASK
+# Search branches answered in parallel, seconds each branch may take, and whether
+# to write the final answer from the branches that finished when others fail
+ASK_MAX_CONCURRENCY = int(os.getenv("ASK_MAX_CONCURRENCY", "3"))
+ASK_BRANCH_TIMEOUT = float(os.getenv("ASK_BRANCH_TIMEOUT", "60"))
+ASK_BEST_EFFORT = os.getenv("ASK_BEST_EFFORT", "true").lower() in ("1", "true", "yes")
+# Minimum question similarity for a cached answer to be reused (ask "use_cache")
+ASK_CACHE_SIMILARITY = float(os.getenv("ASK_CACHE_SIMILARITY", "0.95"))
+
+# CHAT
+# Token budget for the notebook context sent with each chat turn. Kept below the
+# large-context threshold so chat stays on the regular model.
+CHAT_CONTEXT_TOKEN_BUDGET = int(os.getenv("CHAT_CONTEXT_TOKEN_BUDGET", "80000"))
+# Checkpoints kept per chat session, and how many checkpoint writes between prunes
+CHAT_CHECKPOINT_KEEP = int(os.getenv("CHAT_CHECKPOINT_KEEP", "10"))
+CHAT_CHECKPOINT_PRUNE_INTERVAL = int(os.getenv("CHAT_CHECKPOINT_PRUNE_INTERVAL", "20"))
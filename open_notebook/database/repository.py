@@ -1,13 +1,22 @@
+import asyncio
 import os
+import time
+import weakref
+from collections import deque
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, TypeVar, Union
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, TypeVar, Union
 
 from loguru import logger
 from surrealdb import AsyncSurreal, RecordID  # type: ignore
+from websockets.exceptions import WebSocketException
 
 T = TypeVar("T", Dict[str, Any], List[Dict[str, Any]])
 
+# Errors that leave the connection itself unusable (timeouts are OSErrors too);
+# query errors are reported by the server and keep the socket healthy
+CONNECTION_ERRORS = (OSError, WebSocketException)
+
 
 def get_database_url():
     """Get database URL with backward compatibility"""
@@ -44,8 +53,12 @@ def ensure_record_id(value: Union[str, RecordID]) -> RecordID:
     return RecordID.parse(value)
 
 
-@asynccontextmanager
-async def db_connection():
+async def open_connection() -> AsyncSurreal:
+    """
+    Open, authenticate and scope a new SurrealDB connection, outside the pool.
+
+    For long-lived uses such as LIVE queries; the caller closes it.
+    """
     db = AsyncSurreal(get_database_url())
     await db.signin(
         {
@@ -56,6 +69,182 @@ async def db_connection():
     await db.use(
         os.environ.get("SURREAL_NAMESPACE"), os.environ.get("SURREAL_DATABASE")
     )
+    return db
+
+
+class _PooledConnection:
+    __slots__ = ("db", "last_used")
+
+    def __init__(self, db: AsyncSurreal) -> None:
+        self.db = db
+        self.last_used = time.monotonic()
+
+
+class ConnectionPool:
+    """
+    Long-lived pool of authenticated SurrealDB connections.
+
+    Connections are opened lazily up to ``max_size`` and ``min_size`` of them are
+    kept warm. A connection that sat idle for longer than
+    ``health_check_interval`` seconds is pinged before being handed out and is
+    transparently replaced when the ping fails. Connections that hit a transport
+    error while in use are discarded instead of being returned to the pool.
+    """
+
+    def __init__(
+        self,
+        name: str = "default",
+        min_size: int = 1,
+        max_size: int = 10,
+        health_check_interval: float = 30.0,
+        acquire_timeout: float = 30.0,
+    ) -> None:
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError(
+                f"Invalid pool size for {name}: min={min_size}, max={max_size}"
+            )
+        self.name = name
+        self.min_size = min_size
+        self.max_size = max_size
+        self.health_check_interval = health_check_interval
+        self.acquire_timeout = acquire_timeout
+        self._idle: Deque[_PooledConnection] = deque()
+        self._semaphore = asyncio.Semaphore(max_size)
+        self._closed = False
+
+    async def initialize(self) -> None:
+        """Open ``min_size`` connections up front so the first requests are warm."""
+        while len(self._idle) < self.min_size:
+            self._idle.append(_PooledConnection(await open_connection()))
+        logger.debug(f"Connection pool '{self.name}' warmed with {len(self._idle)}")
+
+    async def _is_healthy(self, conn: _PooledConnection) -> bool:
+        if time.monotonic() - conn.last_used < self.health_check_interval:
+            return True
+        try:
+            await conn.db.query("RETURN true;")
+            return True
+        except Exception as e:
+            logger.warning(f"Discarding unhealthy connection from '{self.name}': {e}")
+            return False
+
+    async def _discard(self, conn: _PooledConnection) -> None:
+        try:
+            await conn.db.close()
+        except Exception:
+            pass
+
+    async def acquire(self) -> _PooledConnection:
+        if self._closed:
+            raise RuntimeError(f"Connection pool '{self.name}' is closed")
+        await asyncio.wait_for(self._semaphore.acquire(), self.acquire_timeout)
+        try:
+            while self._idle:
+                conn = self._idle.pop()
+                if await self._is_healthy(conn):
+                    return conn
+                await self._discard(conn)
+            return _PooledConnection(await open_connection())
+        except BaseException:
+            self._semaphore.release()
+            raise
+
+    async def release(self, conn: _PooledConnection, broken: bool = False) -> None:
+        try:
+            if broken or self._closed:
+                await self._discard(conn)
+            else:
+                conn.last_used = time.monotonic()
+                self._idle.append(conn)
+        finally:
+            self._semaphore.release()
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[AsyncSurreal]:
+        conn = await self.acquire()
+        broken = False
+        try:
+            yield conn.db
+        except CONNECTION_ERRORS:
+            broken = True
+            raise
+        finally:
+            await self.release(conn, broken=broken)
+
+    async def close(self) -> None:
+        self._closed = True
+        while self._idle:
+            await self._discard(self._idle.pop())
+
+
+def _pool_setting(name: str, key: str, default: str) -> str:
+    """Read a pool setting, preferring the role specific variable (e.g. SURREAL_API_POOL_MAX_SIZE)."""
+    return os.getenv(f"SURREAL_{name.upper()}_POOL_{key}") or os.getenv(
+        f"SURREAL_POOL_{key}", default
+    )
+
+
+_pool_name = "default"
+# Connections are bound to the event loop that opened them, so keep one pool per loop
+_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, ConnectionPool]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def configure_connection_pool(name: str) -> None:
+    """
+    Select the pool settings used by this process.
+
+    The API and the worker call this at startup with their own name so each can be
+    sized independently through SURREAL_<NAME>_POOL_MIN_SIZE / _MAX_SIZE.
+    """
+    global _pool_name
+    _pool_name = name
+
+
+def get_connection_pool() -> Optional[ConnectionPool]:
+    """Get the connection pool opened for the running event loop, if any."""
+    return _pools.get(asyncio.get_running_loop())
+
+
+async def init_connection_pool() -> None:
+    """
+    Create and warm the pool for the running event loop.
+
+    Only long-running processes that close it again on shutdown (the API and the
+    worker) open a pool; anything else, such as migrations, Streamlit pages or
+    scripts running their own asyncio.run, gets a connection per call.
+    """
+    loop = asyncio.get_running_loop()
+    pool = _pools.get(loop)
+    if pool is None:
+        pool = ConnectionPool(
+            name=_pool_name,
+            min_size=int(_pool_setting(_pool_name, "MIN_SIZE", "1")),
+            max_size=int(_pool_setting(_pool_name, "MAX_SIZE", "10")),
+            health_check_interval=float(
+                _pool_setting(_pool_name, "HEALTH_CHECK_INTERVAL", "30")
+            ),
+        )
+        _pools[loop] = pool
+    await pool.initialize()
+
+
+async def close_connection_pool() -> None:
+    """Close the pool bound to the running event loop, if any."""
+    pool = _pools.pop(asyncio.get_running_loop(), None)
+    if pool:
+        await pool.close()
+
+
+@asynccontextmanager
+async def db_connection():
+    pool = get_connection_pool()
+    if pool:
+        async with pool.connection() as db:
+            yield db
+        return
+    db = await open_connection()
     try:
         yield db
     finally:
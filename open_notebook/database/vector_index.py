@@ -0,0 +1,85 @@
+"""
+HNSW vector indexes for the embedding columns used by fn::vector_search and the
+ask answer cache.
+
+The index DIMENSION has to match the configured embedding model, which is only
+known at runtime, so the indexes are (re)defined here instead of in a static
+migration file.
+"""
+
+import re
+from typing import Dict, Optional
+
+from loguru import logger
+
+from .repository import repo_query
+
+VECTOR_INDEXES: Dict[str, str] = {
+    "source_embedding": "idx_source_embedding_vector",
+    "source_insight": "idx_source_insight_vector",
+    "note": "idx_note_vector",
+    "ask_answer_cache": "idx_ask_answer_cache_vector",
+}
+
+# Rows whose vectors would not fit an index of the new dimension. Source chunks
+# and cached answers are dropped (re-vectorizing a source embeds its chunks
+# again); notes and insights keep their content and lose the stale vector until
+# they are saved again.
+CLEAR_OTHER_DIMENSIONS: Dict[str, str] = {
+    "source_embedding": "DELETE source_embedding WHERE array::len(embedding) != $dimension",
+    "source_insight": "UPDATE source_insight SET embedding = NONE "
+    "WHERE embedding != NONE AND array::len(embedding) != $dimension",
+    "note": "UPDATE note SET embedding = NONE "
+    "WHERE embedding != NONE AND array::len(embedding) != $dimension",
+    "ask_answer_cache": "DELETE ask_answer_cache WHERE array::len(embedding) != $dimension",
+}
+
+DIMENSION_PATTERN = re.compile(r"DIMENSION (\d+)")
+
+# Dimension already verified in this process, so the check runs once per process
+_ensured_dimension: Optional[int] = None
+
+
+async def _current_dimension(table: str, index: str) -> Optional[int]:
+    info = await repo_query(f"INFO FOR TABLE {table};")
+    if isinstance(info, list):
+        info = info[0] if info else {}
+    definition = (info or {}).get("indexes", {}).get(index)
+    if not definition:
+        return None
+    match = DIMENSION_PATTERN.search(definition)
+    return int(match.group(1)) if match else None
+
+
+async def ensure_vector_indexes(dimension: int) -> None:
+    """
+    Make sure every embedding column has an HNSW index with the given dimension.
+
+    Missing indexes are created and indexes built for a different dimension (after
+    the default embedding model changed) are rebuilt, after clearing the vectors
+    that do not have the new dimension.
+    """
+    global _ensured_dimension
+    if not dimension or dimension == _ensured_dimension:
+        return
+
+    for table, index in VECTOR_INDEXES.items():
+        current = await _current_dimension(table, index)
+        if current == dimension:
+            continue
+        if current is not None:
+            logger.warning(
+                f"Rebuilding {index} from dimension {current} to {dimension}. "
+                "Vectors from the previous embedding model are cleared; embed "
+                "sources again and re-save notes to make them searchable."
+            )
+            await repo_query(f"REMOVE INDEX IF EXISTS {index} ON TABLE {table};")
+        # The index cannot be built over vectors of another dimension
+        await repo_query(CLEAR_OTHER_DIMENSIONS[table], {"dimension": dimension})
+        logger.info(f"Defining HNSW index {index} with dimension {dimension}")
+        await repo_query(
+            f"DEFINE INDEX IF NOT EXISTS {index} ON TABLE {table} "
+            f"FIELDS embedding HNSW DIMENSION {dimension} DIST COSINE CONCURRENTLY;"
+        )
+
+    _ensured_dimension = dimension
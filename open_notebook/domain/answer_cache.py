@@ -0,0 +1,127 @@
+"""
+Semantic cache of /search/ask answers.
+
+Answers are stored with the question embedding, the models that produced them and
+the ids they cite. A new question reuses the closest cached answer for the same
+models when it is similar enough and none of the cited records changed (or were
+deleted) since the answer was written.
+"""
+
+import re
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+from open_notebook.config import ASK_CACHE_SIMILARITY
+from open_notebook.database.repository import ensure_record_id, repo_query
+from open_notebook.database.vector_index import ensure_vector_indexes
+from open_notebook.domain.embedding_cache import embed_query
+
+# Citations look like [source:abc], [note:abc], [source_insight:abc], [source_embedding:abc]
+CITATION_PATTERN = re.compile(
+    r"\[((?:source_insight|note|source|source_embedding):[\w\d]+)\]"
+)
+
+# Nearest cached questions compared against the threshold
+CANDIDATES = 5
+
+
+def cited_ids(answer: str) -> List[str]:
+    return list(dict.fromkeys(CITATION_PATTERN.findall(answer)))
+
+
+class AskAnswerCache:
+    def __init__(self, min_similarity: float):
+        self.min_similarity = min_similarity
+        self.hits = 0
+        self.misses = 0
+        self.invalidated = 0
+        self.stored = 0
+
+    async def _is_fresh(self, entry: Dict[str, Any]) -> bool:
+        """True when every cited record still exists and was not updated since."""
+        cited = entry.get("cited") or []
+        rows = await repo_query(
+            """
+            SELECT id, (updated > $created OR source.updated > $created) AS changed
+            FROM $cited
+            """,
+            {
+                "cited": [ensure_record_id(id) for id in cited],
+                "created": entry["created"],
+            },
+        )
+        return len(rows) == len(cited) and not any(row["changed"] for row in rows)
+
+    async def lookup(self, question: str, models: str) -> Optional[Dict[str, Any]]:
+        """Return the cached answer for a similar question, or None."""
+        try:
+            embed = await embed_query(question)
+            await ensure_vector_indexes(len(embed))
+            candidates = await repo_query(
+                f"""
+                SELECT id, question, answer, cited, created,
+                    1 - vector::distance::knn() AS similarity
+                FROM ask_answer_cache
+                WHERE models = $models AND embedding <|{CANDIDATES}, 100|> $embed
+                ORDER BY similarity DESC
+                """,
+                {"embed": embed, "models": models},
+            )
+            for entry in candidates:
+                if entry["similarity"] < self.min_similarity:
+                    break
+                if await self._is_fresh(entry):
+                    self.hits += 1
+                    return entry
+                self.invalidated += 1
+                await repo_query(
+                    "DELETE $id", {"id": ensure_record_id(entry["id"])}
+                )
+        except Exception as e:
+            # A broken cache must never break ask
+            logger.warning(f"Ask answer cache lookup failed: {str(e)}")
+        self.misses += 1
+        return None
+
+    async def store(self, question: str, models: str, answer: str) -> None:
+        """Cache an answer. Answers without citations cannot be invalidated and are skipped."""
+        cited = cited_ids(answer)
+        if not cited:
+            return
+        try:
+            await repo_query(
+                """
+                CREATE ask_answer_cache CONTENT {
+                    question: $question,
+                    embedding: $embedding,
+                    models: $models,
+                    answer: $answer,
+                    cited: $cited
+                }
+                """,
+                {
+                    "question": question,
+                    "embedding": await embed_query(question),
+                    "models": models,
+                    "answer": answer,
+                    "cited": [ensure_record_id(id) for id in cited],
+                },
+            )
+            self.stored += 1
+        except Exception as e:
+            logger.warning(f"Could not cache ask answer: {str(e)}")
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "invalidated": self.invalidated,
+            "stored": self.stored,
+            "min_similarity": self.min_similarity,
+        }
+
+
+ask_answer_cache = AskAnswerCache(min_similarity=ASK_CACHE_SIMILARITY)
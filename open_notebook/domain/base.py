@@ -1,5 +1,17 @@
+import base64
+import json
+import re
 from datetime import datetime
-from typing import Any, ClassVar, Dict, List, Optional, Type, TypeVar, cast
+from typing import (
+    Any,
+    ClassVar,
+    Dict,
+    List,
+    Optional,
+    Type,
+    TypeVar,
+    cast,
+)
 
 from loguru import logger
 from pydantic import BaseModel, ValidationError, field_validator, model_validator
@@ -13,6 +25,7 @@ from open_notebook.database.repository import (
     repo_update,
     repo_upsert,
 )
+from open_notebook.database.vector_index import ensure_vector_indexes
 from open_notebook.exceptions import (
     DatabaseOperationError,
     InvalidInputError,
@@ -21,6 +34,34 @@ from open_notebook.exceptions import (
 
 T = TypeVar("T", bound="ObjectModel")
 
+FIELD_NAME_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_.]*$")
+
+# Keyset condition for "records after the cursor" when ordering by updated DESC,
+# id DESC. The SDK reads datetimes to the microsecond, so updated is floored to match.
+KEYSET_AFTER_CONDITION = """(
+    time::floor(updated, 1us) < $after_updated
+    OR (time::floor(updated, 1us) = $after_updated AND id < $after_id)
+)"""
+
+
+def encode_cursor(updated: datetime, id: Any) -> str:
+    """Opaque pagination cursor holding a record's position: its updated time and id."""
+    payload = json.dumps([updated.isoformat(), str(id)]).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Turn a cursor from encode_cursor into the KEYSET_AFTER_CONDITION variables."""
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        updated, id = json.loads(payload)
+        return {
+            "after_updated": datetime.fromisoformat(updated),
+            "after_id": ensure_record_id(id),
+        }
+    except Exception:
+        raise InvalidInputError(f"Invalid pagination cursor: {cursor}")
+
 
 class ObjectModel(BaseModel):
     id: Optional[str] = None
@@ -29,38 +70,94 @@ class ObjectModel(BaseModel):
     updated: Optional[datetime] = None
 
     @classmethod
-    async def get_all(cls: Type[T], order_by=None) -> List[T]:
-        try:
-            # If called from a specific subclass, use its table_name
-            if cls.table_name:
-                target_class = cls
-                table_name = cls.table_name
-            else:
-                # This path is taken if called directly from ObjectModel
+    def _projection(
+        cls, fields: Optional[List[str]] = None, omit: Optional[List[str]] = None
+    ) -> str:
+        """Build the SELECT projection; id, created and updated are always kept."""
+        if fields and omit:
+            raise InvalidInputError("Use either fields or omit, not both")
+        for name in [*(fields or []), *(omit or [])]:
+            if not FIELD_NAME_PATTERN.match(name):
+                raise InvalidInputError(f"Invalid field name: {name}")
+        if fields:
+            return ", ".join(dict.fromkeys(["id", "created", "updated", *fields]))
+        if omit:
+            return f"* OMIT {', '.join(omit)}"
+        return "*"
+
+    @classmethod
+    async def _select_all(
+        cls,
+        order_by: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        omit: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        after: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        if not cls.table_name:
+            # This path is taken if called directly from ObjectModel
+            raise InvalidInputError(
+                "get_all() must be called from a specific model class"
+            )
+        vars: Dict[str, Any] = {}
+        where = ""
+        if after:
+            if order_by:
                 raise InvalidInputError(
-                    "get_all() must be called from a specific model class"
+                    "Cursor pagination always orders by updated desc, id desc"
                 )
-            if order_by:
-                query = f"SELECT * FROM {table_name} ORDER BY {order_by}"
-            else:
-                query = f"SELECT * FROM {table_name}"
+            where = f"WHERE {KEYSET_AFTER_CONDITION}"
+            vars.update(decode_cursor(after))
+        if after or limit:
+            order_by = order_by or "updated DESC, id DESC"
+        query = f"SELECT {cls._projection(fields, omit)} FROM {cls.table_name} {where}"
+        if order_by:
+            query += f" ORDER BY {order_by}"
+        if limit:
+            query += f" LIMIT {int(limit)}"
+        return await repo_query(query, vars)
 
-            result = await repo_query(query)
+    @classmethod
+    async def get_all(
+        cls: Type[T],
+        order_by=None,
+        fields: Optional[List[str]] = None,
+        omit: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        after: Optional[str] = None,
+    ) -> List[T]:
+        """
+        Get the records of this table.
+
+        `fields` selects only the given columns and `omit` leaves out heavy ones such
+        as full_text or embedding. With `limit` and/or `after` (the encode_cursor of
+        the last record received), records come newest first in keyset pages on
+        updated, id.
+        """
+        try:
+            result = await cls._select_all(order_by, fields, omit, limit, after)
             objects = []
             for obj in result:
                 try:
-                    objects.append(target_class(**obj))
+                    objects.append(cls(**obj))
                 except Exception as e:
                     logger.critical(f"Error creating object: {str(e)}")
 
             return objects
+        except InvalidInputError:
+            raise
         except Exception as e:
             logger.error(f"Error fetching all {cls.table_name}: {str(e)}")
             logger.exception(e)
             raise DatabaseOperationError(e)
 
     @classmethod
-    async def get(cls: Type[T], id: str) -> T:
+    async def get(
+        cls: Type[T],
+        id: str,
+        fields: Optional[List[str]] = None,
+        omit: Optional[List[str]] = None,
+    ) -> T:
         if not id:
             raise InvalidInputError("ID cannot be empty")
         try:
@@ -77,7 +174,10 @@ class ObjectModel(BaseModel):
                     raise InvalidInputError(f"No class found for table {table_name}")
                 target_class = cast(Type[T], found_class)
 
-            result = await repo_query("SELECT * FROM $id", {"id": ensure_record_id(id)})
+            result = await repo_query(
+                f"SELECT {cls._projection(fields, omit)} FROM $id",
+                {"id": ensure_record_id(id)},
+            )
             if result:
                 return target_class(**result[0])
             else:
@@ -121,15 +221,16 @@ class ObjectModel(BaseModel):
                 embedding_content = self.get_embedding_content()
                 if embedding_content:
                     EMBEDDING_MODEL = await model_manager.get_embedding_model()
-                    if not EMBEDDING_MODEL:
+                    if EMBEDDING_MODEL:
+                        data["embedding"] = (
+                            await EMBEDDING_MODEL.aembed([embedding_content])
+                        )[0]
+                        await ensure_vector_indexes(len(data["embedding"]))
+                    else:
+                        # Left unset: an empty vector does not fit the HNSW index
                         logger.warning(
                             "No embedding model found. Content will not be searchable."
                         )
-                    data["embedding"] = (
-                        (await EMBEDDING_MODEL.aembed([embedding_content]))[0]
-                        if EMBEDDING_MODEL
-                        else []
-                    )
 
             if self.id is None:
                 data["created"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -0,0 +1,392 @@
+import asyncio
+import math
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Literal, NamedTuple, Optional, Tuple
+
+from loguru import logger
+
+from open_notebook.database.repository import ensure_record_id, repo_query
+from open_notebook.domain.embedding_cache import embed_query
+from open_notebook.domain.models import model_manager
+from open_notebook.domain.notebook import Note, Source, SourceInsight
+from open_notebook.exceptions import DatabaseOperationError
+from open_notebook.utils import token_count
+
+ContextSize = Literal["short", "long"]
+
+# Token counts of context items keyed by their id and last update, so unchanged
+# items are not re-tokenized on every chat turn
+TOKEN_CACHE_SIZE = 4096
+_token_cache: "OrderedDict[Hashable, int]" = OrderedDict()
+
+
+def cached_token_count(key: Hashable, item: Any) -> int:
+    if key in _token_cache:
+        _token_cache.move_to_end(key)
+        return _token_cache[key]
+    tokens = token_count(str(item))
+    _token_cache[key] = tokens
+    if len(_token_cache) > TOKEN_CACHE_SIZE:
+        _token_cache.popitem(last=False)
+    return tokens
+
+
+def _full_id(table: str, id: str) -> str:
+    return id if id.startswith(f"{table}:") else f"{table}:{id}"
+
+
+async def _fetch_sources(ids: List[str], with_full_text: bool) -> List[Source]:
+    if not ids:
+        return []
+    omit = "" if with_full_text else "OMIT full_text"
+    result = await repo_query(
+        f"SELECT * {omit} FROM $ids",
+        {"ids": [ensure_record_id(id) for id in ids]},
+    )
+    return [Source(**row) for row in result]
+
+
+async def _fetch_insights(
+    source_ids: List[str], embeddings: Optional[Dict[str, List[float]]]
+) -> Dict[str, List[SourceInsight]]:
+    """Fetch insights grouped by source, collecting their vectors into `embeddings` when needed."""
+    if not source_ids:
+        return {}
+    result = await repo_query(
+        f"SELECT * {'' if embeddings is not None else 'OMIT embedding'} FROM source_insight WHERE source IN $ids",
+        {"ids": [ensure_record_id(id) for id in source_ids]},
+    )
+    insights: Dict[str, List[SourceInsight]] = {}
+    for row in result:
+        if embeddings is not None and row.get("embedding"):
+            embeddings[row["id"]] = row["embedding"]
+        insights.setdefault(str(row["source"]), []).append(SourceInsight(**row))
+    return insights
+
+
+async def _fetch_notes(
+    ids: List[str], embeddings: Optional[Dict[str, List[float]]]
+) -> List[Note]:
+    if not ids:
+        return []
+    result = await repo_query(
+        f"SELECT * {'' if embeddings is not None else 'OMIT embedding'} FROM $ids",
+        {"ids": [ensure_record_id(id) for id in ids]},
+    )
+    if embeddings is not None:
+        embeddings.update(
+            {row["id"]: row["embedding"] for row in result if row.get("embedding")}
+        )
+    return [Note(**row) for row in result]
+
+
+async def _fetch_chunks(source_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """Fetch the embedded full-text chunks of the given sources, in document order."""
+    if not source_ids:
+        return {}
+    result = await repo_query(
+        "SELECT id, source, order, content, embedding FROM source_embedding WHERE source IN $ids ORDER BY order",
+        {"ids": [ensure_record_id(id) for id in source_ids]},
+    )
+    chunks: Dict[str, List[Dict[str, Any]]] = {}
+    for row in result:
+        chunks.setdefault(str(row["source"]), []).append(row)
+    return chunks
+
+
+def cosine_similarity(a: List[float], b: List[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+class _ContextUnit(NamedTuple):
+    """A piece of context that is either packed whole or dropped."""
+
+    type: Literal["insight", "note", "excerpt", "full_text"]
+    id: str
+    parent_id: str
+    tokens: int
+    score: float
+
+
+def _source_context(
+    source: Source, insights: List[SourceInsight], context_size: ContextSize
+) -> Tuple[Dict[str, Any], Hashable]:
+    context: Dict[str, Any] = dict(
+        id=source.id,
+        title=source.title,
+        insights=[insight.model_dump() for insight in insights],
+    )
+    if context_size == "long":
+        context["full_text"] = source.full_text
+    key = (
+        source.id,
+        str(source.updated),
+        context_size,
+        tuple((insight.id, str(insight.updated)) for insight in insights),
+    )
+    return context, key
+
+
+async def build_context(
+    sources: Dict[str, ContextSize],
+    notes: Dict[str, ContextSize],
+    token_budget: Optional[int] = None,
+    question: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Assemble the context for the given sources and notes.
+
+    All selected records are fetched with a handful of `IN $ids` queries that run
+    concurrently. Token counts are computed per item and summed.
+
+    When a `token_budget` is given, whole insights, notes and full-text excerpts
+    (the source's embedded chunks) are packed greedily, most relevant to
+    `question` first, until the budget is filled. Relevance comes from the stored
+    embeddings. Without a question or an embedding model, items keep their
+    selection order. Whatever did not fit is listed under "dropped".
+
+    Args:
+        sources: source id -> context size ("short" = insights, "long" = full text)
+        notes: note id -> context size
+        token_budget: maximum number of tokens of context to return
+        question: the question the context is being assembled for
+
+    Returns:
+        dict with "source" and "note" context lists, "total_tokens" and "dropped".
+    """
+    source_sizes = {_full_id("source", id): size for id, size in sources.items()}
+    note_sizes = {_full_id("note", id): size for id, size in notes.items()}
+    long_ids = [id for id, size in source_sizes.items() if size == "long"]
+    budgeted = token_budget is not None
+    embeddings: Optional[Dict[str, List[float]]] = {} if budgeted else None
+    try:
+        short_sources, long_sources, insights, fetched_notes, chunks = (
+            await asyncio.gather(
+                _fetch_sources(
+                    [id for id, size in source_sizes.items() if size == "short"],
+                    False,
+                ),
+                _fetch_sources(long_ids, True),
+                _fetch_insights(list(source_sizes.keys()), embeddings),
+                _fetch_notes(list(note_sizes.keys()), embeddings),
+                _fetch_chunks(long_ids if budgeted else []),
+            )
+        )
+    except Exception as e:
+        logger.error(f"Error fetching context items: {str(e)}")
+        logger.exception(e)
+        raise DatabaseOperationError(e)
+
+    # Keep the order in which items were requested
+    fetched_sources = {
+        source.id: source for source in [*short_sources, *long_sources]
+    }
+    notes_by_id = {note.id: note for note in fetched_notes}
+
+    if budgeted:
+        assert embeddings is not None and token_budget is not None
+        return await _pack_context(
+            source_sizes,
+            note_sizes,
+            fetched_sources,
+            insights,
+            notes_by_id,
+            chunks,
+            embeddings,
+            token_budget,
+            question,
+        )
+
+    total_tokens = 0
+    source_contexts = []
+    for id, size in source_sizes.items():
+        source = fetched_sources.get(id)
+        if not source:
+            logger.warning(f"Source {id} not found, skipping from context")
+            continue
+        context, key = _source_context(source, insights.get(id, []), size)
+        source_contexts.append(context)
+        total_tokens += cached_token_count(key, context)
+
+    note_contexts = []
+    for id, size in note_sizes.items():
+        note = notes_by_id.get(id)
+        if not note:
+            logger.warning(f"Note {id} not found, skipping from context")
+            continue
+        context = note.get_context(context_size=size)
+        note_contexts.append(context)
+        total_tokens += cached_token_count((note.id, str(note.updated), size), context)
+
+    return {
+        "source": source_contexts,
+        "note": note_contexts,
+        "total_tokens": total_tokens,
+        "dropped": [],
+    }
+
+
+async def _pack_context(
+    source_sizes: Dict[str, ContextSize],
+    note_sizes: Dict[str, ContextSize],
+    sources: Dict[str, Source],
+    insights: Dict[str, List[SourceInsight]],
+    notes: Dict[str, Note],
+    chunks: Dict[str, List[Dict[str, Any]]],
+    embeddings: Dict[str, List[float]],
+    token_budget: int,
+    question: Optional[str],
+) -> Dict[str, Any]:
+    query_embedding: Optional[List[float]] = None
+    if question:
+        if await model_manager.get_embedding_model():
+            query_embedding = await embed_query(question)
+
+    def score(id: str) -> float:
+        if query_embedding is None or id not in embeddings:
+            return 0.0
+        return cosine_similarity(query_embedding, embeddings[id])
+
+    units: List[_ContextUnit] = []
+    texts: Dict[str, str] = {}
+    for source_id, size in source_sizes.items():
+        source = sources.get(source_id)
+        if not source:
+            logger.warning(f"Source {source_id} not found, skipping from context")
+            continue
+        for insight in insights.get(source_id, []):
+            units.append(
+                _ContextUnit(
+                    "insight",
+                    insight.id,
+                    source_id,
+                    cached_token_count(
+                        (insight.id, str(insight.updated)), insight.model_dump()
+                    ),
+                    score(insight.id),
+                )
+            )
+    for note_id, size in note_sizes.items():
+        note = notes.get(note_id)
+        if not note:
+            logger.warning(f"Note {note_id} not found, skipping from context")
+            continue
+        units.append(
+            _ContextUnit(
+                "note",
+                note_id,
+                note_id,
+                cached_token_count(
+                    (note.id, str(note.updated), size), note.get_context(size)
+                ),
+                score(note_id),
+            )
+        )
+    for source_id, size in source_sizes.items():
+        source = sources.get(source_id)
+        if size != "long" or not source:
+            continue
+        if chunks.get(source_id):
+            for chunk in chunks[source_id]:
+                embeddings[chunk["id"]] = chunk["embedding"]
+                texts[chunk["id"]] = chunk["content"]
+                units.append(
+                    _ContextUnit(
+                        "excerpt",
+                        chunk["id"],
+                        source_id,
+                        cached_token_count(chunk["id"], chunk["content"]),
+                        score(chunk["id"]),
+                    )
+                )
+        elif source.full_text:
+            # Not embedded: the full text can only be packed as a whole
+            units.append(
+                _ContextUnit(
+                    "full_text",
+                    source_id,
+                    source_id,
+                    cached_token_count(
+                        (source_id, str(source.updated), "full_text"),
+                        source.full_text,
+                    ),
+                    0.0,
+                )
+            )
+
+    # Source id and title are paid for once, with the first unit of the source
+    header_tokens = {
+        source_id: cached_token_count(
+            (source_id, str(source.updated), "header"),
+            dict(id=source.id, title=source.title),
+        )
+        for source_id, source in sources.items()
+    }
+
+    used = 0
+    selected: Dict[str, List[_ContextUnit]] = {}
+    dropped: List[Dict[str, Any]] = []
+    # sorted() is stable, so without relevance scores the selection order is kept
+    for unit in sorted(units, key=lambda u: u.score, reverse=True):
+        cost = unit.tokens
+        if unit.type != "note" and unit.parent_id not in selected:
+            cost += header_tokens.get(unit.parent_id, 0)
+        if used + cost > token_budget:
+            dropped.append(
+                dict(
+                    type=unit.type,
+                    id=unit.id,
+                    parent_id=unit.parent_id,
+                    tokens=unit.tokens,
+                )
+            )
+            continue
+        used += cost
+        selected.setdefault(unit.parent_id, []).append(unit)
+
+    source_contexts = []
+    for source_id, size in source_sizes.items():
+        source = sources.get(source_id)
+        if not source or source_id not in selected:
+            continue
+        picked = {unit.id for unit in selected[source_id]}
+        context: Dict[str, Any] = dict(
+            id=source.id,
+            title=source.title,
+            insights=[
+                insight.model_dump()
+                for insight in insights.get(source_id, [])
+                if insight.id in picked
+            ],
+        )
+        if size == "long":
+            if source_id in picked:
+                context["full_text"] = source.full_text
+            else:
+                # Excerpts are kept in document order
+                context["full_text"] = "\n\n".join(
+                    texts[chunk["id"]]
+                    for chunk in chunks.get(source_id, [])
+                    if chunk["id"] in picked
+                )
+        source_contexts.append(context)
+
+    note_contexts = [
+        notes[note_id].get_context(context_size=size)
+        for note_id, size in note_sizes.items()
+        if note_id in selected
+    ]
+
+    if dropped:
+        logger.debug(
+            f"Context budget of {token_budget} tokens dropped {len(dropped)} items"
+        )
+
+    return {
+        "source": source_contexts,
+        "note": note_contexts,
+        "total_tokens": used,
+        "dropped": dropped,
+    }
@@ -0,0 +1,187 @@
+"""
+Cache of query embeddings.
+
+Search boxes and the ask graph embed the same short queries over and over. Their
+vectors are kept in a bounded in-process LRU with a TTL and, when
+QUERY_EMBEDDING_CACHE_SHARED is enabled, in the query_embedding_cache table so the
+API and worker processes share each other's hits.
+"""
+
+import hashlib
+import time
+import unicodedata
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from loguru import logger
+from surrealdb import RecordID
+
+from open_notebook.config import (
+    QUERY_EMBEDDING_CACHE_SHARED,
+    QUERY_EMBEDDING_CACHE_SIZE,
+    QUERY_EMBEDDING_CACHE_TTL,
+)
+from open_notebook.database.repository import repo_query
+from open_notebook.domain.models import model_manager
+from open_notebook.exceptions import ConfigurationError
+
+TABLE = "query_embedding_cache"
+
+# Expired rows of the shared table are deleted every this many writes
+PURGE_INTERVAL = 100
+
+
+def normalize_query(text: str) -> str:
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+
+class QueryEmbeddingCache:
+    def __init__(self, max_size: int, ttl: float, shared: bool):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.shared = shared
+        self._entries: "OrderedDict[str, Tuple[float, List[float]]]" = OrderedDict()
+        self._writes = 0
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(model_id: str, text: str) -> str:
+        return hashlib.sha256(
+            f"{model_id}\0{normalize_query(text)}".encode("utf-8")
+        ).hexdigest()
+
+    def _get_local(self, key: str) -> Optional[List[float]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, embedding = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return embedding
+
+    def _set_local(self, key: str, embedding: List[float]) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, embedding)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def _get_shared(self, keys: List[str]) -> Dict[str, List[float]]:
+        try:
+            rows = await repo_query(
+                "SELECT id, embedding FROM $ids WHERE expires_at > time::now()",
+                {"ids": [RecordID(TABLE, key) for key in keys]},
+            )
+        except Exception as e:
+            # The shared table is an optimization; fall back to embedding
+            logger.warning(f"Could not read shared query embeddings: {e}")
+            return {}
+        return {str(row["id"]).split(":", 1)[1]: row["embedding"] for row in rows}
+
+    async def _set_shared(
+        self, model_id: str, embeddings: Dict[str, List[float]]
+    ) -> None:
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=self.ttl)
+        try:
+            await repo_query(
+                f"""
+                FOR $row IN $rows {{
+                    UPSERT type::thing('{TABLE}', $row.key) CONTENT {{
+                        model: $model,
+                        embedding: $row.embedding,
+                        expires_at: $expires_at
+                    }};
+                }};
+                """,
+                {
+                    "rows": [
+                        {"key": key, "embedding": embedding}
+                        for key, embedding in embeddings.items()
+                    ],
+                    "model": model_id,
+                    "expires_at": expires_at,
+                },
+            )
+            self._writes += 1
+            if self._writes % PURGE_INTERVAL == 0:
+                await repo_query(f"DELETE {TABLE} WHERE expires_at < time::now()")
+        except Exception as e:
+            logger.warning(f"Could not store shared query embeddings: {e}")
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed queries with the default embedding model, going to the provider
+        only for the texts that are not cached, in a single batched call.
+        """
+        defaults = await model_manager.get_defaults()
+        model_id = defaults.default_embedding_model
+        EMBEDDING_MODEL = await model_manager.get_embedding_model()
+        if not model_id or not EMBEDDING_MODEL:
+            raise ConfigurationError("No embedding model configured")
+
+        keys = [self.key(model_id, text) for text in texts]
+        found: Dict[str, List[float]] = {}
+        for key in keys:
+            embedding = self._get_local(key)
+            if embedding is not None:
+                found[key] = embedding
+        self.hits += sum(1 for key in keys if key in found)
+
+        missing = list(dict.fromkeys(key for key in keys if key not in found))
+        if missing and self.shared:
+            shared = await self._get_shared(missing)
+            for key, embedding in shared.items():
+                self._set_local(key, embedding)
+            found.update(shared)
+            self.shared_hits += sum(1 for key in keys if key in shared)
+            missing = [key for key in missing if key not in shared]
+
+        if missing:
+            self.misses += len(missing)
+            texts_by_key = dict(zip(keys, texts))
+            embeddings = await EMBEDDING_MODEL.aembed(
+                [texts_by_key[key] for key in missing]
+            )
+            computed = dict(zip(missing, embeddings))
+            for key, embedding in computed.items():
+                self._set_local(key, embedding)
+            found.update(computed)
+            if self.shared:
+                await self._set_shared(model_id, computed)
+
+        return [found[key] for key in keys]
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.shared_hits + self.misses
+        return {
+            "hits": self.hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.shared_hits) / lookups if lookups else 0.0,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl,
+            "shared": self.shared,
+        }
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+query_embedding_cache = QueryEmbeddingCache(
+    max_size=QUERY_EMBEDDING_CACHE_SIZE,
+    ttl=QUERY_EMBEDDING_CACHE_TTL,
+    shared=QUERY_EMBEDDING_CACHE_SHARED,
+)
+
+
+async def embed_queries(texts: List[str]) -> List[List[float]]:
+    return await query_embedding_cache.embed(texts)
+
+
+async def embed_query(text: str) -> List[float]:
+    return (await query_embedding_cache.embed([text]))[0]
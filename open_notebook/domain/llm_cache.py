@@ -0,0 +1,136 @@
+"""
+Cache of transformation and prompt responses.
+
+Responses are content addressed: the record id is a hash of the model id, the
+rendered system prompt, the input and the generation kwargs, so applying the same
+transformation to the same text again returns the stored output without calling
+the model. Entries older than LLM_CACHE_MAX_AGE are ignored and purged, and the
+table is trimmed to the LLM_CACHE_MAX_ENTRIES most recently used entries.
+"""
+
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from loguru import logger
+from surrealdb import RecordID
+
+from open_notebook.config import (
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_MAX_AGE,
+    LLM_CACHE_MAX_ENTRIES,
+)
+from open_notebook.database.repository import repo_query
+
+TABLE = "llm_response_cache"
+
+# Expired and least recently used rows are deleted every this many writes
+PURGE_INTERVAL = 50
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    def __init__(self, enabled: bool, max_entries: int, max_age: int):
+        self.enabled = enabled
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.stored = 0
+
+    @staticmethod
+    def key(
+        model_id: str, system_prompt: str, input_text: str, kwargs: Dict[str, Any]
+    ) -> str:
+        config = {key: value for key, value in kwargs.items() if value is not None}
+        return _sha256(
+            "\0".join(
+                [
+                    model_id,
+                    _sha256(system_prompt),
+                    _sha256(input_text),
+                    json.dumps(config, sort_keys=True, default=str),
+                ]
+            )
+        )
+
+    def _cutoff(self) -> datetime:
+        return datetime.now(timezone.utc) - timedelta(seconds=self.max_age)
+
+    async def get(self, key: str) -> Optional[str]:
+        """Return the cached response for a call key, or None."""
+        try:
+            rows = await repo_query(
+                """
+                UPDATE $id SET hits += 1, used = time::now()
+                WHERE created > $cutoff
+                RETURN response
+                """,
+                {"id": RecordID(TABLE, key), "cutoff": self._cutoff()},
+            )
+        except Exception as e:
+            # The cache is an optimization; fall back to calling the model
+            logger.warning(f"Could not read the LLM response cache: {e}")
+            rows = []
+        if rows:
+            self.hits += 1
+            return rows[0]["response"]
+        self.misses += 1
+        return None
+
+    async def store(self, key: str, model_id: str, response: str) -> None:
+        try:
+            await repo_query(
+                """
+                UPSERT $id CONTENT {
+                    model: $model,
+                    response: $response,
+                    hits: 0,
+                    created: time::now(),
+                    used: time::now()
+                }
+                """,
+                {"id": RecordID(TABLE, key), "model": model_id, "response": response},
+            )
+            self.stored += 1
+            self._writes += 1
+            if self._writes % PURGE_INTERVAL == 0:
+                await self.purge()
+        except Exception as e:
+            logger.warning(f"Could not store LLM response: {e}")
+
+    async def purge(self) -> None:
+        """Delete expired entries and all but the most recently used max_entries."""
+        await repo_query(
+            f"""
+            DELETE {TABLE} WHERE created < $cutoff;
+            DELETE (SELECT id, used FROM {TABLE} ORDER BY used DESC START $max_entries).id;
+            """,
+            {"cutoff": self._cutoff(), "max_entries": self.max_entries},
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "bypassed": self.bypassed,
+            "stored": self.stored,
+            "max_entries": self.max_entries,
+            "max_age_seconds": self.max_age,
+        }
+
+
+llm_response_cache = LLMResponseCache(
+    enabled=LLM_CACHE_ENABLED,
+    max_entries=LLM_CACHE_MAX_ENTRIES,
+    max_age=LLM_CACHE_MAX_AGE,
+)
@@ -1,4 +1,8 @@
-from typing import ClassVar, Dict, Optional, Union
+import asyncio
+import json
+import weakref
+from collections import OrderedDict
+from typing import Any, ClassVar, Dict, List, Optional, Tuple, Union
 
 from esperanto import (
     AIFactory,
@@ -7,12 +11,25 @@ from esperanto import (
     SpeechToTextModel,
     TextToSpeechModel,
 )
+from loguru import logger
 
-from open_notebook.database.repository import repo_query
+from open_notebook.config import MODEL_CACHE_SIZE
+from open_notebook.database.repository import open_connection, repo_query
 from open_notebook.domain.base import ObjectModel, RecordModel
+from open_notebook.domain.rate_limit import rate_limited
 
 ModelType = Union[LanguageModel, EmbeddingModel, SpeechToTextModel, TextToSpeechModel]
 
+# Default model types and the kwargs the graphs request them with, built by warm_up()
+# so the first chat, ask, transformation or embedding call finds its client cached
+WARM_UP_MODELS: List[Tuple[str, Dict[str, Any]]] = [
+    ("chat", {"max_tokens": 10000}),
+    ("tools", {"max_tokens": 2000}),
+    ("tools", {"max_tokens": 2000, "structured": {"type": "json"}}),
+    ("transformation", {"max_tokens": 5000}),
+    ("embedding", {}),
+]
+
 
 class Model(ObjectModel):
     table_name: ClassVar[str] = "model"
@@ -51,16 +68,28 @@ class ModelManager:
     def __init__(self):
         if not hasattr(self, "_initialized"):
             self._initialized = True
-            self._model_cache: Dict[str, ModelType] = {}
+            self._model_cache: "OrderedDict[str, ModelType]" = OrderedDict()
+            self._max_size = MODEL_CACHE_SIZE
             self._default_models = None
+            self._watch_changes = False
+            # LIVE queries belong to the connection and loop that started them
+            self._watchers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Task]" = weakref.WeakKeyDictionary()
+
+    @staticmethod
+    def _cache_key(model_id: str, kwargs: Dict[str, Any]) -> str:
+        """Cache key that does not depend on kwarg order or on kwargs left as None."""
+        config = {key: value for key, value in kwargs.items() if value is not None}
+        return f"{model_id}:{json.dumps(config, sort_keys=True, default=str)}"
 
     async def get_model(self, model_id: str, **kwargs) -> Optional[ModelType]:
         if not model_id:
             return None
 
-        cache_key = f"{model_id}:{str(kwargs)}"
+        self._ensure_watcher()
+        cache_key = self._cache_key(model_id, kwargs)
 
         if cache_key in self._model_cache:
+            self._model_cache.move_to_end(cache_key)
             cached_model = self._model_cache[cache_key]
             if not isinstance(
                 cached_model,
@@ -112,11 +141,17 @@ class ModelManager:
         else:
             raise ValueError(f"Invalid model type: {model.type}")
 
+        model_instance = rate_limited(model_instance, model.provider, model.name)
         self._model_cache[cache_key] = model_instance
+        while len(self._model_cache) > self._max_size:
+            evicted, _ = self._model_cache.popitem(last=False)
+            logger.debug(f"Evicted model {evicted} from the model cache")
         return model_instance
 
     async def refresh_defaults(self):
         """Refresh the default models from the database"""
+        # DefaultModels only reads the database once per instance
+        DefaultModels.clear_instance()
         self._default_models = await DefaultModels.get_instance()
 
     async def get_defaults(self) -> DefaultModels:
@@ -163,14 +198,8 @@ class ModelManager:
         )
         return model
 
-    async def get_default_model(self, model_type: str, **kwargs) -> Optional[ModelType]:
-        """
-        Get the default model for a specific type.
-
-        Args:
-            model_type: The type of model to retrieve (e.g., 'chat', 'embedding', etc.)
-            **kwargs: Additional arguments to pass to the model constructor
-        """
+    async def get_default_model_id(self, model_type: str) -> Optional[str]:
+        """Get the id of the default model for a specific type, if one is set"""
         defaults = await self.get_defaults()
         model_id = None
 
@@ -194,6 +223,17 @@ class ModelManager:
         elif model_type == "large_context":
             model_id = defaults.large_context_model
 
+        return model_id
+
+    async def get_default_model(self, model_type: str, **kwargs) -> Optional[ModelType]:
+        """
+        Get the default model for a specific type.
+
+        Args:
+            model_type: The type of model to retrieve (e.g., 'chat', 'embedding', etc.)
+            **kwargs: Additional arguments to pass to the model constructor
+        """
+        model_id = await self.get_default_model_id(model_type)
         if not model_id:
             return None
 
@@ -203,5 +243,96 @@ class ModelManager:
         """Clear the model cache"""
         self._model_cache.clear()
 
+    def invalidate(self, model_id: str) -> None:
+        """Drop every cached instance of a model, whatever kwargs it was built with"""
+        prefix = f"{model_id}:"
+        for key in [key for key in self._model_cache if key.startswith(prefix)]:
+            del self._model_cache[key]
+
+    async def warm_up(self) -> None:
+        """Build the default models ahead of the first request"""
+        await self.refresh_defaults()
+        for model_type, kwargs in WARM_UP_MODELS:
+            try:
+                await self.get_default_model(model_type, **kwargs)
+            except Exception as e:
+                logger.warning(f"Could not warm up the {model_type} model: {e}")
+        logger.info(f"Model cache warmed up with {len(self._model_cache)} models")
+
+    def enable_change_watch(self) -> None:
+        """
+        Follow changes to models and default models from other processes.
+
+        Once enabled, the first model request on an event loop starts a background
+        task with LIVE queries on the model and open_notebook tables.
+        """
+        self._watch_changes = True
+        self._ensure_watcher()
+
+    def _ensure_watcher(self) -> None:
+        if not self._watch_changes:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        # Started once per loop; if LIVE is unavailable the task logs and ends
+        if loop not in self._watchers:
+            self._watchers[loop] = loop.create_task(self._watch())
+
+    async def _watch(self) -> None:
+        try:
+            db = await open_connection()
+        except Exception as e:
+            logger.warning(f"Could not open a connection to watch model changes: {e}")
+            return
+        try:
+            streams = []
+            for table in ("model", "open_notebook"):
+                live_id = await db.live(table)
+                streams.append((table, await db.subscribe_live(live_id)))
+            await asyncio.gather(
+                *(self._follow(table, stream) for table, stream in streams)
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(
+                f"Not watching model changes ({e}); "
+                "restart the process to pick up changes made elsewhere"
+            )
+        finally:
+            try:
+                await db.close()
+            except Exception:
+                pass
+
+    async def _follow(self, table: str, stream) -> None:
+        async for notification in stream:
+            try:
+                await self._apply_change(table, notification)
+            except Exception as e:
+                logger.warning(f"Could not apply a change to {table}: {e}")
+
+    async def _apply_change(self, table: str, notification: Dict[str, Any]) -> None:
+        record = notification.get("result", notification)
+        record_id = str(record.get("id", "")) if isinstance(record, dict) else ""
+        if table == "model":
+            logger.debug(f"Model {record_id} changed, dropping its cached instances")
+            self.invalidate(record_id)
+        elif record_id == DefaultModels.record_id:
+            logger.debug("Default models changed, refreshing")
+            await self.refresh_defaults()
+
+    async def close(self) -> None:
+        """Stop watching changes on the running loop"""
+        task = self._watchers.pop(asyncio.get_running_loop(), None)
+        if task:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
 
 model_manager = ModelManager()
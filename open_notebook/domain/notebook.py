@@ -1,15 +1,83 @@
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
-from typing import Any, ClassVar, Dict, List, Literal, Optional, Tuple
-
+import math
+import time
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    ClassVar,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+)
+
+from esperanto import EmbeddingModel
 from loguru import logger
 from pydantic import BaseModel, Field, field_validator
 
-from open_notebook.database.repository import ensure_record_id, repo_query
-from open_notebook.domain.base import ObjectModel
+from open_notebook.config import (
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDING_MAX_CONCURRENCY,
+)
+from open_notebook.database.repository import (
+    ensure_record_id,
+    repo_insert,
+    repo_query,
+)
+from open_notebook.database.vector_index import ensure_vector_indexes
+from open_notebook.domain.base import (
+    KEYSET_AFTER_CONDITION,
+    ObjectModel,
+    decode_cursor,
+)
+from open_notebook.domain.embedding_cache import embed_query
 from open_notebook.domain.models import model_manager
 from open_notebook.exceptions import DatabaseOperationError, InvalidInputError
-from open_notebook.utils import split_text
+from open_notebook.utils import content_hash, split_text
+
+
+async def embed_in_batches(
+    embedding_model: EmbeddingModel,
+    texts: List[str],
+    batch_size: int = EMBEDDING_BATCH_SIZE,
+    max_concurrency: int = EMBEDDING_MAX_CONCURRENCY,
+    progress: Optional[Callable[[int, int], Awaitable[None]]] = None,
+) -> List[List[float]]:
+    """
+    Embed texts in batches, with a cap on concurrent provider calls.
+
+    Each batch is throttled and retried on its own by the model's rate limiter, so
+    a transient provider error does not force the whole document to be embedded
+    again. Embeddings are returned in the same order as the input texts.
+    ``progress`` is awaited with (texts embedded, total texts) after each batch.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    batches = [texts[i : i + batch_size] for i in range(0, len(texts), batch_size)]
+    embedded = 0
+
+    async def embed_batch(batch_idx: int, batch: List[str]) -> List[List[float]]:
+        async with semaphore:
+            try:
+                embeddings = await embedding_model.aembed(batch)
+            except Exception as e:
+                logger.error(f"Embedding batch {batch_idx} failed: {str(e)}")
+                raise
+            if len(embeddings) != len(batch):
+                raise ValueError(
+                    f"Expected {len(batch)} embeddings, got {len(embeddings)}"
+                )
+            if progress:
+                nonlocal embedded
+                embedded += len(batch)
+                await progress(embedded, len(texts))
+            return embeddings
+
+    results = await asyncio.gather(
+        *[embed_batch(idx, batch) for idx, batch in enumerate(batches)]
+    )
+    return [embedding for batch in results for embedding in batch]
 
 
 class Notebook(ObjectModel):
@@ -93,6 +161,8 @@ class Asset(BaseModel):
 class SourceEmbedding(ObjectModel):
     table_name: ClassVar[str] = "source_embedding"
     content: str
+    chunk_hash: Optional[str] = None
+    model: Optional[str] = None
 
     async def get_source(self) -> "Source":
         try:
@@ -146,6 +216,63 @@ class Source(ObjectModel):
     title: Optional[str] = None
     topics: Optional[List[str]] = Field(default_factory=list)
     full_text: Optional[str] = None
+    # Fingerprints used to recognize re-ingested content (see find_duplicate)
+    content_hash: Optional[str] = None
+    canonical_url: Optional[str] = None
+    file_hash: Optional[str] = None
+    # Other links or files that extracted to the same content
+    alternate_assets: Optional[List[Asset]] = Field(default_factory=list)
+
+    @classmethod
+    async def find_duplicate(
+        cls,
+        content_hash: Optional[str] = None,
+        canonical_url: Optional[str] = None,
+        file_hash: Optional[str] = None,
+    ) -> Optional["Source"]:
+        """Find a stored source with any of the given fingerprints."""
+        fingerprints = {
+            "content_hash": content_hash,
+            "canonical_url": canonical_url,
+            "file_hash": file_hash,
+        }
+        fingerprints = {key: value for key, value in fingerprints.items() if value}
+        if not fingerprints:
+            return None
+        try:
+            result = await repo_query(
+                f"""
+                SELECT * FROM source
+                WHERE {" OR ".join(f"{key} = ${key}" for key in fingerprints)}
+                LIMIT 1
+                """,
+                fingerprints,
+            )
+            return cls(**result[0]) if result else None
+        except Exception as e:
+            logger.error(f"Error looking up duplicate source: {str(e)}")
+            logger.exception(e)
+            raise DatabaseOperationError(e)
+
+    async def add_alternate_asset(self, asset: Asset) -> None:
+        """Record another link or file whose content is this source."""
+        if not (asset.url or asset.file_path):
+            return
+        if asset == self.asset or asset in (self.alternate_assets or []):
+            return
+        try:
+            await repo_query(
+                """
+                UPDATE $source
+                SET alternate_assets = array::union(alternate_assets OR [], [$asset])
+                """,
+                {"source": ensure_record_id(self.id), "asset": asset.model_dump()},
+            )
+            self.alternate_assets = [*(self.alternate_assets or []), asset]
+        except Exception as e:
+            logger.error(f"Error recording alternate asset of {self.id}: {str(e)}")
+            logger.exception(e)
+            raise DatabaseOperationError(e)
 
     async def get_context(
         self, context_size: Literal["short", "long"] = "short"
@@ -162,6 +289,48 @@ class Source(ObjectModel):
         else:
             return dict(id=self.id, title=self.title, insights=insights)
 
+    @classmethod
+    async def get_listing(
+        cls,
+        notebook_id: Optional[str] = None,
+        limit: Optional[int] = None,
+        after: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        List sources without their full text, newest first, with insight and chunk counts.
+
+        Everything is resolved in a single query. Pass the encode_cursor of the last
+        source received as `after` to get the next page (keyset pagination on
+        updated, id).
+        A notebook's sources are reached through its reference edges, so only
+        those rows are read.
+        """
+        vars: Dict[str, Any] = decode_cursor(after) if after else {}
+        try:
+            table = "source"
+            if notebook_id:
+                table = "array::distinct($notebook_id<-reference<-source)"
+                vars["notebook_id"] = ensure_record_id(notebook_id)
+            where = f"WHERE {KEYSET_AFTER_CONDITION}" if after else ""
+            limit_clause = f"LIMIT {int(limit)}" if limit else ""
+            return await repo_query(
+                f"""
+                SELECT
+                    id, title, topics, asset, created, updated,
+                    count((SELECT id FROM source_insight WHERE source = $parent.id)) AS insights_count,
+                    count((SELECT id FROM source_embedding WHERE source = $parent.id)) AS embedded_chunks
+                FROM {table}
+                {where}
+                ORDER BY updated DESC, id DESC
+                {limit_clause}
+                """,
+                vars,
+            )
+        except Exception as e:
+            logger.error(f"Error listing sources: {str(e)}")
+            logger.exception(e)
+            raise DatabaseOperationError(e)
+
     async def get_embedded_chunks(self) -> int:
         try:
             result = await repo_query(
@@ -195,69 +364,126 @@ class Source(ObjectModel):
     async def add_to_notebook(self, notebook_id: str) -> Any:
         if not notebook_id:
             raise InvalidInputError("Notebook ID must be provided")
+        # Re-ingested sources may already be in the notebook
+        existing = await repo_query(
+            "SELECT VALUE id FROM reference WHERE in = $source AND out = $notebook",
+            {
+                "source": ensure_record_id(self.id),
+                "notebook": ensure_record_id(notebook_id),
+            },
+        )
+        if existing:
+            return existing
         return await self.relate("reference", notebook_id)
 
-    async def vectorize(self) -> None:
+    async def vectorize(
+        self, progress: Optional[Callable[[int, int], Awaitable[None]]] = None
+    ) -> Dict[str, int]:
+        """
+        Split the source text into chunks and embed the ones not embedded yet.
+
+        Existing rows are kept when their chunk hash and embedding model match a
+        current chunk; only new or changed chunks are sent to the provider and
+        rows left unmatched are deleted in one query. ``progress`` is awaited with
+        (chunks embedded, chunks to embed) as batches finish. Returns chunk
+        counts and the provider calls saved compared to embedding everything.
+        """
         logger.info(f"Starting vectorization for source {self.id}")
         EMBEDDING_MODEL = await model_manager.get_embedding_model()
+        model_id = await model_manager.get_default_model_id("embedding")
 
         try:
-            if not self.full_text:
-                logger.warning(f"No text to vectorize for source {self.id}")
-                return
-
-            chunks = split_text(
-                self.full_text,
-            )
+            chunks = split_text(self.full_text) if self.full_text else []
             chunk_count = len(chunks)
             logger.info(f"Split into {chunk_count} chunks for source {self.id}")
-
             if chunk_count == 0:
-                logger.warning("No chunks created after splitting")
-                return
-
-            # Process chunks concurrently using async gather
-            logger.info("Starting concurrent processing of chunks")
-
-            async def process_chunk(
-                idx: int, chunk: str
-            ) -> Tuple[int, List[float], str]:
-                logger.debug(f"Processing chunk {idx}/{chunk_count}")
-                try:
-                    embedding = (await EMBEDDING_MODEL.aembed([chunk]))[0]
-                    cleaned_content = chunk
-                    logger.debug(f"Successfully processed chunk {idx}")
-                    return (idx, embedding, cleaned_content)
-                except Exception as e:
-                    logger.error(f"Error processing chunk {idx}: {str(e)}")
-                    raise
-
-            # Create tasks for all chunks and process them concurrently
-            tasks = [process_chunk(idx, chunk) for idx, chunk in enumerate(chunks)]
-            results = await asyncio.gather(*tasks)
-
-            logger.info(f"Parallel processing complete. Got {len(results)} results")
-
-            # Insert results in order (they're already ordered by index)
-            for idx, embedding, content in results:
-                logger.debug(f"Inserting chunk {idx} into database")
-                await repo_query(
-                    """
-                    CREATE source_embedding CONTENT {
-                            "source": $source_id,
-                            "order": $order,
-                            "content": $content,
-                            "embedding": $embedding,
-                    };""",
-                    {
-                        "source_id": ensure_record_id(self.id),
-                        "order": idx,
-                        "content": content,
-                        "embedding": embedding,
-                    },
+                logger.warning(f"No chunks to vectorize for source {self.id}")
+
+            existing = await repo_query(
+                """
+                SELECT id, order, chunk_hash FROM source_embedding
+                WHERE source = $source AND model = $model AND chunk_hash != NONE
+                """,
+                {"source": ensure_record_id(self.id), "model": model_id},
+            )
+            reusable: Dict[str, List[Dict[str, Any]]] = {}
+            for row in existing:
+                reusable.setdefault(row["chunk_hash"], []).append(row)
+
+            kept: List[Dict[str, Any]] = []
+            missing: List[Tuple[int, str, str]] = []
+            for idx, chunk in enumerate(chunks):
+                chunk_hash = content_hash(chunk)
+                if reusable.get(chunk_hash):
+                    row = reusable[chunk_hash].pop()
+                    if row["order"] != idx:
+                        kept.append({"id": ensure_record_id(row["id"]), "order": idx})
+                    else:
+                        kept.append({"id": ensure_record_id(row["id"])})
+                else:
+                    missing.append((idx, chunk, chunk_hash))
+
+            # Rows from older text, another model or before chunk hashes existed
+            stale = await repo_query(
+                """
+                SELECT VALUE id FROM source_embedding
+                WHERE source = $source AND id NOT IN $kept
+                """,
+                {
+                    "source": ensure_record_id(self.id),
+                    "kept": [row["id"] for row in kept],
+                },
+            )
+
+            if missing:
+                embeddings = await embed_in_batches(
+                    EMBEDDING_MODEL,
+                    [chunk for _, chunk, _ in missing],
+                    progress=progress,
+                )
+                logger.info(
+                    f"Embedded {len(embeddings)} chunks, inserting into database"
+                )
+                await ensure_vector_indexes(len(embeddings[0]))
+                await repo_insert(
+                    "source_embedding",
+                    [
+                        {
+                            "source": ensure_record_id(self.id),
+                            "order": idx,
+                            "content": chunk,
+                            "chunk_hash": chunk_hash,
+                            "model": model_id,
+                            "embedding": embedding,
+                        }
+                        for (idx, chunk, chunk_hash), embedding in zip(
+                            missing, embeddings
+                        )
+                    ],
                 )
 
-            logger.info(f"Vectorization complete for source {self.id}")
+            await repo_query(
+                """
+                DELETE $stale;
+                FOR $row IN $moved {
+                    UPDATE $row.id SET order = $row.order;
+                };
+                """,
+                {
+                    "stale": [ensure_record_id(row_id) for row_id in stale],
+                    "moved": [row for row in kept if "order" in row],
+                },
+            )
+            stats = {
+                "chunks": chunk_count,
+                "embedded": len(missing),
+                "reused": len(kept),
+                "deleted": len(stale),
+                "calls_saved": math.ceil(chunk_count / EMBEDDING_BATCH_SIZE)
+                - math.ceil(len(missing) / EMBEDDING_BATCH_SIZE),
+            }
+            logger.info(f"Vectorization complete for source {self.id}: {stats}")
+            return stats
 
         except Exception as e:
             logger.error(f"Error vectorizing source {self.id}: {str(e)}")
@@ -272,23 +498,18 @@ class Source(ObjectModel):
         if not insight_type or not content:
             raise InvalidInputError("Insight type and content must be provided")
         try:
-            embedding = (
-                (await EMBEDDING_MODEL.aembed([content]))[0] if EMBEDDING_MODEL else []
-            )
+            insight: Dict[str, Any] = {
+                "source": ensure_record_id(self.id),
+                "insight_type": insight_type,
+                "content": content,
+            }
+            # Without a model the embedding is left unset, as an empty vector
+            # does not fit the HNSW index
+            if EMBEDDING_MODEL:
+                insight["embedding"] = (await EMBEDDING_MODEL.aembed([content]))[0]
+                await ensure_vector_indexes(len(insight["embedding"]))
             return await repo_query(
-                """
-                CREATE source_insight CONTENT {
-                        "source": $source_id,
-                        "insight_type": $insight_type,
-                        "content": $content,
-                        "embedding": $embedding,
-                };""",
-                {
-                    "source_id": ensure_record_id(self.id),
-                    "insight_type": insight_type,
-                    "content": content,
-                    "embedding": embedding,
-                },
+                "CREATE source_insight CONTENT $insight;", {"insight": insight}
             )
         except Exception as e:
             logger.error(f"Error adding insight to source {self.id}: {str(e)}")
@@ -372,8 +593,28 @@ async def vector_search(
     if not keyword:
         raise InvalidInputError("Search keyword cannot be empty")
     try:
-        EMBEDDING_MODEL = await model_manager.get_embedding_model()
-        embed = (await EMBEDDING_MODEL.aembed([keyword]))[0]
+        embed = await embed_query(keyword)
+    except Exception as e:
+        logger.error(f"Error embedding search keyword: {str(e)}")
+        logger.exception(e)
+        raise DatabaseOperationError(e)
+    return await vector_search_by_embedding(
+        embed, results, source, note, minimum_score
+    )
+
+
+async def vector_search_by_embedding(
+    embed: List[float],
+    results: int,
+    source: bool = True,
+    note: bool = True,
+    minimum_score=0.2,
+):
+    """Vector search with an already computed query embedding."""
+    if not embed:
+        raise InvalidInputError("Search embedding cannot be empty")
+    try:
+        await ensure_vector_indexes(len(embed))
         results = await repo_query(
             """
             SELECT * FROM fn::vector_search($embed, $results, $source, $note, $minimum_score);
@@ -391,3 +632,90 @@ async def vector_search(
         logger.error(f"Error performing vector search: {str(e)}")
         logger.exception(e)
         raise DatabaseOperationError(e)
+
+
+# Rank offset of reciprocal-rank fusion; 60 is the value from the original RRF paper
+RRF_K = 60
+
+
+def reciprocal_rank_fusion(
+    ranked_lists: Dict[str, List[Dict[str, Any]]], k: int = RRF_K
+) -> List[Dict[str, Any]]:
+    """
+    Fuse ranked result lists into one list, one entry per parent_id.
+
+    Each parent scores sum(1 / (k + rank)) over the lists it appears in, where rank
+    is the position of its best hit in that list. The entry keeps the best ranked
+    hit's id, title and content, plus its rank in every list ("<name>_rank").
+    """
+    fused: Dict[str, Dict[str, Any]] = {}
+    for name, results in ranked_lists.items():
+        rank = 0
+        seen = set()
+        for row in results:
+            parent_id = str(row.get("parent_id") or row["id"])
+            if parent_id in seen:
+                continue
+            seen.add(parent_id)
+            rank += 1
+            entry = fused.get(parent_id)
+            if entry is None:
+                entry = fused[parent_id] = dict(
+                    id=row["id"],
+                    title=row.get("title"),
+                    content=row.get("content"),
+                    parent_id=parent_id,
+                    score=0.0,
+                )
+            entry["score"] += 1 / (k + rank)
+            entry[f"{name}_rank"] = rank
+    return sorted(fused.values(), key=lambda entry: entry["score"], reverse=True)
+
+
+async def hybrid_search(
+    keyword: str,
+    results: int,
+    source: bool = True,
+    note: bool = True,
+    minimum_score=0.2,
+) -> Tuple[List[Dict[str, Any]], Dict[str, float]]:
+    """
+    Run text (BM25) and vector search concurrently and fuse them with RRF.
+
+    Returns the fused results, de-duplicated by parent_id, and the time spent in
+    each stage in milliseconds.
+    """
+    if not keyword:
+        raise InvalidInputError("Search keyword cannot be empty")
+
+    async def timed(search):
+        start = time.perf_counter()
+        result = await search
+        return result, (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    (text_results, text_ms), (vector_results, vector_ms) = await asyncio.gather(
+        timed(text_search(keyword, results, source, note)),
+        timed(vector_search(keyword, results, source, note, minimum_score)),
+    )
+    fusion_start = time.perf_counter()
+    fused = reciprocal_rank_fusion(
+        dict(
+            text=sorted(
+                text_results or [], key=lambda r: r.get("relevance", 0), reverse=True
+            ),
+            vector=sorted(
+                vector_results or [],
+                key=lambda r: r.get("similarity", 0),
+                reverse=True,
+            ),
+        )
+    )[:results]
+    end = time.perf_counter()
+    timings = dict(
+        text_ms=round(text_ms, 2),
+        vector_ms=round(vector_ms, 2),
+        fusion_ms=round((end - fusion_start) * 1000, 2),
+        total_ms=round((end - start) * 1000, 2),
+    )
+    return fused, timings
@@ -0,0 +1,361 @@
+"""
+Rate limiting and retries for provider calls.
+
+Every language and embedding model handed out by the model manager draws from a
+token bucket per provider and model, sized in requests and tokens per minute.
+Rate limit and transient errors are retried with jittered exponential backoff.
+When the provider sends Retry-After, the whole bucket pauses for that long.
+"""
+
+import asyncio
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from esperanto import EmbeddingModel, LanguageModel
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+from loguru import logger
+from pydantic import ConfigDict
+
+from open_notebook.config import (
+    RATE_LIMIT_MAX_RETRIES,
+    RATE_LIMIT_RETRY_MAX_DELAY,
+    RATE_LIMIT_RPM,
+    RATE_LIMIT_TPM,
+)
+from open_notebook.utils import estimate_token_count
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504, 529}
+# Providers wrapped by esperanto only surface the error message
+RETRYABLE_MESSAGES = (
+    "rate limit",
+    "rate_limit",
+    "too many requests",
+    "429",
+    "overloaded",
+    "temporarily unavailable",
+    "timed out",
+    "timeout",
+)
+
+
+class TokenBucket:
+    """
+    Bucket refilled continuously up to ``per_minute`` units.
+
+    Callers may overdraw it; the debt is paid by waiting until it refills, so
+    concurrent callers are spaced out instead of failing.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60
+        self._level = per_minute
+        self._updated = time.monotonic()
+        # Streamlit calls in from several threads, each with its own event loop
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """Take ``amount`` from the bucket and return the seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._level = min(
+                self.capacity, self._level + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            # A single call larger than the bucket still goes through, a minute later
+            self._level -= min(amount, self.capacity)
+            return max(0.0, -self._level / self.rate)
+
+
+def _limit_setting(provider: str, key: str, default: int) -> int:
+    """Read a limit, preferring the provider specific variable (e.g. RATE_LIMIT_OPENAI_RPM)."""
+    name = provider.upper().replace("-", "_")
+    return int(os.getenv(f"RATE_LIMIT_{name}_{key}") or default)
+
+
+def status_code(error: Exception) -> Optional[int]:
+    code = getattr(error, "status_code", None)
+    if code is None:
+        code = getattr(getattr(error, "response", None), "status_code", None)
+    return code if isinstance(code, int) else None
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """Seconds the provider asked us to wait, from Retry-After headers when present."""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        value = headers.get("retry-after")
+    except Exception:
+        return None
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(error: Exception) -> bool:
+    if isinstance(error, (asyncio.TimeoutError, ConnectionError)):
+        return True
+    code = status_code(error)
+    if code is not None:
+        return code in RETRYABLE_STATUS_CODES
+    message = str(error).lower()
+    return any(text in message for text in RETRYABLE_MESSAGES)
+
+
+class ModelLimiter:
+    """Request and token buckets shared by every call to one provider model."""
+
+    def __init__(self, name: str, rpm: int, tpm: int):
+        self.name = name
+        self.rpm = rpm
+        self.tpm = tpm
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self._paused_until = 0.0
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+        self.throttled_seconds = 0.0
+
+    def reserve(self, tokens: int) -> float:
+        """Reserve one request and ``tokens`` tokens, returning the seconds to wait."""
+        self.calls += 1
+        wait = max(0.0, self._paused_until - time.monotonic())
+        if self.requests:
+            wait = max(wait, self.requests.reserve(1))
+        if self.tokens and tokens:
+            wait = max(wait, self.tokens.reserve(tokens))
+        self.throttled_seconds += wait
+        return wait
+
+    def throttle(self, tokens: int = 0) -> float:
+        wait = self.reserve(tokens)
+        if wait > 0:
+            logger.debug(f"Throttling {self.name} for {wait:.2f}s")
+        return wait
+
+    async def acquire(self, tokens: int = 0) -> None:
+        wait = self.throttle(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def charge(self, tokens: int) -> None:
+        """Account for tokens only known after the call, such as the completion."""
+        if self.tokens and tokens:
+            self.tokens.reserve(tokens)
+
+    def retry_delay(self, error: Exception, attempt: int) -> float:
+        """
+        Seconds to wait before retry ``attempt``.
+
+        Re-raises ``error`` when it should not be retried, and pauses the whole
+        bucket when the provider sent Retry-After.
+        """
+        if attempt > RATE_LIMIT_MAX_RETRIES or not is_retryable(error):
+            self.failures += 1
+            raise error
+        self.retries += 1
+        delay = retry_after(error)
+        if delay is not None:
+            # The provider told us when it will take requests again; hold everyone back
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        else:
+            delay = random.uniform(0, min(RATE_LIMIT_RETRY_MAX_DELAY, 2**attempt))
+        logger.warning(
+            f"{self.name} call failed (attempt {attempt}), retrying in {delay:.1f}s: {error}"
+        )
+        return delay
+
+    async def backoff(self, error: Exception, attempt: int) -> None:
+        """Wait before retry ``attempt``, or re-raise ``error`` when it should not be retried."""
+        await asyncio.sleep(self.retry_delay(error, attempt))
+
+    async def run(self, call: Callable[[], Awaitable[T]], tokens: int = 0) -> T:
+        """Run a provider call within the limits, retrying it on transient errors."""
+        attempt = 0
+        while True:
+            await self.acquire(tokens)
+            try:
+                return await call()
+            except Exception as e:
+                attempt += 1
+                await self.backoff(e, attempt)
+
+    def run_sync(self, call: Callable[[], T], tokens: int = 0) -> T:
+        """Blocking version of ``run`` for synchronous provider calls."""
+        attempt = 0
+        while True:
+            time.sleep(self.throttle(tokens))
+            try:
+                return call()
+            except Exception as e:
+                attempt += 1
+                time.sleep(self.retry_delay(e, attempt))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rpm": self.rpm,
+            "tpm": self.tpm,
+            "calls": self.calls,
+            "retries": self.retries,
+            "failures": self.failures,
+            "throttled_seconds": round(self.throttled_seconds, 3),
+        }
+
+
+_limiters: Dict[Tuple[str, str], ModelLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(provider: str, model_name: str) -> ModelLimiter:
+    """Get the limiter shared by every instance of a provider model."""
+    with _limiters_lock:
+        limiter = _limiters.get((provider, model_name))
+        if limiter is None:
+            limiter = ModelLimiter(
+                f"{provider}/{model_name}",
+                rpm=_limit_setting(provider, "RPM", RATE_LIMIT_RPM),
+                tpm=_limit_setting(provider, "TPM", RATE_LIMIT_TPM),
+            )
+            _limiters[(provider, model_name)] = limiter
+        return limiter
+
+
+def stats() -> Dict[str, Dict[str, Any]]:
+    return {limiter.name: limiter.stats() for limiter in list(_limiters.values())}
+
+
+def _message_tokens(messages: List[BaseMessage]) -> int:
+    return sum(estimate_token_count(str(message.content)) for message in messages)
+
+
+def _result_tokens(result: ChatResult) -> int:
+    return sum(
+        estimate_token_count(generation.text) for generation in result.generations
+    )
+
+
+class RateLimitedChatModel(BaseChatModel):
+    """LangChain chat model that sends another chat model's calls through a limiter."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    model: BaseChatModel
+    limiter: ModelLimiter
+
+    @property
+    def _llm_type(self) -> str:
+        return self.model._llm_type
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        result = self.limiter.run_sync(
+            lambda: self.model._generate(
+                messages, stop=stop, run_manager=run_manager, **kwargs
+            ),
+            tokens=_message_tokens(messages),
+        )
+        self.limiter.charge(_result_tokens(result))
+        return result
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        result = await self.limiter.run(
+            lambda: self.model._agenerate(
+                messages, stop=stop, run_manager=run_manager, **kwargs
+            ),
+            tokens=_message_tokens(messages),
+        )
+        self.limiter.charge(_result_tokens(result))
+        return result
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        attempt = 0
+        while True:
+            await self.limiter.acquire(_message_tokens(messages))
+            streamed = 0
+            try:
+                async for chunk in self.model._astream(
+                    messages, stop=stop, run_manager=run_manager, **kwargs
+                ):
+                    streamed += estimate_token_count(chunk.text) if chunk.text else 0
+                    yield chunk
+                self.limiter.charge(streamed)
+                return
+            except Exception as e:
+                self.limiter.charge(streamed)
+                # Tokens already reached the caller; retrying would repeat them
+                if streamed:
+                    raise
+                attempt += 1
+                await self.limiter.backoff(e, attempt)
+
+
+def rate_limited(model: Any, provider: str, model_name: str) -> Any:
+    """Route a model's provider calls through the limiter for its provider and model."""
+    limiter = get_limiter(provider, model_name)
+    if isinstance(model, EmbeddingModel):
+        aembed = model.aembed
+
+        async def limited_aembed(texts: List[str], **kwargs: Any) -> List[List[float]]:
+            return await limiter.run(
+                lambda: aembed(texts, **kwargs),
+                tokens=sum(estimate_token_count(text) for text in texts),
+            )
+
+        model.aembed = limited_aembed  # type: ignore[method-assign]
+    elif isinstance(model, LanguageModel):
+        to_langchain = model.to_langchain
+
+        def limited_to_langchain() -> BaseChatModel:
+            return RateLimitedChatModel(model=to_langchain(), limiter=limiter)
+
+        model.to_langchain = limited_to_langchain  # type: ignore[method-assign]
+    return model
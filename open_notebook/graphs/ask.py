@@ -1,3 +1,4 @@
+import asyncio
 import operator
 from typing import Annotated, List
 
@@ -6,10 +7,13 @@ from langchain_core.output_parsers.pydantic import PydanticOutputParser
 from langchain_core.runnables import RunnableConfig
 from langgraph.graph import END, START, StateGraph
 from langgraph.types import Send
+from loguru import logger
 from pydantic import BaseModel, Field
 from typing_extensions import TypedDict
 
-from open_notebook.domain.notebook import vector_search
+from open_notebook.config import ASK_BEST_EFFORT, ASK_BRANCH_TIMEOUT
+from open_notebook.domain.embedding_cache import embed_queries
+from open_notebook.domain.notebook import vector_search_by_embedding
 from open_notebook.graphs.utils import provision_langchain_model
 from open_notebook.utils import clean_thinking_content
 
@@ -19,6 +23,7 @@ class SubGraphState(TypedDict):
     term: str
     # type: Literal["text", "vector"]
     instructions: str
+    embedding: List[float]
     results: dict
     answer: str
 
@@ -45,6 +50,7 @@ class ThreadState(TypedDict):
     question: str
     strategy: Strategy
     answers: Annotated[list, operator.add]
+    dropped: Annotated[list, operator.add]
     final_answer: str
 
 
@@ -74,6 +80,11 @@ async def call_model_with_messages(state: ThreadState, config: RunnableConfig) -
 
 
 async def trigger_queries(state: ThreadState, config: RunnableConfig):
+    searches = state["strategy"].searches
+    if not searches:
+        return []
+    # One batched embedding call for every search term instead of one per branch
+    embeddings = await embed_queries([s.term for s in searches])
     return [
         Send(
             "provide_answer",
@@ -81,19 +92,44 @@ async def trigger_queries(state: ThreadState, config: RunnableConfig):
                 "question": state["question"],
                 "instructions": s.instructions,
                 "term": s.term,
+                "embedding": embedding,
                 # "type": s.type,
             },
         )
-        for s in state["strategy"].searches
+        for s, embedding in zip(searches, embeddings)
     ]
 
 
 async def provide_answer(state: SubGraphState, config: RunnableConfig) -> dict:
+    """
+    Answer one search branch within the branch deadline.
+
+    In best-effort mode a branch that times out or fails is reported under
+    "dropped" and the final answer is written from the branches that finished.
+    """
+    configurable = config.get("configurable", {})
+    timeout = configurable.get("branch_timeout") or ASK_BRANCH_TIMEOUT
+    best_effort = configurable.get("best_effort", ASK_BEST_EFFORT)
+    try:
+        return await asyncio.wait_for(answer_search(state, config), timeout=timeout)
+    except asyncio.TimeoutError:
+        if not best_effort:
+            raise
+        logger.warning(f"Search branch '{state['term']}' timed out after {timeout}s")
+        return {"dropped": [{"term": state["term"], "reason": "timeout"}]}
+    except Exception as e:
+        if not best_effort:
+            raise
+        logger.warning(f"Search branch '{state['term']}' failed: {str(e)}")
+        return {"dropped": [{"term": state["term"], "reason": str(e)}]}
+
+
+async def answer_search(state: SubGraphState, config: RunnableConfig) -> dict:
     payload = state
     # if state["type"] == "text":
     #     results = text_search(state["term"], 10, True, True)
     # else:
-    results = await vector_search(state["term"], 10, True, True)
+    results = await vector_search_by_embedding(state["embedding"], 10, True, True)
     if len(results) == 0:
         return {"answers": []}
     payload["results"] = results
@@ -1,17 +1,17 @@
 import asyncio
-import sqlite3
+import weakref
 from typing import Annotated, Optional
 
 from ai_prompter import Prompter
-from langchain_core.messages import SystemMessage
+from langchain_core.messages import SystemMessage, message_chunk_to_message
 from langchain_core.runnables import RunnableConfig
-from langgraph.checkpoint.sqlite import SqliteSaver
 from langgraph.graph import END, START, StateGraph
 from langgraph.graph.message import add_messages
+from langgraph.graph.state import CompiledStateGraph
 from typing_extensions import TypedDict
 
-from open_notebook.config import LANGGRAPH_CHECKPOINT_FILE
 from open_notebook.domain.notebook import Notebook
+from open_notebook.graphs.checkpoint import open_checkpoint_saver
 from open_notebook.graphs.utils import provision_langchain_model
 
 
@@ -22,29 +22,49 @@ class ThreadState(TypedDict):
     context_config: Optional[dict]
 
 
-def call_model_with_messages(state: ThreadState, config: RunnableConfig) -> dict:
+async def call_model_with_messages(state: ThreadState, config: RunnableConfig) -> dict:
     system_prompt = Prompter(prompt_template="chat").render(data=state)
     payload = [SystemMessage(content=system_prompt)] + state.get("messages", [])
-    model = asyncio.run(
-        provision_langchain_model(
-            str(payload),
-            config.get("configurable", {}).get("model_id"),
-            "chat",
-            max_tokens=10000,
-        )
+    model = await provision_langchain_model(
+        str(payload),
+        config.get("configurable", {}).get("model_id"),
+        "chat",
+        max_tokens=10000,
     )
-    ai_message = model.invoke(payload)
-    return {"messages": ai_message}
+    # Streamed so graph.astream(stream_mode="messages") emits tokens as they arrive
+    ai_message = None
+    async for chunk in model.astream(payload):
+        ai_message = chunk if ai_message is None else ai_message + chunk
+    if ai_message is None:
+        # Nothing was streamed back; ask for the whole answer instead
+        return {"messages": await model.ainvoke(payload)}
+    return {"messages": message_chunk_to_message(ai_message)}
 
 
-conn = sqlite3.connect(
-    LANGGRAPH_CHECKPOINT_FILE,
-    check_same_thread=False,
-)
-memory = SqliteSaver(conn)
-
 agent_state = StateGraph(ThreadState)
 agent_state.add_node("agent", call_model_with_messages)
 agent_state.add_edge(START, "agent")
 agent_state.add_edge("agent", END)
-graph = agent_state.compile(checkpointer=memory)
+
+# The checkpointer's connection and lock belong to the event loop that created them,
+# so each loop (API server, worker, Streamlit script runs) gets its own compiled graph
+_graphs: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, CompiledStateGraph]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+async def get_chat_graph() -> CompiledStateGraph:
+    """Get the chat graph, with its async checkpointer, for the running event loop."""
+    loop = asyncio.get_running_loop()
+    graph = _graphs.get(loop)
+    if graph is None:
+        graph = agent_state.compile(checkpointer=await open_checkpoint_saver())
+        _graphs[loop] = graph
+    return graph
+
+
+async def close_chat_graph() -> None:
+    """Close the checkpoint connection of the running event loop, if any."""
+    graph = _graphs.pop(asyncio.get_running_loop(), None)
+    if graph is not None:
+        await graph.checkpointer.conn.close()
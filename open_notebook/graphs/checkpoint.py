@@ -0,0 +1,112 @@
+"""
+Async SQLite checkpoint store for the chat graph.
+
+Every chat turn stores a new checkpoint that carries the full message history, so
+older checkpoints of a thread only serve LangGraph's time travel. They are pruned
+down to the most recent few, and the WAL file is truncated afterwards so the
+database does not grow with the length of every session.
+"""
+
+from collections import Counter
+from typing import Sequence
+
+import aiosqlite
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import ChannelVersions, Checkpoint, CheckpointMetadata
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+from loguru import logger
+
+from open_notebook.config import (
+    CHAT_CHECKPOINT_KEEP,
+    CHAT_CHECKPOINT_PRUNE_INTERVAL,
+    LANGGRAPH_CHECKPOINT_FILE,
+)
+
+
+class PruningSqliteSaver(AsyncSqliteSaver):
+    """AsyncSqliteSaver that keeps only the latest checkpoints of each thread."""
+
+    def __init__(self, conn: aiosqlite.Connection, keep: int, prune_interval: int):
+        super().__init__(conn)
+        self.keep = max(keep, 1)
+        self.prune_interval = max(prune_interval, 1)
+        self._puts: Counter = Counter()
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        next_config = await super().aput(config, checkpoint, metadata, new_versions)
+        thread_id = str(config["configurable"]["thread_id"])
+        self._puts[thread_id] += 1
+        if self._puts[thread_id] >= self.prune_interval:
+            self._puts[thread_id] = 0
+            try:
+                await self.aprune([thread_id])
+            except Exception as e:
+                # Pruning is housekeeping, it must never fail a chat turn
+                logger.warning(f"Could not prune checkpoints of {thread_id}: {e}")
+        return next_config
+
+    async def aprune(
+        self, thread_ids: Sequence[str], *, strategy: str = "keep_latest"
+    ) -> None:
+        """
+        Delete old checkpoints and their pending writes.
+
+        "keep_latest" keeps the `keep` most recent checkpoints of each namespace
+        (checkpoint ids are time ordered), "delete" removes the threads entirely.
+        """
+        await self.setup()
+        if strategy == "delete":
+            for thread_id in thread_ids:
+                await self.adelete_thread(thread_id)
+            return
+        if strategy != "keep_latest":
+            raise ValueError(f"Unknown prune strategy: {strategy}")
+
+        stale = """
+            SELECT checkpoint_ns, checkpoint_id FROM (
+                SELECT checkpoint_ns, checkpoint_id, ROW_NUMBER() OVER (
+                    PARTITION BY checkpoint_ns ORDER BY checkpoint_id DESC
+                ) AS position
+                FROM checkpoints WHERE thread_id = ?
+            ) WHERE position > ?
+        """
+        async with self.lock:
+            for thread_id in thread_ids:
+                params = (str(thread_id), str(thread_id), self.keep)
+                await self.conn.execute(
+                    f"DELETE FROM writes WHERE thread_id = ? AND (checkpoint_ns, checkpoint_id) IN ({stale})",
+                    params,
+                )
+                cursor = await self.conn.execute(
+                    f"DELETE FROM checkpoints WHERE thread_id = ? AND (checkpoint_ns, checkpoint_id) IN ({stale})",
+                    params,
+                )
+                if cursor.rowcount:
+                    logger.debug(
+                        f"Pruned {cursor.rowcount} checkpoints of thread {thread_id}"
+                    )
+            await self.conn.commit()
+            await self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+
+async def open_checkpoint_saver() -> PruningSqliteSaver:
+    """
+    Open the chat checkpoint database in WAL mode.
+
+    The aiosqlite connection runs all statements on its own thread, which makes it
+    the single writer for the event loop that opened it. busy_timeout lets writers
+    from other processes (API, worker, UI) wait for the lock instead of failing.
+    """
+    conn = await aiosqlite.connect(LANGGRAPH_CHECKPOINT_FILE)
+    await conn.execute("PRAGMA journal_mode=WAL")
+    await conn.execute("PRAGMA synchronous=NORMAL")
+    await conn.execute("PRAGMA busy_timeout=5000")
+    return PruningSqliteSaver(
+        conn, keep=CHAT_CHECKPOINT_KEEP, prune_interval=CHAT_CHECKPOINT_PRUNE_INTERVAL
+    )
@@ -1,13 +1,12 @@
 from typing import Any, Optional
 
 from ai_prompter import Prompter
-from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.runnables import RunnableConfig
 from langgraph.graph import END, START, StateGraph
 from loguru import logger
 from typing_extensions import TypedDict
 
-from open_notebook.graphs.utils import provision_langchain_model
+from open_notebook.graphs.utils import run_cached_prompt
 
 
 class PatternChainState(TypedDict):
@@ -22,17 +21,16 @@ async def call_model(state: dict, config: RunnableConfig) -> dict:
     system_prompt = Prompter(
         template_text=state["prompt"], parser=state.get("parser")
     ).render(data=state)
-    payload = [SystemMessage(content=system_prompt)] + [HumanMessage(content=content)]
-    chain = await provision_langchain_model(
-        str(payload),
+    response = await run_cached_prompt(
+        system_prompt,
+        content,
         config.get("configurable", {}).get("model_id"),
         "transformation",
+        bypass_cache=config.get("configurable", {}).get("bypass_cache", False),
         max_tokens=5000,
     )
 
-    response = await chain.ainvoke(payload)
-
-    return {"output": response.content}
+    return {"output": response}
 
 
 agent_state = StateGraph(PatternChainState)
@@ -1,5 +1,8 @@
+import asyncio
 import operator
-from typing import Any, Dict, List, Optional
+import os
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 from content_core import extract_content
 from content_core.common import ProcessSourceState
@@ -9,10 +12,13 @@ from langgraph.types import Send
 from loguru import logger
 from typing_extensions import Annotated, TypedDict
 
+from open_notebook.config import SOURCE_DEDUP_MIN_CHARS
 from open_notebook.domain.content_settings import ContentSettings
 from open_notebook.domain.notebook import Asset, Source
 from open_notebook.domain.transformation import Transformation
+from open_notebook.exceptions import DatabaseOperationError
 from open_notebook.graphs.transformation import graph as transform_graph
+from open_notebook.utils import canonical_url, content_hash, file_hash
 
 
 class SourceState(TypedDict):
@@ -22,6 +28,8 @@ class SourceState(TypedDict):
     source: Source
     transformation: Annotated[list, operator.add]
     embed: bool
+    fingerprints: Dict[str, str]
+    duplicate: bool
 
 
 class TransformationState(TypedDict):
@@ -29,39 +37,169 @@ class TransformationState(TypedDict):
     transformation: Transformation
 
 
-async def content_process(state: SourceState) -> dict:
+async def report_progress(config: RunnableConfig, stage: str, **details) -> None:
+    """Forward a stage update to the optional ``progress`` callable in the config."""
+    progress = config.get("configurable", {}).get("progress")
+    if progress:
+        await progress(stage, **details)
+
+
+@asynccontextmanager
+async def stage_slot(config: RunnableConfig, stage: str) -> AsyncIterator[None]:
+    """
+    Hold a slot of the optional semaphore in ``limits[stage]`` of the config.
+
+    Bulk jobs run many sources through the graph at once and cap each stage
+    (extraction, embedding, transformation) separately.
+    """
+    limit = config.get("configurable", {}).get("limits", {}).get(stage)
+    if limit is None:
+        yield
+        return
+    async with limit:
+        yield
+
+
+async def embed_source(source: Source, config: RunnableConfig) -> None:
+    logger.debug("Embedding content for vector search")
+    await report_progress(config, "chunking")
+
+    async def embedding_progress(done: int, total: int) -> None:
+        await report_progress(config, "embedding", done=done, total=total)
+
+    async with stage_slot(config, "embedding"):
+        await source.vectorize(progress=embedding_progress)
+
+
+async def find_existing(state: SourceState, config: RunnableConfig) -> dict:
+    """Look the source up by the fingerprints known before extraction."""
+    content_state: Dict[str, Any] = state["content_state"]
+    fingerprints: Dict[str, str] = {}
+    if content_state.get("url"):
+        fingerprints["canonical_url"] = canonical_url(content_state["url"])
+    if content_state.get("file_path"):
+        try:
+            fingerprints["file_hash"] = await asyncio.to_thread(
+                file_hash, content_state["file_path"]
+            )
+        except OSError as e:
+            # Let extraction report the missing or unreadable file
+            logger.warning(f"Could not hash {content_state['file_path']}: {e}")
+    if content_state.get("content"):
+        fingerprints["content_hash"] = content_hash(content_state["content"])
+
+    existing = await Source.find_duplicate(**fingerprints)
+    if existing and content_state.get("file_path") and content_state.get(
+        "delete_source"
+    ):
+        # Extraction is skipped, so remove the upload as it would have
+        try:
+            os.remove(content_state["file_path"])
+        except OSError as e:
+            logger.warning(f"Could not delete {content_state['file_path']}: {e}")
+    return {"fingerprints": fingerprints, "source": existing}
+
+
+def route_source(state: SourceState) -> str:
+    return "link_source" if state.get("source") else "content_process"
+
+
+async def link_source(state: SourceState, config: RunnableConfig) -> dict:
+    """
+    Reuse a source that holds the same content instead of storing it again.
+
+    The source is added to the notebook, only chunks missing an embedding from
+    the current model are embedded, and transformations it already has
+    insights for are not applied again.
+    """
+    source = state["source"]
+    logger.info(f"Content already ingested as {source.id}, linking it instead")
+    await report_progress(config, "deduplicated", source_id=str(source.id))
+
+    if state["notebook_id"]:
+        await source.add_to_notebook(state["notebook_id"])
+
+    if state["embed"]:
+        await embed_source(source, config)
+
+    existing_insights = {insight.insight_type for insight in await source.get_insights()}
+    return {
+        "source": source,
+        "duplicate": True,
+        "apply_transformations": [
+            transformation
+            for transformation in state["apply_transformations"]
+            if transformation.title not in existing_insights
+        ],
+    }
+
+
+async def content_process(state: SourceState, config: RunnableConfig) -> dict:
+    await report_progress(config, "extracting")
     content_settings = ContentSettings()
     content_state: Dict[str, Any] = state["content_state"]
 
-    content_state["url_engine"] = (
-        content_settings.default_content_processing_engine_url or "auto"
+    # Bulk jobs read the settings once and pass the engines in
+    content_state.setdefault(
+        "url_engine", content_settings.default_content_processing_engine_url or "auto"
     )
-    content_state["document_engine"] = (
-        content_settings.default_content_processing_engine_doc or "auto"
+    content_state.setdefault(
+        "document_engine",
+        content_settings.default_content_processing_engine_doc or "auto",
     )
     content_state["output_format"] = "markdown"
 
-    processed_state = await extract_content(content_state)
+    async with stage_slot(config, "extraction"):
+        processed_state = await extract_content(content_state)
     return {"content_state": processed_state}
 
 
-async def save_source(state: SourceState) -> dict:
+async def save_source(state: SourceState, config: RunnableConfig) -> dict:
     content_state = state["content_state"]
+    fingerprints = dict(state.get("fingerprints") or {})
+    asset = Asset(url=content_state.url, file_path=content_state.file_path)
+    pasted = not (asset.url or asset.file_path)
+    # Pasted text keeps the hash find_existing took of it (and looked up), not
+    # one of the extracted text, so pasting it again matches before extraction.
+    # Different URLs or files can still extract to the same text, but short
+    # texts are often boilerplate (paywalls, error pages) shared by unrelated
+    # pages, so they are neither matched nor fingerprinted
+    if (
+        "content_hash" not in fingerprints
+        and content_state.content
+        and (pasted or len(content_state.content) >= SOURCE_DEDUP_MIN_CHARS)
+    ):
+        fingerprints["content_hash"] = content_hash(content_state.content)
+        existing = await Source.find_duplicate(
+            content_hash=fingerprints["content_hash"]
+        )
+        if existing:
+            await existing.add_alternate_asset(asset)
+            return await link_source({**state, "source": existing}, config)
 
+    await report_progress(config, "saving")
     source = Source(
-        asset=Asset(url=content_state.url, file_path=content_state.file_path),
+        asset=asset,
         full_text=content_state.content,
         title=content_state.title,
+        **fingerprints,
     )
-    await source.save()
+    try:
+        await source.save()
+    except DatabaseOperationError as e:
+        # Another job stored the same content since we looked it up
+        existing = await Source.find_duplicate(**fingerprints)
+        if not existing:
+            raise
+        logger.debug(f"Lost the race to store the source ({e})")
+        return await link_source({**state, "source": existing}, config)
 
     if state["notebook_id"]:
         logger.debug(f"Adding source to notebook {state['notebook_id']}")
         await source.add_to_notebook(state["notebook_id"])
 
     if state["embed"]:
-        logger.debug("Embedding content for vector search")
-        await source.vectorize()
+        await embed_source(source, config)
 
     return {"source": source}
 
@@ -85,17 +223,21 @@ def trigger_transformations(state: SourceState, config: RunnableConfig) -> List[
     ]
 
 
-async def transform_content(state: TransformationState) -> Optional[dict]:
+async def transform_content(
+    state: TransformationState, config: RunnableConfig
+) -> Optional[dict]:
     source = state["source"]
     content = source.full_text
     if not content:
         return None
     transformation: Transformation = state["transformation"]
+    await report_progress(config, "transforming", transformation=transformation.name)
 
     logger.debug(f"Applying transformation {transformation.name}")
-    result = await transform_graph.ainvoke(
-        dict(input_text=content, transformation=transformation)
-    )
+    async with stage_slot(config, "transformation"):
+        result = await transform_graph.ainvoke(
+            dict(input_text=content, transformation=transformation)
+        )
     await source.add_insight(transformation.title, result["output"])
     return {
         "transformation": [
@@ -111,15 +253,23 @@ async def transform_content(state: TransformationState) -> Optional[dict]:
 workflow = StateGraph(SourceState)
 
 # Add nodes
+workflow.add_node("find_existing", find_existing)
+workflow.add_node("link_source", link_source)
 workflow.add_node("content_process", content_process)
 workflow.add_node("save_source", save_source)
 workflow.add_node("transform_content", transform_content)
 # Define the graph edges
-workflow.add_edge(START, "content_process")
+workflow.add_edge(START, "find_existing")
+workflow.add_conditional_edges(
+    "find_existing", route_source, ["link_source", "content_process"]
+)
 workflow.add_edge("content_process", "save_source")
 workflow.add_conditional_edges(
     "save_source", trigger_transformations, ["transform_content"]
 )
+workflow.add_conditional_edges(
+    "link_source", trigger_transformations, ["transform_content"]
+)
 workflow.add_edge("transform_content", END)
 
 # Compile the graph
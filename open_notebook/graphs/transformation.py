@@ -1,12 +1,11 @@
 from ai_prompter import Prompter
-from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.runnables import RunnableConfig
 from langgraph.graph import END, START, StateGraph
 from typing_extensions import TypedDict
 
 from open_notebook.domain.notebook import Source
 from open_notebook.domain.transformation import DefaultPrompts, Transformation
-from open_notebook.graphs.utils import provision_langchain_model
+from open_notebook.graphs.utils import run_cached_prompt
 from open_notebook.utils import clean_thinking_content
 
 
@@ -34,18 +33,17 @@ async def run_transformation(state: dict, config: RunnableConfig) -> dict:
     system_prompt = Prompter(template_text=transformation_template_text).render(
         data=state
     )
-    payload = [SystemMessage(content=system_prompt)] + [HumanMessage(content=content)]
-    chain = await provision_langchain_model(
-        str(payload),
+    response = await run_cached_prompt(
+        system_prompt,
+        content,
         config.get("configurable", {}).get("model_id"),
         "transformation",
-        max_tokens=5055,
+        bypass_cache=config.get("configurable", {}).get("bypass_cache", False),
+        max_tokens=5000,
     )
 
-    response = await chain.ainvoke(payload)
-
     # Clean thinking content from the response
-    cleaned_content = clean_thinking_content(response.content)
+    cleaned_content = clean_thinking_content(response)
 
     if source:
         await source.add_insight(transformation.title, cleaned_content)
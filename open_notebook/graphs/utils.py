@@ -1,32 +1,88 @@
+from typing import Any, Optional
+
 from esperanto import LanguageModel
 from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import HumanMessage, SystemMessage
 from loguru import logger
 
+from open_notebook.domain.llm_cache import llm_response_cache
 from open_notebook.domain.models import model_manager
-from open_notebook.utils import token_count
+from open_notebook.utils import estimate_token_count, token_count
 
+LARGE_CONTEXT_THRESHOLD = 105_000
 
-async def provision_langchain_model(
-    content, model_id, default_type, **kwargs
-) -> BaseChatModel:
+
+async def select_model_id(
+    content, model_id: Optional[str], default_type: str
+) -> Optional[str]:
     """
-    Returns the best model to use based on the context size and on whether there is a specific model being requested in Config.
+    Returns the id of the best model to use based on the context size and on whether there is a specific model being requested in Config.
     If context > 105_000, returns the large_context_model
     If model_id is specified in Config, returns that model
     Otherwise, returns the default model for the given type
     """
-    tokens = token_count(content)
+    tokens = estimate_token_count(content)
+    # Only pay for an exact count when the estimate is close to the threshold
+    if abs(tokens - LARGE_CONTEXT_THRESHOLD) < LARGE_CONTEXT_THRESHOLD * 0.1:
+        tokens = token_count(content)
 
-    if tokens > 105_000:
+    if tokens > LARGE_CONTEXT_THRESHOLD:
         logger.debug(
             f"Using large context model because the content has {tokens} tokens"
         )
-        model = await model_manager.get_default_model("large_context", **kwargs)
-    elif model_id:
-        model = await model_manager.get_model(model_id, **kwargs)
-    else:
-        model = await model_manager.get_default_model(default_type, **kwargs)
+        return await model_manager.get_default_model_id("large_context")
+    if model_id:
+        return model_id
+    return await model_manager.get_default_model_id(default_type)
+
+
+async def provision_langchain_model(
+    content, model_id, default_type, **kwargs
+) -> BaseChatModel:
+    """Returns the LangChain model picked by select_model_id."""
+    selected_model_id = await select_model_id(content, model_id, default_type)
+    model = await model_manager.get_model(selected_model_id, **kwargs)
 
     logger.debug(f"Using model: {model}")
     assert isinstance(model, LanguageModel), f"Model is not a LanguageModel: {model}"
     return model.to_langchain()
+
+
+async def run_cached_prompt(
+    system_prompt: str,
+    input_text: str,
+    model_id: Optional[str],
+    default_type: str,
+    bypass_cache: bool = False,
+    **kwargs,
+) -> Any:
+    """
+    Run a system prompt and input through the model picked by select_model_id,
+    reusing the stored response of an identical earlier call.
+
+    With bypass_cache the model is always called and its response replaces the
+    cached one.
+    """
+    payload = [SystemMessage(content=system_prompt), HumanMessage(content=input_text)]
+    selected_model_id = await select_model_id(str(payload), model_id, default_type)
+    use_cache = llm_response_cache.enabled and selected_model_id is not None
+    key = ""
+    if use_cache:
+        key = llm_response_cache.key(
+            selected_model_id, system_prompt, input_text, kwargs
+        )
+        if bypass_cache:
+            llm_response_cache.bypassed += 1
+        else:
+            cached = await llm_response_cache.get(key)
+            if cached is not None:
+                logger.debug(f"Using cached response of {selected_model_id}")
+                return cached
+
+    model = await model_manager.get_model(selected_model_id, **kwargs)
+    assert isinstance(model, LanguageModel), f"Model is not a LanguageModel: {model}"
+    response = await model.to_langchain().ainvoke(payload)
+
+    if use_cache and isinstance(response.content, str):
+        await llm_response_cache.store(key, selected_model_id, response.content)
+    return response.content
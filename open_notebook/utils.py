@@ -1,15 +1,36 @@
+import hashlib
+import math
 import re
 import unicodedata
+from bisect import bisect_right
+from functools import lru_cache
 from importlib.metadata import PackageNotFoundError, version
-from typing import Tuple
-from urllib.parse import urlparse
+from itertools import accumulate
+from typing import List, NamedTuple, Tuple
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
 
 import requests
 import tomli
-from langchain_text_splitters import RecursiveCharacterTextSplitter
 from packaging.version import parse as parse_version
 
 
+@lru_cache(maxsize=1)
+def _get_encoding():
+    """Load the 'o200k_base' encoding once per process."""
+    import tiktoken
+
+    return tiktoken.get_encoding("o200k_base")
+
+
+# Only strings up to this size are memoized, so the cache stays bounded in memory
+TOKEN_CACHE_MAX_CHARS = 10_000
+
+
+@lru_cache(maxsize=8192)
+def _cached_token_count(input_string: str) -> int:
+    return len(_get_encoding().encode(input_string))
+
+
 def token_count(input_string) -> int:
     """
     Count the number of tokens in the input string using the 'o200k_base' encoding.
@@ -20,12 +41,56 @@ def token_count(input_string) -> int:
     Returns:
         int: The number of tokens in the input string.
     """
-    import tiktoken
+    if len(input_string) <= TOKEN_CACHE_MAX_CHARS:
+        return _cached_token_count(input_string)
+    return len(_get_encoding().encode(input_string))
+
+
+class TokenEstimator:
+    """
+    Cheap token estimate based on a characters-per-token ratio.
+
+    Every `calibrate_every` calls the exact count is computed instead and the ratio
+    is updated with an exponential moving average, so the estimate follows the
+    kind of content actually being processed.
+    """
+
+    def __init__(
+        self,
+        chars_per_token: float = 4.0,
+        calibrate_every: int = 50,
+        smoothing: float = 0.3,
+    ):
+        self.chars_per_token = chars_per_token
+        self.calibrate_every = calibrate_every
+        self.smoothing = smoothing
+        self._calls = 0
 
-    encoding = tiktoken.get_encoding("o200k_base")
-    tokens = encoding.encode(input_string)
-    token_count = len(tokens)
-    return token_count
+    def calibrate(self, input_string: str) -> int:
+        tokens = token_count(input_string)
+        if tokens:
+            observed = len(input_string) / tokens
+            self.chars_per_token += self.smoothing * (observed - self.chars_per_token)
+        return tokens
+
+    def estimate(self, input_string: str) -> int:
+        self._calls += 1
+        if self._calls % self.calibrate_every == 1:
+            return self.calibrate(input_string)
+        return math.ceil(len(input_string) / self.chars_per_token)
+
+
+_token_estimator = TokenEstimator()
+
+
+def estimate_token_count(input_string: str) -> int:
+    """
+    Estimate the number of tokens in the input string without tokenizing it.
+
+    Use this where an approximate count is enough, such as model routing; use
+    token_count when the exact number matters.
+    """
+    return _token_estimator.estimate(input_string)
 
 
 def token_cost(token_count, cost_per_million=0.150) -> float:
@@ -42,39 +107,158 @@ def token_cost(token_count, cost_per_million=0.150) -> float:
     return cost_per_million * (token_count / 1_000_000)
 
 
-def split_text(txt: str, chunk_size=500):
+SPLIT_SEPARATORS = [
+    "\n\n",
+    "\n",
+    ".",
+    ",",
+    " ",
+    "\u200b",  # Zero-width space
+    "\uff0c",  # Fullwidth comma
+    "\u3001",  # Ideographic comma
+    "\uff0e",  # Fullwidth full stop
+    "\u3002",  # Ideographic full stop
+    "",
+]
+
+
+class TextChunk(NamedTuple):
+    text: str
+    start: int
+    end: int
+
+
+@lru_cache(maxsize=1)
+def _token_byte_lengths() -> List[int]:
+    """Length in bytes of every token of the encoding, indexed by token id."""
+    encoding = _get_encoding()
+    lengths = []
+    for token in range(encoding.n_vocab):
+        try:
+            lengths.append(len(encoding.decode_single_token_bytes(token)))
+        except KeyError:
+            lengths.append(0)
+    return lengths
+
+
+def split_text_with_offsets(txt: str, chunk_size=500) -> List[TextChunk]:
     """
-    Split the input text into chunks.
+    Split the input text into token-bounded chunks, keeping their character offsets.
+
+    The text is tokenized once and chunks are laid out over the UTF-8 byte offsets
+    of its tokens in a single pass. Each chunk ends on the highest priority
+    separator of SPLIT_SEPARATORS found in the second half of its window (falling
+    back to a raw token boundary), and the next chunk starts on the earliest
+    separator inside the last 15% of it, so consecutive chunks overlap by close to
+    15% of `chunk_size`. Every chunk is checked against its exact token count and
+    trimmed when needed, so none is ever longer than `chunk_size` tokens.
 
     Args:
         txt (str): The input text to be split.
-        chunk (int): The size of each chunk. Default is 1000.
-        overlap (int): The number of characters to overlap between chunks. Default is 0.
-        separator (str): The separator to use when splitting the text. Default is " ".
+        chunk_size (int): Maximum number of tokens per chunk. Default is 500.
 
     Returns:
-        list: A list of text chunks.
+        list: TextChunk entries with the chunk text and its [start, end) offsets in txt.
     """
+    if not txt:
+        return []
+
     overlap = int(chunk_size * 0.15)
-    text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=chunk_size,
-        chunk_overlap=overlap,
-        length_function=token_count,
-        separators=[
-            "\n\n",
-            "\n",
-            ".",
-            ",",
-            " ",
-            "\u200b",  # Zero-width space
-            "\uff0c",  # Fullwidth comma
-            "\u3001",  # Ideographic comma
-            "\uff0e",  # Fullwidth full stop
-            "\u3002",  # Ideographic full stop
-            "",
-        ],
-    )
-    return text_splitter.split_text(txt)
+    encoding = _get_encoding()
+    data = txt.encode("utf-8")
+    tokens = encoding.encode(txt, disallowed_special=())
+    total = len(tokens)
+    byte_lengths = _token_byte_lengths()
+    token_starts = list(accumulate(map(byte_lengths.__getitem__, tokens), initial=0))
+    separators = [
+        separator.encode("utf-8") for separator in SPLIT_SEPARATORS if separator
+    ]
+
+    def token_at(position: int) -> int:
+        # Index of the token that contains the byte at `position`
+        return bisect_right(token_starts, position, 0, total) - 1
+
+    def find_end(start: int, earliest: int) -> int:
+        latest = start + chunk_size
+        if latest >= total:
+            return total
+        low, high = token_starts[earliest], token_starts[latest]
+        for separator in separators:
+            position = data.rfind(separator, low, high)
+            if position != -1:
+                end = token_at(position + len(separator))
+                if earliest <= end <= latest:
+                    return end
+        return latest
+
+    def find_next_start(start: int, end: int) -> int:
+        target = max(end - overlap, start + 1)
+        low, high = token_starts[target], token_starts[end]
+        best = high
+        for separator in separators:
+            position = data.find(separator, low, best)
+            if position != -1:
+                best = position + len(separator)
+        next_start = token_at(best) if best < high else target
+        return next_start if target <= next_start < end else target
+
+    def char_boundary(position: int) -> int:
+        # Tokens can split a multi-byte character; move back to where it begins
+        while position < len(data) and 0x80 <= data[position] < 0xC0:
+            position -= 1
+        return position
+
+    # Byte offsets are turned into character offsets by decoding only the bytes
+    # between consecutive lookups, which stay within about one chunk of each other
+    last_byte, last_char = 0, 0
+
+    def char_offset(position: int) -> int:
+        nonlocal last_byte, last_char
+        if position >= last_byte:
+            last_char += len(data[last_byte:position].decode("utf-8"))
+        else:
+            last_char -= len(data[position:last_byte].decode("utf-8"))
+        last_byte = position
+        return last_char
+
+    chunks: List[TextChunk] = []
+    start, previous_end = 0, 0
+    while start < total:
+        # The end must move past the previous chunk, ideally by half a chunk or more
+        earliest = max(start + chunk_size // 2, previous_end + 1)
+        end = find_end(start, min(earliest, start + chunk_size))
+        while True:
+            byte_start = char_boundary(token_starts[start])
+            byte_end = char_boundary(token_starts[end])
+            raw = data[byte_start:byte_end].decode("utf-8")
+            text = raw.strip()
+            # Tokenizing a slice on its own can merge its edges differently
+            excess = len(encoding.encode(text, disallowed_special=())) - chunk_size
+            if excess <= 0 or end - start <= 1:
+                break
+            end = max(end - excess, start + 1)
+        if text:
+            char_start = char_offset(byte_start) + len(raw) - len(raw.lstrip())
+            chunks.append(TextChunk(text, char_start, char_start + len(text)))
+        if end >= total:
+            break
+        start, previous_end = find_next_start(start, end), end
+
+    return chunks
+
+
+def split_text(txt: str, chunk_size=500) -> List[str]:
+    """
+    Split the input text into chunks of at most `chunk_size` tokens.
+
+    Args:
+        txt (str): The input text to be split.
+        chunk_size (int): Maximum number of tokens per chunk. Default is 500.
+
+    Returns:
+        list: A list of text chunks.
+    """
+    return [chunk.text for chunk in split_text_with_offsets(txt, chunk_size)]
 
 
 def remove_non_ascii(text) -> str:
@@ -100,6 +284,47 @@ def remove_non_printable(text) -> str:
     return re.sub(r"[^\w\s.,!?\-\n\t]", "", text, flags=re.UNICODE)
 
 
+# Query parameters that only track where a visitor came from
+TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "ref", "ref_src"}
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def canonical_url(url: str) -> str:
+    """
+    Normalize a URL so that links to the same page compare equal.
+
+    Lowercases the scheme and host, drops default ports, fragments, trailing
+    slashes and tracking parameters (utm_* and friends), and sorts the query.
+    """
+    parsed = urlparse(url.strip())
+    scheme = parsed.scheme.lower()
+    host = (parsed.hostname or "").lower()
+    if parsed.port and parsed.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parsed.port}"
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    )
+    path = parsed.path.rstrip("/")
+    return urlunparse((scheme, host, path, parsed.params, urlencode(query), ""))
+
+
+def content_hash(text: str) -> str:
+    """SHA-256 of the text after Unicode (NFKC) and whitespace normalization."""
+    normalized = " ".join(unicodedata.normalize("NFKC", text).split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def file_hash(path: str) -> str:
+    """SHA-256 of a file's bytes, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
 
 
 def get_version_from_github(repo_url: str, branch: str = "main") -> str:
@@ -269,3 +494,53 @@ def clean_thinking_content(content: str) -> str:
     """
     _, cleaned_content = parse_thinking_content(content)
     return cleaned_content
+
+
+class ThinkingStreamFilter:
+    """
+    Drop <think>...</think> blocks from a token stream.
+
+    Tags can be split across tokens, so text that might be the start of a tag is
+    held back until the next token tells which it is.
+
+    Example:
+        >>> f = ThinkingStreamFilter()
+        >>> f.feed("<thi") + f.feed("nk>hmm</think>Hel") + f.feed("lo") + f.flush()
+        "Hello"
+    """
+
+    OPEN_TAG = "<think>"
+    CLOSE_TAG = "</think>"
+
+    def __init__(self):
+        self._buffer = ""
+        self._thinking = False
+
+    def feed(self, token: str) -> str:
+        self._buffer += token
+        output = []
+        while self._buffer:
+            tag = self.CLOSE_TAG if self._thinking else self.OPEN_TAG
+            index = self._buffer.find(tag)
+            if index >= 0:
+                if not self._thinking:
+                    output.append(self._buffer[:index])
+                self._buffer = self._buffer[index + len(tag) :]
+                self._thinking = not self._thinking
+                continue
+            # Keep a possible partial tag at the end for the next token
+            keep = 0
+            for size in range(min(len(tag) - 1, len(self._buffer)), 0, -1):
+                if tag.startswith(self._buffer[-size:]):
+                    keep = size
+                    break
+            if not self._thinking:
+                output.append(self._buffer[: len(self._buffer) - keep])
+            self._buffer = self._buffer[len(self._buffer) - keep :]
+            break
+        return "".join(output)
+
+    def flush(self) -> str:
+        remaining = "" if self._thinking else self._buffer
+        self._buffer = ""
+        return remaining
@@ -12,6 +12,8 @@ from pages.stream_app.utils import setup_page, setup_stream_state
 
 setup_page("📒 Open Notebook", only_check_mandatory_models=True)
 
+SOURCES_PAGE_SIZE = 50
+
 
 def notebook_header(current_notebook: Notebook):
     """
@@ -69,7 +71,20 @@ def notebook_page(current_notebook: Notebook):
         current_notebook=current_notebook,
     )
 
-    sources = sources_service.get_all_sources(notebook_id=current_notebook.id)
+    # Sources are loaded page by page; "Load more" fetches the next cursor page
+    source_pages = st.session_state[current_notebook.id].setdefault("source_pages", 1)
+    sources = []
+    has_more_sources = False
+    for _ in range(source_pages):
+        page = sources_service.get_all_sources(
+            notebook_id=current_notebook.id,
+            limit=SOURCES_PAGE_SIZE,
+            after=sources[-1].cursor if sources else None,
+        )
+        sources.extend(page)
+        has_more_sources = len(page) == SOURCES_PAGE_SIZE
+        if not has_more_sources:
+            break
     notes = notes_service.get_all_notes(notebook_id=current_notebook.id)
 
     notebook_header(current_notebook)
@@ -83,6 +98,9 @@ def notebook_page(current_notebook: Notebook):
                     add_source(current_notebook.id)
                 for source in sources:
                     source_card(source=source, notebook_id=current_notebook.id)
+                if has_more_sources and st.button("Load more sources"):
+                    st.session_state[current_notebook.id]["source_pages"] += 1
+                    st.rerun()
 
         with notes_tab:
             with st.container(border=True):
@@ -88,8 +88,11 @@ def source_panel(source_id: str, notebook_id=None, modal=False):
             else:
                 help = "This will generate your embedding vectors on the database for powerful search capabilities"
 
-            if not source_with_metadata.embedded_chunks and st.button(
-                "Embed vectors",
+            # Re-embedding only sends chunks that changed or lack the current model
+            if st.button(
+                "Re-embed vectors"
+                if source_with_metadata.embedded_chunks
+                else "Embed vectors",
                 icon="🦾",
                 help=help,
                 disabled=not embedding_model,
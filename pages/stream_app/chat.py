@@ -7,8 +7,9 @@ from loguru import logger
 
 from api.episode_profiles_service import episode_profiles_service
 from api.podcast_service import PodcastService
+from open_notebook.config import CHAT_CONTEXT_TOKEN_BUDGET
 from open_notebook.domain.notebook import ChatSession, Notebook
-from open_notebook.graphs.chat import graph as chat_graph
+from open_notebook.graphs.chat import get_chat_graph
 
 # from open_notebook.plugins.podcasts import PodcastConfig
 from open_notebook.utils import parse_thinking_content, token_count
@@ -20,8 +21,7 @@ from pages.stream_app.utils import (
 from .note import make_note_from_chat
 
 
-# todo: build a smarter, more robust context manager function
-def build_context(notebook_id):
+def build_context(notebook_id, question=None):
     from api.context_service import context_service
 
     # Convert context_config format for API
@@ -40,9 +40,12 @@ def build_context(notebook_id):
         elif item_type == "note":
             context_config["notes"][item_id] = status
 
-    # Get context via API
+    # Get context via API, packed to the chat budget by relevance to the question
     result = context_service.get_notebook_context(
-        notebook_id=notebook_id, context_config=context_config
+        notebook_id=notebook_id,
+        context_config=context_config,
+        token_budget=CHAT_CONTEXT_TOKEN_BUDGET,
+        question=question,
     )
 
     # Store in session state for compatibility
@@ -50,6 +53,7 @@ def build_context(notebook_id):
         "note": result["notes"],
         "source": result["sources"],
     }
+    st.session_state[notebook_id]["context_dropped"] = result.get("dropped", [])
 
     return st.session_state[notebook_id]["context"]
 
@@ -58,12 +62,29 @@ def execute_chat(txt_input, context, current_session):
     current_state = st.session_state[current_session.id]
     current_state["messages"] += [txt_input]
     current_state["context"] = context
-    result = chat_graph.invoke(
-        input=current_state,
-        config=RunnableConfig(configurable={"thread_id": current_session.id}),
-    )
-    current_session.save()
-    return result
+    config = RunnableConfig(configurable={"thread_id": current_session.id})
+
+    async def run_chat():
+        chat_graph = await get_chat_graph()
+        # Show the answer token by token while it is being generated
+        stream_container = st.empty()
+        with stream_container.chat_message(name="ai"):
+            placeholder = st.empty()
+            streamed = ""
+            async for chunk, metadata in chat_graph.astream(
+                input=current_state, config=config, stream_mode="messages"
+            ):
+                if metadata.get("langgraph_node") == "agent" and isinstance(
+                    chunk.content, str
+                ):
+                    streamed += chunk.content
+                    placeholder.markdown(streamed)
+        # The final message is rendered with the rest of the history
+        stream_container.empty()
+        await current_session.save()
+        return (await chat_graph.aget_state(config)).values
+
+    return asyncio.run(run_chat())
 
 
 def chat_sidebar(current_notebook: Notebook, current_session: ChatSession):
@@ -73,6 +94,12 @@ def chat_sidebar(current_notebook: Notebook, current_session: ChatSession):
     )
     chat_tab, podcast_tab = st.tabs(["Chat", "Podcast"])
     with st.expander(f"Context ({tokens} tokens), {len(str(context))} chars"):
+        dropped = st.session_state[current_notebook.id].get("context_dropped", [])
+        if dropped:
+            st.caption(
+                f"{len(dropped)} items ({sum(item['tokens'] for item in dropped)} tokens) "
+                "left out to fit the context budget"
+            )
         st.json(context)
     with podcast_tab:
         with st.container(border=True):
@@ -215,7 +242,9 @@ def chat_sidebar(current_notebook: Notebook, current_session: ChatSession):
             if request:
                 response = execute_chat(
                     txt_input=request,
-                    context=context,
+                    context=build_context(
+                        notebook_id=current_notebook.id, question=request
+                    ),
                     current_session=current_session,
                 )
                 st.session_state[current_session.id]["messages"] = response["messages"]
@@ -21,6 +21,20 @@ def source_panel_dialog(source_id, notebook_id=None):
     source_panel(source_id, notebook_id=notebook_id, modal=True)
 
 
+def describe_progress(progress) -> str:
+    """Human readable stage of a source processing job."""
+    if not progress:
+        return "Waiting for a worker..."
+    stage = progress.get("stage", "")
+    if stage == "embedding":
+        return f"Embedding chunks {progress.get('done')}/{progress.get('total')}..."
+    if stage == "transforming":
+        return f"Applying {progress.get('transformation')}..."
+    if stage == "deduplicated":
+        return "Already in your library, adding the existing source..."
+    return f"{stage.capitalize()}..."
+
+
 @st.dialog("Add a Source", width="large")
 def add_source(notebook_id):
     default_models = models_service.get_default_models()
@@ -104,30 +118,29 @@ def add_source(notebook_id):
 
                 # Determine source type and parameters
                 if source_type == "Link":
-                    sources_service.create_source(
-                        notebook_id=notebook_id,
-                        source_type="link",
-                        url=source_link,
-                        transformations=transformation_ids,
-                        embed=run_embed,
-                    )
+                    source_args = dict(source_type="link", url=source_link)
                 elif source_type == "Upload":
-                    sources_service.create_source(
-                        notebook_id=notebook_id,
+                    source_args = dict(
                         source_type="upload",
                         file_path=req["file_path"],
-                        transformations=transformation_ids,
-                        embed=run_embed,
                         delete_source=req.get("delete_source", False),
                     )
                 else:  # Text
-                    sources_service.create_source(
-                        notebook_id=notebook_id,
-                        source_type="text",
-                        content=source_text,
-                        transformations=transformation_ids,
-                        embed=run_embed,
-                    )
+                    source_args = dict(source_type="text", content=source_text)
+
+                job_id = sources_service.create_source(
+                    notebook_id=notebook_id,
+                    transformations=transformation_ids,
+                    embed=run_embed,
+                    **source_args,
+                )
+                stage = st.empty()
+                sources_service.wait_for_source(
+                    job_id,
+                    on_progress=lambda progress: stage.write(
+                        describe_progress(progress)
+                    ),
+                )
             except UnsupportedTypeException as e:
                 st.warning(
                     "This type of content is not supported yet. If you think it should be, let us know on the project Issues's page"
@@ -11,7 +11,7 @@ nest_asyncio.apply()
 from api.models_service import models_service
 from open_notebook.database.migrate import MigrationManager
 from open_notebook.domain.notebook import ChatSession, Notebook
-from open_notebook.graphs.chat import ThreadState, graph
+from open_notebook.graphs.chat import ThreadState, get_chat_graph
 from open_notebook.utils import (
     compare_versions,
     get_installed_version,
@@ -102,9 +102,11 @@ def setup_stream_state(current_notebook: Notebook) -> ChatSession:
     st.session_state[current_notebook.id]["active_session"] = chat_session.id
 
     # gets the existing state for the session from Langgraph state
-    existing_state = graph.get_state(
-        {"configurable": {"thread_id": chat_session.id}}
-    ).values
+    async def get_existing_state():
+        graph = await get_chat_graph()
+        return await graph.aget_state({"configurable": {"thread_id": chat_session.id}})
+
+    existing_state = asyncio.run(get_existing_state()).values
     if not existing_state or len(existing_state.keys()) == 0:
         st.session_state[chat_session.id] = ThreadState(
             messages=[], context=None, notebook=None, context_config={}
@@ -0,0 +1,115 @@
+"""
+Benchmark chat checkpoint append and read latency against session length.
+
+Simulates chat sessions turn by turn, storing one checkpoint per turn that
+carries the whole message history (as the chat graph does), and compares
+PruningSqliteSaver with the plain AsyncSqliteSaver it extends. For each
+reported turn it prints the append (aput) and read (aget_tuple) latency, the
+mean append latency since the previous reported turn (which includes the
+periodic prunes), and at the end the checkpoint count and database size.
+
+    uv run python scripts/benchmark_checkpoints.py --turns 200 --report 1 50 100 200
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+import aiosqlite
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.base import empty_checkpoint
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+from loguru import logger
+
+from open_notebook.graphs.checkpoint import PruningSqliteSaver
+
+THREAD_ID = "benchmark"
+REPLY = "Here is what the sources in this notebook say about that. " * 20
+
+
+async def open_saver(path: str, pruning: bool, keep: int, interval: int):
+    conn = await aiosqlite.connect(path)
+    await conn.execute("PRAGMA journal_mode=WAL")
+    await conn.execute("PRAGMA synchronous=NORMAL")
+    if pruning:
+        return PruningSqliteSaver(conn, keep=keep, prune_interval=interval)
+    return AsyncSqliteSaver(conn)
+
+
+async def run_session(
+    pruning: bool, turns: int, report: List[int], keep: int, interval: int
+) -> Dict[int, tuple]:
+    results: Dict[int, tuple] = {}
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "checkpoints.sqlite")
+        saver = await open_saver(path, pruning, keep, interval)
+        await saver.setup()
+        config = {"configurable": {"thread_id": THREAD_ID, "checkpoint_ns": ""}}
+        messages: list = []
+        appends: List[float] = []
+        for turn in range(1, turns + 1):
+            messages = messages + [
+                HumanMessage(content=f"Question {turn} about the notebook?"),
+                AIMessage(content=REPLY),
+            ]
+            checkpoint = empty_checkpoint()
+            checkpoint["channel_values"] = {"messages": messages}
+            checkpoint["channel_versions"] = {"messages": turn}
+            metadata = {"source": "loop", "step": turn, "parents": {}}
+
+            started = time.perf_counter()
+            config = await saver.aput(config, checkpoint, metadata, {"messages": turn})
+            append = time.perf_counter() - started
+            appends.append(append)
+
+            started = time.perf_counter()
+            await saver.aget_tuple({"configurable": {"thread_id": THREAD_ID}})
+            read = time.perf_counter() - started
+
+            if turn in report:
+                results[turn] = (append, read, sum(appends) / len(appends))
+                appends = []
+
+        async with saver.conn.execute("SELECT COUNT(*) FROM checkpoints") as cursor:
+            (stored,) = await cursor.fetchone()
+        await saver.conn.close()
+        size = sum(
+            os.path.getsize(os.path.join(folder, name)) for name in os.listdir(folder)
+        )
+        results[0] = (stored, size)
+    return results
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--report", type=int, nargs="+", default=[1, 50, 100, 200])
+    parser.add_argument("--keep", type=int, default=10)
+    parser.add_argument("--prune-interval", type=int, default=20)
+    args = parser.parse_args()
+    report = sorted(turn for turn in args.report if turn <= args.turns)
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    for name, pruning in (("sqlite", False), ("pruning", True)):
+        results = await run_session(
+            pruning, args.turns, report, args.keep, args.prune_interval
+        )
+        print(name)
+        for turn in report:
+            append, read, mean_append = results[turn]
+            print(
+                f"  turn {turn:5d}  append {append * 1000:8.2f} ms  "
+                f"read {read * 1000:8.2f} ms  "
+                f"mean append {mean_append * 1000:8.2f} ms"
+            )
+        stored, size = results[0]
+        print(f"  {stored} checkpoints stored, {size / 1024 / 1024:.1f} MB on disk")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,124 @@
+"""
+Benchmark split_text against the LangChain splitter it replaced.
+
+Generates synthetic documents of the requested sizes (or uses --file) and reports,
+for each splitter, the wall time, the number of chunks, the largest chunk in
+tokens and the average token overlap between consecutive chunks.
+
+    uv run python scripts/benchmark_split_text.py --sizes 1 10 50
+
+The previous splitter re-tokenizes every candidate merge and is only run up to
+--baseline-max-mb, so the larger sizes finish in reasonable time.
+"""
+
+import argparse
+import random
+import time
+from typing import Callable, List, Optional
+
+from open_notebook.utils import (
+    SPLIT_SEPARATORS,
+    split_text,
+    split_text_with_offsets,
+    token_count,
+)
+
+CHUNK_SIZE = 500
+
+WORDS = (
+    "the of and to in is was for on that with as by at from this be are or an "
+    "notebook source insight model embedding vector search chunk document token "
+    "research summary question answer context transformation podcast episode"
+).split()
+CJK = "的一是不了人我在有他这中大来上个国到说们为子和你地出会也时要就可以"
+
+
+def synthetic_text(size_mb: float, seed: int = 0) -> str:
+    """Paragraphs of English sentences with a CJK paragraph now and then."""
+    rng = random.Random(seed)
+    target = int(size_mb * 1024 * 1024)
+    paragraphs: List[str] = []
+    length = 0
+    while length < target:
+        if rng.random() < 0.1:
+            paragraph = "".join(
+                rng.choice(CJK) + ("。" if rng.random() < 0.04 else "")
+                for _ in range(rng.randint(50, 600))
+            )
+        else:
+            paragraph = " ".join(
+                " ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 30))) + "."
+                for _ in range(rng.randint(1, 15))
+            )
+        paragraphs.append(paragraph)
+        length += len(paragraph) + 2
+    return "\n\n".join(paragraphs)[:target]
+
+
+def langchain_split_text(txt: str, chunk_size: int = CHUNK_SIZE) -> List[str]:
+    """The RecursiveCharacterTextSplitter setup split_text used before."""
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=int(chunk_size * 0.15),
+        length_function=token_count,
+        separators=SPLIT_SEPARATORS,
+    )
+    return splitter.split_text(txt)
+
+
+def average_overlap(txt: str, chunk_size: int = CHUNK_SIZE) -> Optional[float]:
+    chunks = split_text_with_offsets(txt, chunk_size)
+    overlaps = [
+        token_count(txt[following.start : previous.end])
+        if following.start < previous.end
+        else 0
+        for previous, following in zip(chunks, chunks[1:])
+    ]
+    return sum(overlaps) / len(overlaps) if overlaps else None
+
+
+def run(name: str, splitter: Callable[[str], List[str]], txt: str) -> None:
+    started = time.perf_counter()
+    chunks = splitter(txt)
+    elapsed = time.perf_counter() - started
+    largest = max((token_count(chunk) for chunk in chunks), default=0)
+    print(
+        f"  {name:<10} {elapsed:8.2f}s  {len(chunks):7d} chunks  "
+        f"max {largest} tokens"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--file", help="Benchmark this file instead of synthetic text")
+    parser.add_argument("--baseline-max-mb", type=float, default=10)
+    args = parser.parse_args()
+
+    if args.file:
+        with open(args.file, encoding="utf-8") as handle:
+            documents = [(args.file, handle.read())]
+    else:
+        documents = [("synthetic", synthetic_text(size)) for size in args.sizes]
+
+    # Load the encoding and its tables up front so they are not billed to a run
+    split_text("warm up")
+
+    for label, txt in documents:
+        size_mb = len(txt.encode("utf-8")) / (1024 * 1024)
+        print(f"{label} ({size_mb:.1f} MB, {len(txt):,} characters)")
+        run("current", split_text, txt)
+        if size_mb <= args.baseline_max_mb:
+            run("langchain", langchain_split_text, txt)
+        else:
+            print(f"  langchain  skipped above {args.baseline_max_mb:g} MB")
+        overlap = average_overlap(txt)
+        if overlap is not None:
+            target = int(CHUNK_SIZE * 0.15)
+            print(f"  average overlap {overlap:.1f} tokens (target {target})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import pytest
+import tiktoken
+from surrealdb import AsyncSurreal
+
+from open_notebook import utils
+from open_notebook.database import repository
+from open_notebook.database.async_migrate import AsyncMigrationManager
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(autouse=True)
+def byte_encoding(monkeypatch):
+    """A byte-level BPE, so token counts work without downloading o200k_base."""
+    ranks = {bytes([byte]): byte for byte in range(256)}
+    for first in b" etaoinshr":
+        for second in b"etaoinshr":
+            ranks.setdefault(bytes([first, second]), len(ranks))
+    encoding = tiktoken.Encoding(
+        "test_bytes",
+        pat_str=r""" ?\p{L}+| ?\p{N}+| ?[^\s\p{L}\p{N}]+|\s+(?!\S)|\s+""",
+        mergeable_ranks=ranks,
+        special_tokens={},
+    )
+    monkeypatch.setattr(utils, "_get_encoding", lambda: encoding)
+    utils._cached_token_count.cache_clear()
+    utils._token_byte_lengths.cache_clear()
+    yield encoding
+    utils._cached_token_count.cache_clear()
+    utils._token_byte_lengths.cache_clear()
+
+
+@pytest.fixture
+async def memory_db(monkeypatch):
+    """Point the repository at a fresh embedded SurrealDB (mem://)."""
+    db = AsyncSurreal("mem://")
+    await db.connect()
+    await db.use("open_notebook", "test")
+
+    async def open_connection():
+        return db
+
+    monkeypatch.setattr(repository, "open_connection", open_connection)
+    # Pooled like the API, so the shared connection is not closed after each query
+    await repository.init_connection_pool()
+    yield db
+    await repository.close_connection_pool()
+
+
+@pytest.fixture
+async def migrated_db(memory_db):
+    """In-memory database with every migration applied."""
+    await AsyncMigrationManager().run_migration_up()
+    return memory_db
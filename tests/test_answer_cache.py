@@ -0,0 +1,42 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from open_notebook.domain.answer_cache import AskAnswerCache
+from open_notebook.domain.notebook import Note, Source
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_answer_goes_stale_when_a_cited_record_changes(migrated_db):
+    source = Source(title="Source", full_text="Full text")
+    await source.save()
+    note = Note(title="Note", content="Content")
+    await note.save()
+    cache = AskAnswerCache(min_similarity=0.9)
+    entry = {"cited": [source.id, note.id], "created": datetime.now(timezone.utc)}
+
+    assert await cache._is_fresh(entry)
+
+    source.title = "Edited"
+    await source.save()
+    assert not await cache._is_fresh(entry)
+
+    entry["created"] = datetime.now(timezone.utc)
+    assert await cache._is_fresh(entry)
+    await note.delete()
+    assert not await cache._is_fresh(entry)
+
+
+async def test_cited_insight_goes_stale_with_its_source(migrated_db):
+    source = Source(title="Source", full_text="Full text")
+    await source.save()
+    [insight] = await source.add_insight("Summary", "A summary")
+    cache = AskAnswerCache(min_similarity=0.9)
+    entry = {"cited": [str(insight["id"])], "created": datetime.now(timezone.utc)}
+
+    assert await cache._is_fresh(entry)
+
+    source.full_text = "Rewritten"
+    await source.save()
+    assert not await cache._is_fresh(entry)
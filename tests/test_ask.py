@@ -0,0 +1,31 @@
+import asyncio
+
+import pytest
+
+from open_notebook.graphs import ask
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def slow_branch(monkeypatch):
+    async def answer_search(state, config):
+        await asyncio.sleep(1)
+        return {"answers": ["too late"]}
+
+    monkeypatch.setattr(ask, "answer_search", answer_search)
+
+
+async def test_timed_out_branch_is_dropped_in_best_effort_mode(slow_branch):
+    config = {"configurable": {"branch_timeout": 0.01, "best_effort": True}}
+
+    result = await ask.provide_answer({"term": "rates"}, config)
+
+    assert result == {"dropped": [{"term": "rates", "reason": "timeout"}]}
+
+
+async def test_timed_out_branch_fails_the_answer_otherwise(slow_branch):
+    config = {"configurable": {"branch_timeout": 0.01, "best_effort": False}}
+
+    with pytest.raises(asyncio.TimeoutError):
+        await ask.provide_answer({"term": "rates"}, config)
@@ -0,0 +1,66 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+from langchain_core.messages import AIMessageChunk
+
+from api.routers import search
+
+pytestmark = pytest.mark.anyio
+
+
+class ScriptedAskGraph:
+    """Replays the (mode, chunk) pairs ask_graph.astream would produce."""
+
+    def __init__(self, updates):
+        self.updates = updates
+
+    async def astream(self, input, config, stream_mode):
+        for update in self.updates:
+            yield update
+
+
+def token(content: str, node: str = "write_final_answer"):
+    return "messages", (AIMessageChunk(content=content), {"langgraph_node": node})
+
+
+async def test_final_answer_tokens_stream_as_sse_events(monkeypatch):
+    strategy = SimpleNamespace(
+        reasoning="Look it up",
+        searches=[SimpleNamespace(term="rates", instructions="Find rates")],
+    )
+    graph = ScriptedAskGraph(
+        [
+            ("updates", {"agent": {"strategy": strategy}}),
+            token("branch answer", node="provide_answer"),
+            ("updates", {"provide_answer": {"answers": ["Rates rose."]}}),
+            token("<thi"),
+            token("nk>hmm</think>Rates "),
+            token("rose."),
+            ("updates", {"write_final_answer": {"final_answer": "Rates rose."}}),
+        ]
+    )
+    monkeypatch.setattr(search, "ask_graph", graph)
+
+    events = [
+        json.loads(event.removeprefix("data: "))
+        async for event in search.stream_ask_response("Why?", {"configurable": {}})
+    ]
+
+    assert [event["type"] for event in events] == [
+        "strategy",
+        "answer",
+        "token",
+        "token",
+        "final_answer",
+        "complete",
+    ]
+    tokens = "".join(event["content"] for event in events if event["type"] == "token")
+    assert tokens == "Rates rose."
+    assert events[1]["completed"] == events[1]["total"] == 1
+    assert events[-1] == {
+        "type": "complete",
+        "final_answer": "Rates rose.",
+        "dropped": [],
+        "cached": False,
+    }
@@ -0,0 +1,41 @@
+import pytest
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from open_notebook.graphs import chat
+
+pytestmark = pytest.mark.anyio
+
+
+class SilentStreamChatModel(BaseChatModel):
+    """Answers when invoked but streams nothing back."""
+
+    @property
+    def _llm_type(self) -> str:
+        return "silent-stream"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        return ChatResult(generations=[ChatGeneration(message=AIMessage("Answer"))])
+
+    async def astream(self, input, config=None, **kwargs):
+        return
+        yield
+
+
+async def test_empty_stream_falls_back_to_invoke(monkeypatch):
+    async def provision(*args, **kwargs):
+        return SilentStreamChatModel()
+
+    monkeypatch.setattr(chat, "provision_langchain_model", provision)
+    state = {
+        "messages": [HumanMessage("Question")],
+        "notebook": None,
+        "context": None,
+        "context_config": None,
+    }
+
+    result = await chat.call_model_with_messages(state, {"configurable": {}})
+
+    assert isinstance(result["messages"], AIMessage)
+    assert result["messages"].content == "Answer"
@@ -0,0 +1,32 @@
+import pytest
+
+from open_notebook.database.repository import repo_query
+from open_notebook.domain import context
+from open_notebook.domain.notebook import Note, Source
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_sources_and_notes_are_fetched_by_id(migrated_db, monkeypatch):
+    source = Source(title="Source", full_text="Full text")
+    await source.save()
+    note = Note(title="Note", content="Content")
+    await note.save()
+    await Source(title="Other", full_text="Other text").save()
+
+    sources = await context._fetch_sources([source.id], with_full_text=False)
+    notes = await context._fetch_notes([note.id], embeddings=None)
+    assert [(item.title, item.full_text) for item in sources] == [("Source", None)]
+    assert [item.title for item in notes] == ["Note"]
+
+    plans = []
+
+    async def explain(query, vars):
+        plans.append(await repo_query(f"{query} EXPLAIN", vars))
+        return []
+
+    monkeypatch.setattr(context, "repo_query", explain)
+    await context._fetch_sources([source.id], with_full_text=True)
+    await context._fetch_notes([note.id], embeddings={})
+    for plan in plans:
+        assert {step["operation"] for step in plan} == {"Iterate Thing", "Collector"}
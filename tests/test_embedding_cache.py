@@ -0,0 +1,29 @@
+import pytest
+
+from open_notebook.database.repository import repo_query
+from open_notebook.domain import embedding_cache
+from open_notebook.domain.embedding_cache import QueryEmbeddingCache
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_shared_embeddings_are_read_by_id(migrated_db, monkeypatch):
+    cache = QueryEmbeddingCache(max_size=10, ttl=60, shared=True)
+    await cache._set_shared("model", {"fresh": [0.1, 0.2]})
+    expired = QueryEmbeddingCache(max_size=10, ttl=-60, shared=True)
+    await expired._set_shared("model", {"stale": [0.3, 0.4]})
+
+    found = await cache._get_shared(["fresh", "stale", "missing"])
+    assert found == {"fresh": [0.1, 0.2]}
+
+    plans = []
+
+    async def explain(query, vars):
+        plans.append(await repo_query(f"{query} EXPLAIN", vars))
+        return []
+
+    monkeypatch.setattr(embedding_cache, "repo_query", explain)
+    await cache._get_shared(["fresh", "missing"])
+    operations = {step["operation"] for step in plans[0]}
+    assert "Iterate Table" not in operations
+    assert "Iterate Thing" in operations
@@ -0,0 +1,78 @@
+import pytest
+from esperanto import LanguageModel
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from open_notebook.domain.llm_cache import LLMResponseCache
+from open_notebook.domain.models import model_manager
+from open_notebook.graphs import utils as graph_utils
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeLanguageModel(LanguageModel):
+    """Answers with the given responses in turn, through LangChain."""
+
+    def __init__(self, responses):
+        super().__init__(model_name="fake")
+        self.chat_model = FakeListChatModel(responses=responses)
+
+    @property
+    def provider(self) -> str:
+        return "fake"
+
+    def _get_models(self):
+        return []
+
+    def _get_default_model(self) -> str:
+        return "fake"
+
+    def chat_complete(self, messages, stream=None):
+        raise NotImplementedError
+
+    async def achat_complete(self, messages, stream=None):
+        raise NotImplementedError
+
+    def to_langchain(self):
+        return self.chat_model
+
+
+async def test_responses_are_stored_and_expire(migrated_db):
+    cache = LLMResponseCache(enabled=True, max_entries=10, max_age=60)
+    key = cache.key("model:a", "Summarize", "Some text", {"max_tokens": 100})
+
+    assert await cache.get(key) is None
+    await cache.store(key, "model:a", "A summary")
+    assert await cache.get(key) == "A summary"
+    assert cache.key("model:a", "Summarize", "Some text", {"max_tokens": 50}) != key
+    assert (cache.hits, cache.misses, cache.stored) == (1, 1, 1)
+
+    expired = LLMResponseCache(enabled=True, max_entries=10, max_age=0)
+    assert await expired.get(key) is None
+
+
+async def test_bypass_cache_calls_the_model_and_replaces_the_response(
+    migrated_db, monkeypatch
+):
+    model = FakeLanguageModel(["first", "second"])
+
+    async def select_model_id(content, model_id, default_type):
+        return "model:fake"
+
+    async def get_model(model_id, **kwargs):
+        return model
+
+    cache = LLMResponseCache(enabled=True, max_entries=10, max_age=60)
+    monkeypatch.setattr(graph_utils, "llm_response_cache", cache)
+    monkeypatch.setattr(graph_utils, "select_model_id", select_model_id)
+    monkeypatch.setattr(model_manager, "get_model", get_model)
+
+    async def run(**kwargs):
+        return await graph_utils.run_cached_prompt(
+            "Summarize", "Some text", None, "transformation", **kwargs
+        )
+
+    assert await run() == "first"
+    assert await run() == "first"
+    assert await run(bypass_cache=True) == "second"
+    assert await run() == "second"
+    assert (cache.hits, cache.bypassed, cache.stored) == (2, 1, 2)
@@ -0,0 +1,75 @@
+import pytest
+from surrealdb import RecordID
+
+from open_notebook.database.async_migrate import (
+    AsyncMigrationManager,
+    get_latest_version,
+)
+from open_notebook.database.repository import repo_query
+
+pytestmark = pytest.mark.anyio
+
+SOURCE = RecordID("source", "a")
+NOTEBOOK = RecordID("notebook", "n")
+
+
+async def test_all_migrations_apply(migrated_db):
+    assert await get_latest_version() == len(AsyncMigrationManager().up_migrations)
+
+
+async def explain(query: str, vars: dict) -> dict:
+    plan = await repo_query(f"{query} EXPLAIN", vars)
+    return plan[0]
+
+
+@pytest.mark.parametrize(
+    "query, index, operation",
+    [
+        # Source.get_embedded_chunks
+        (
+            "SELECT count() AS chunks FROM source_embedding WHERE source = $id GROUP ALL",
+            "idx_source_embedding_source",
+            "Iterate Index Count",
+        ),
+        # Source.get_insights
+        (
+            "SELECT * FROM source_insight WHERE source = $id",
+            "idx_source_insight_source",
+            "Iterate Index",
+        ),
+        # Notebook.get_sources
+        (
+            "SELECT in AS source FROM reference WHERE out = $notebook",
+            "idx_reference_out",
+            "Iterate Index",
+        ),
+        # Notebook.get_notes
+        (
+            "SELECT in AS note FROM artifact WHERE out = $notebook",
+            "idx_artifact_out",
+            "Iterate Index",
+        ),
+        # Notebook.get_chat_sessions
+        (
+            "SELECT <- chat_session AS chat_session FROM refers_to WHERE out = $notebook",
+            "idx_refers_to_out",
+            "Iterate Index",
+        ),
+    ],
+)
+async def test_foreign_key_lookups_use_indexes(migrated_db, query, index, operation):
+    step = await explain(query, {"id": SOURCE, "notebook": NOTEBOOK})
+    assert step["operation"] == operation
+    assert step["detail"]["plan"]["index"] == index
+
+
+async def test_rolling_back_vector_indexes_restores_previous_search(migrated_db):
+    manager = AsyncMigrationManager()
+    while await get_latest_version() > 7:
+        await manager.runner.run_one_down()
+
+    functions = (await repo_query("INFO FOR DB"))["functions"]
+    definition = functions["vector_search"]
+    assert "(source.title OR '')" in definition
+    assert "array::flatten(content) AS matches" in definition
+    assert "<|" not in definition
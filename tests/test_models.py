@@ -0,0 +1,58 @@
+from collections import OrderedDict
+from unittest.mock import Mock
+
+import pytest
+from esperanto import LanguageModel
+
+from open_notebook.domain import models
+from open_notebook.domain.models import Model, model_manager
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def built(monkeypatch):
+    """Models built by the factory, with a fresh two-entry model cache."""
+    built = []
+
+    def create_language(model_name, provider, config):
+        built.append((model_name, config))
+        return Mock(spec=LanguageModel)
+
+    monkeypatch.setattr(models.AIFactory, "create_language", create_language)
+    monkeypatch.setattr(model_manager, "_model_cache", OrderedDict())
+    monkeypatch.setattr(model_manager, "_max_size", 2)
+    monkeypatch.setattr(model_manager, "_watch_changes", False)
+    return built
+
+
+async def test_model_instances_are_cached_and_bounded(migrated_db, built):
+    ids = []
+    for name in ("a", "b", "c"):
+        model = Model(name=name, provider="openai", type="language")
+        await model.save()
+        ids.append(model.id)
+
+    first = await model_manager.get_model(ids[0], max_tokens=10, structured=None)
+    again = await model_manager.get_model(ids[0], max_tokens=10)
+    assert again is first
+    assert built == [("a", {"max_tokens": 10, "structured": None})]
+
+    await model_manager.get_model(ids[1])
+    await model_manager.get_model(ids[0], max_tokens=10)
+    await model_manager.get_model(ids[2])
+    # b was the least recently used and made room for c
+    assert [name for name, _ in built] == ["a", "b", "c"]
+    await model_manager.get_model(ids[1])
+    assert [name for name, _ in built] == ["a", "b", "c", "b"]
+
+
+async def test_changed_model_drops_its_cached_instances(migrated_db, built):
+    model = Model(name="a", provider="openai", type="language")
+    await model.save()
+    await model_manager.get_model(model.id, max_tokens=10)
+    await model_manager.get_model(model.id, max_tokens=20)
+
+    await model_manager._apply_change("model", {"id": model.id, "name": "a2"})
+
+    assert len(model_manager._model_cache) == 0
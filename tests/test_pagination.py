@@ -0,0 +1,45 @@
+import pytest
+
+from open_notebook.domain.base import encode_cursor
+from open_notebook.domain.notebook import Note, Source
+from open_notebook.exceptions import InvalidInputError
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_cursor_survives_editing_and_deleting_the_last_record(migrated_db):
+    for number in range(5):
+        await Note(title=f"Note {number}", content="Content").save()
+
+    first = await Note.get_all(limit=2)
+    assert [note.title for note in first] == ["Note 4", "Note 3"]
+    cursor = encode_cursor(first[-1].updated, first[-1].id)
+
+    first[-1].content = "Edited"
+    await first[-1].save()
+    rest = await Note.get_all(after=cursor)
+    assert [note.title for note in rest] == ["Note 2", "Note 1", "Note 0"]
+
+    await first[-1].delete()
+    rest = await Note.get_all(after=cursor, limit=2)
+    assert [note.title for note in rest] == ["Note 2", "Note 1"]
+
+
+async def test_source_listing_pages_with_cursors(migrated_db):
+    for number in range(3):
+        await Source(title=f"Source {number}", full_text="Text").save()
+
+    first = await Source.get_listing(limit=2)
+    cursor = encode_cursor(first[-1]["updated"], first[-1]["id"])
+    rest = await Source.get_listing(limit=2, after=cursor)
+
+    assert [source["title"] for source in first + rest] == [
+        "Source 2",
+        "Source 1",
+        "Source 0",
+    ]
+
+
+async def test_invalid_cursor_is_rejected(migrated_db):
+    with pytest.raises(InvalidInputError):
+        await Note.get_all(after="note:missing")
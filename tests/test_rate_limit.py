@@ -0,0 +1,83 @@
+from typing import Any, List, Optional
+
+import pytest
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from open_notebook.domain.rate_limit import ModelLimiter, RateLimitedChatModel
+
+pytestmark = pytest.mark.anyio
+
+
+class Response:
+    def __init__(self, status_code: int, headers: dict):
+        self.status_code = status_code
+        self.headers = headers
+
+
+class ProviderError(Exception):
+    def __init__(self, status_code: int, headers: Optional[dict] = None):
+        super().__init__(f"HTTP {status_code}")
+        self.response = Response(status_code, headers or {})
+
+
+class FlakyChatModel(BaseChatModel):
+    """Fails with the given errors before answering."""
+
+    errors: List[Exception]
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "flaky"
+
+    def _fail_or_answer(self) -> ChatResult:
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage("done"))])
+
+    def _generate(self, messages: List[BaseMessage], *args: Any, **kwargs: Any):
+        return self._fail_or_answer()
+
+    async def _agenerate(self, messages: List[BaseMessage], *args: Any, **kwargs: Any):
+        return self._fail_or_answer()
+
+
+def limited(errors: List[Exception]) -> RateLimitedChatModel:
+    return RateLimitedChatModel(
+        model=FlakyChatModel(errors=errors), limiter=ModelLimiter("test", 0, 0)
+    )
+
+
+def rate_limited_errors() -> List[Exception]:
+    return [
+        ProviderError(429, {"retry-after": "0"}),
+        ProviderError(503, {"retry-after-ms": "0"}),
+    ]
+
+
+def test_sync_calls_retry_rate_limits():
+    model = limited(rate_limited_errors())
+
+    assert model.invoke([HumanMessage("hi")]).content == "done"
+    assert model.model.calls == 3
+    assert model.limiter.retries == 2
+
+
+async def test_async_calls_retry_rate_limits():
+    model = limited(rate_limited_errors())
+
+    assert (await model.ainvoke([HumanMessage("hi")])).content == "done"
+    assert model.model.calls == 3
+    assert model.limiter.retries == 2
+
+
+def test_other_errors_are_not_retried():
+    model = limited([ProviderError(400)])
+
+    with pytest.raises(ProviderError):
+        model.invoke([HumanMessage("hi")])
+    assert model.model.calls == 1
+    assert model.limiter.failures == 1
@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from open_notebook.database import repository
+from open_notebook.database.repository import repo_query
+
+
+class FakeConnection:
+    def __init__(self):
+        self.error = None
+        self.closed = False
+
+    async def query(self, query, vars=None):
+        if self.error:
+            raise self.error
+        return []
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def opened(monkeypatch):
+    """Connections handed out by a fake open_connection."""
+    connections: list = []
+
+    async def open_connection():
+        connections.append(FakeConnection())
+        return connections[-1]
+
+    monkeypatch.setattr(repository, "open_connection", open_connection)
+    return connections
+
+
+def test_calls_without_a_pool_close_their_connection(opened):
+    for _ in range(5):
+        asyncio.run(repo_query("RETURN 1"))
+
+    assert len(opened) == 5
+    assert all(connection.closed for connection in opened)
+
+
+@pytest.mark.parametrize(
+    "error, discarded",
+    [(RuntimeError("There was a problem with the query"), False), (OSError(), True)],
+)
+def test_pool_only_discards_connections_on_transport_errors(opened, error, discarded):
+    async def scenario():
+        await repository.init_connection_pool()
+        try:
+            pooled = opened[0]
+            pooled.error = error
+            with pytest.raises(type(error)):
+                await repo_query("RETURN 1")
+            pooled.error = None
+            await repo_query("RETURN 1")
+        finally:
+            await repository.close_connection_pool()
+
+    asyncio.run(scenario())
+
+    assert opened[0].closed
+    assert len(opened) == (2 if discarded else 1)
@@ -0,0 +1,24 @@
+from open_notebook.domain.notebook import reciprocal_rank_fusion
+
+
+def test_fusion_ranks_parents_found_by_both_searches_first():
+    text = [
+        {"id": "source_embedding:a1", "parent_id": "source:a", "title": "A"},
+        {"id": "source_embedding:a2", "parent_id": "source:a", "title": "A"},
+        {"id": "source_embedding:b1", "parent_id": "source:b", "title": "B"},
+        {"id": "note:c", "title": "C"},
+    ]
+    vector = [
+        {"id": "note:c", "title": "C"},
+        {"id": "source_embedding:b2", "parent_id": "source:b", "title": "B"},
+    ]
+
+    fused = reciprocal_rank_fusion({"text": text, "vector": vector}, k=60)
+
+    assert [entry["parent_id"] for entry in fused] == ["note:c", "source:b", "source:a"]
+    assert fused[0]["score"] == 1 / 63 + 1 / 61
+    # Each parent keeps its best ranked hit and its rank in every list
+    assert fused[1]["id"] == "source_embedding:b1"
+    assert (fused[1]["text_rank"], fused[1]["vector_rank"]) == (2, 2)
+    assert fused[2]["text_rank"] == 1
+    assert "vector_rank" not in fused[2]
@@ -0,0 +1,98 @@
+import pytest
+
+from open_notebook.database.repository import ensure_record_id, repo_query
+from open_notebook.domain import notebook as notebook_module
+from open_notebook.domain.models import model_manager
+from open_notebook.domain.notebook import Asset, Notebook, Source
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_alternate_assets_are_recorded_once(migrated_db):
+    source = Source(
+        asset=Asset(url="https://example.com/article"), full_text="Article text"
+    )
+    await source.save()
+    mirror = Asset(url="https://mirror.example.org/article")
+
+    await source.add_alternate_asset(source.asset)
+    await source.add_alternate_asset(mirror)
+    await source.add_alternate_asset(mirror)
+    await source.add_alternate_asset(Asset())
+
+    stored = await Source.get(source.id)
+    assert stored.alternate_assets == [mirror]
+
+
+async def test_notebook_listing_only_reads_its_sources(migrated_db, monkeypatch):
+    notebook = Notebook(name="Research", description="")
+    await notebook.save()
+    for title in ("in notebook", "elsewhere"):
+        source = Source(title=title, full_text=title)
+        await source.save()
+        if title == "in notebook":
+            await source.add_to_notebook(notebook.id)
+
+    listing = await Source.get_listing(notebook_id=notebook.id, limit=10)
+    assert [source["title"] for source in listing] == ["in notebook"]
+
+    async def explain(query, vars):
+        return await repo_query(f"{query} EXPLAIN", vars)
+
+    monkeypatch.setattr(notebook_module, "repo_query", explain)
+    plan = await Source.get_listing(notebook_id=notebook.id, limit=10)
+    operations = [step["operation"] for step in plan]
+    assert "Iterate Table" not in operations
+    assert "Iterate Thing" in operations
+
+
+class RecordingEmbedder:
+    def __init__(self):
+        self.embedded = []
+
+    async def aembed(self, texts):
+        self.embedded.extend(texts)
+        return [[float(len(text)), 1.0, 0.0] for text in texts]
+
+
+async def test_vectorize_only_embeds_changed_chunks(migrated_db, monkeypatch):
+    embedder = RecordingEmbedder()
+
+    async def get_embedding_model(**kwargs):
+        return embedder
+
+    async def get_default_model_id(model_type):
+        return "model:embedding"
+
+    monkeypatch.setattr(model_manager, "get_embedding_model", get_embedding_model)
+    monkeypatch.setattr(model_manager, "get_default_model_id", get_default_model_id)
+    paragraphs = [
+        f"Paragraph {number} of the source says something about topic {number}. " * 20
+        for number in range(12)
+    ]
+    source = Source(title="Long source", full_text="\n\n".join(paragraphs))
+    await source.save()
+
+    first = await source.vectorize()
+    assert first["chunks"] > 4
+    assert first["embedded"] == first["chunks"] == len(embedder.embedded)
+
+    embedder.embedded.clear()
+    unchanged = await source.vectorize()
+    assert (unchanged["embedded"], unchanged["reused"]) == (0, first["chunks"])
+    assert embedder.embedded == []
+
+    paragraphs[-1] = "The last paragraph was rewritten."
+    source.full_text = "\n\n".join(paragraphs)
+    await source.save()
+    edited = await source.vectorize()
+    assert 0 < edited["embedded"] <= 2
+    assert edited["reused"] == edited["chunks"] - edited["embedded"]
+    assert embedder.embedded and all(
+        "rewritten" in text or "Paragraph 11" in text for text in embedder.embedded
+    )
+    rows = await repo_query(
+        "SELECT VALUE order FROM source_embedding WHERE source = $source",
+        {"source": ensure_record_id(source.id)},
+    )
+    assert sorted(rows) == list(range(edited["chunks"]))
@@ -0,0 +1,51 @@
+import random
+
+import pytest
+
+from open_notebook.utils import split_text_with_offsets
+
+
+def english(paragraphs: int) -> str:
+    rng = random.Random(0)
+    words = "the notebook source has an insight on this note and that one".split()
+    return "\n\n".join(
+        " ".join(
+            " ".join(rng.choice(words) for _ in range(rng.randint(5, 25))) + "."
+            for _ in range(rng.randint(1, 10))
+        )
+        for _ in range(paragraphs)
+    )
+
+
+def cjk(characters: int) -> str:
+    rng = random.Random(0)
+    return "".join(
+        rng.choice("的一是不了人我在有他这中大来上个国到说们为子和你") for _ in range(characters)
+    )
+
+
+@pytest.mark.parametrize("text", [english(300), cjk(20_000), english(50) + cjk(5_000)])
+def test_chunks_respect_the_size_cap(byte_encoding, text):
+    chunks = split_text_with_offsets(text, 500)
+
+    assert chunks
+    assert max(len(byte_encoding.encode(chunk.text)) for chunk in chunks) <= 500
+    assert all(text[chunk.start : chunk.end] == chunk.text for chunk in chunks)
+
+
+def test_consecutive_chunks_overlap(byte_encoding):
+    text = english(300)
+    chunks = split_text_with_offsets(text, 500)
+    overlaps = [
+        len(byte_encoding.encode(text[following.start : previous.end]))
+        for previous, following in zip(chunks, chunks[1:])
+    ]
+
+    assert min(overlaps) > 0
+    assert 60 <= sum(overlaps) / len(overlaps) <= 75
+
+
+def test_short_text_is_a_single_chunk():
+    assert [chunk.text for chunk in split_text_with_offsets("  a short note \n")] == [
+        "a short note"
+    ]